@@ -2,7 +2,9 @@
   Minimal RPC client example (Node + fetch).
 
   This script shows how to call the Harmonization Framework RPC API from a
-  simple Node/TypeScript client and poll for completion.
+  simple Node/TypeScript client and wait for completion. It long-polls
+  get_job with `wait`, so each call returns as soon as the job's status
+  changes; GET /jobs/<job_id>/events streams every progress update instead.
 
   Assumptions:
   - The harmonization server is already running on http://localhost:8000
@@ -22,12 +24,10 @@ import { RpcClient } from "./rpc_client.ts";
 // The single RPC endpoint exposed by the server.
 const API_URL = "http://localhost:8000/api";
 const HARMONIZE_TIMEOUT_MS = 20_000;
-const GET_JOB_TIMEOUT_MS = 5_000;
-
-// Simple delay helper used for polling.
-function sleep(ms: number): Promise<void> {
-  return new Promise((resolve) => setTimeout(resolve, ms));
-}
+// get_job blocks for up to GET_JOB_WAIT_S seconds; the request timeout leaves
+// headroom for the response.
+const GET_JOB_WAIT_S = 25;
+const GET_JOB_TIMEOUT_MS = (GET_JOB_WAIT_S + 5) * 1_000;
 
 // Build an absolute path from this script's directory.
 // This lets the script run from demo/client without relying on process.cwd().
@@ -64,15 +64,17 @@ async function main() {
   const jobId = startResponse.job_id;
   console.log(`Harmonization started. job_id=${jobId}`);
 
-  // Poll until completion.
+  // Wait for status changes until the job finishes.
+  let lastStatus: string | undefined;
   while (true) {
     const statusResponse = await client.call<GetJobResponse>({
       method: "get_job",
-      params: { job_id: jobId },
+      params: { job_id: jobId, wait: GET_JOB_WAIT_S, status: lastStatus },
       timeoutMs: GET_JOB_TIMEOUT_MS,
     });
 
     const job = statusResponse.result;
+    lastStatus = job.status;
     const percent = Math.round(job.progress * 100);
     console.log(`Progress: ${percent}%`);
 
@@ -89,7 +91,10 @@ async function main() {
       break;
     }
 
-    await sleep(500);
+    if (job.status === JOB_STATUS.CANCELLED) {
+      console.error("Harmonization was cancelled.");
+      break;
+    }
   }
 }
 
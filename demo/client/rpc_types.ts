@@ -4,6 +4,7 @@ export const JOB_STATUS = {
   RUNNING: "running",
   COMPLETED: "completed",
   FAILED: "failed",
+  CANCELLED: "cancelled",
 } as const;
 
 export type JobStatus = (typeof JOB_STATUS)[keyof typeof JOB_STATUS];
@@ -25,6 +26,8 @@ export interface HarmonizeRequest {
   output_file_path: string;
   // Overwrite output and replay log files if they already exist.
   overwrite?: boolean;
+  // Recompute even if the sidecar's output cache holds an identical job.
+  bypass_cache?: boolean;
 }
 
 // Response returned by the harmonize RPC method.
@@ -53,6 +56,133 @@ export interface JobInfo {
   error?: unknown;
 }
 
+// One input of a harmonize_batch call.
+export interface BatchItem {
+  data_file_path: string;
+  output_file_path: string;
+  replay_log_file_path: string;
+  // Override the batch-wide output_columns / data_dictionary_path.
+  output_columns?: string[];
+  data_dictionary_path?: string;
+}
+
+// Params accepted by the harmonize_batch RPC method.
+export interface HarmonizeBatchRequest {
+  // Absolute path to the rules file shared by every item.
+  rules_file_path: string;
+  items: BatchItem[];
+  overwrite?: boolean;
+  output_columns?: string[];
+  data_dictionary_path?: string;
+  bypass_cache?: boolean;
+}
+
+// Response returned by the harmonize_batch RPC method.
+export interface HarmonizeBatchResponse {
+  // Always "accepted" for a successful request.
+  status: string;
+  // One job id per item, in item order.
+  result: { job_ids: string[] };
+}
+
+// Params accepted by the get_jobs RPC method.
+export interface GetJobsRequest {
+  job_ids: string[];
+  // Block up to this many seconds (at most 30) until any job's status changes.
+  wait?: number;
+}
+
+// Response returned by the get_jobs RPC method.
+export interface GetJobsResponse {
+  status: string;
+  result: {
+    jobs: JobInfo[];
+    not_found: string[];
+    counts: Partial<Record<JobStatus, number>>;
+  };
+}
+
+// Params accepted by the harmonize_rows RPC method. Give exactly one of
+// rules and rules_file_path.
+export interface HarmonizeRowsRequest {
+  // Input records, one object per row (at most 10,000).
+  rows: Record<string, unknown>[];
+  // Inline rules: the contents of a RuleSet JSON file.
+  rules?: unknown[];
+  // Absolute path to a rules file.
+  rules_file_path?: string;
+  // Columns to return (targets, input columns, source dataset, original_id).
+  output_columns?: string[];
+  // Value of the `source dataset` column (default "rows").
+  dataset_name?: string;
+}
+
+// Response returned by the harmonize_rows RPC method.
+export interface HarmonizeRowsResponse {
+  // Always "success" for a successful request.
+  status: string;
+  // The harmonized rows, in input order.
+  result: { rows: Record<string, unknown>[] };
+}
+
+// Params accepted by the open_session RPC method.
+export interface OpenSessionRequest {
+  // Absolute path to the input file.
+  data_file_path: string;
+  // Keep about this many rows instead of the whole file.
+  sample_rows?: number;
+  // Column whose values each keep their share of the sample.
+  stratify_by?: string;
+  // Random seed of the sample (default 0).
+  seed?: number;
+  // Value of the `source dataset` column (default: the file name).
+  dataset_name?: string;
+}
+
+// Response returned by the open_session RPC method.
+export interface OpenSessionResponse {
+  status: string;
+  result: {
+    session_id: string;
+    rows: number;
+    columns: string[];
+    // File row of each session row, in session row order.
+    original_id: number[];
+    memory_bytes: number;
+  };
+}
+
+// Params accepted by the update_session RPC method: the complete rule set,
+// given as for harmonize_rows.
+export interface UpdateSessionRequest {
+  session_id: string;
+  rules?: unknown[];
+  rules_file_path?: string;
+}
+
+// Response returned by the update_session RPC method.
+export interface UpdateSessionResponse {
+  status: string;
+  result: {
+    session_id: string;
+    // Recomputed target columns, in session row order.
+    columns: Record<string, unknown[]>;
+    // Targets whose cached results were reused.
+    unchanged: string[];
+    // Targets no longer in the rule set.
+    removed: string[];
+  };
+}
+
+// Params accepted by the get_job RPC method.
+export interface GetJobRequest {
+  job_id: string;
+  // Block up to this many seconds (at most 30) until the status changes.
+  wait?: number;
+  // Status to wait for a change from; defaults to the job's current status.
+  status?: string;
+}
+
 // Response returned by the get_job RPC method.
 export interface GetJobResponse {
   // Always "success" for a successful request.
@@ -1,3 +1,4 @@
 from .harmonization_rule import HarmonizationRule
-from .harmonize import harmonize_dataset, harmonize_file
+from .combine import harmonize_many
+from .harmonize import HarmonizationCancelled, harmonize_dataset, harmonize_file, harmonize_records
 from .rule_registry import RuleSet
@@ -1,11 +1,42 @@
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from harmonization_framework.api import metrics
+from harmonization_framework.api.routes.diagnostics import router as diagnostics_router
 from harmonization_framework.api.routes.health import router as health_router
+from harmonization_framework.api.routes.jobs import router as jobs_router
+from harmonization_framework.api.routes.metrics import router as metrics_router
 from harmonization_framework.api.routes.rpc import router as rpc_router
 from harmonization_framework.api.routes.shutdown import router as shutdown_router
+from harmonization_framework.api.rpc_sessions import SESSIONS, sweep_sessions
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Probes event loop lag for /metrics and closes idle editing sessions
+    # while the server runs.
+    tasks = [
+        asyncio.create_task(metrics.monitor_event_loop()),
+        asyncio.create_task(sweep_sessions(SESSIONS)),
+    ]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
 
-app = FastAPI(title="Harmonization Framework API")
+app = FastAPI(title="Harmonization Framework API", lifespan=lifespan)
 
 app.include_router(health_router, prefix="/health")
+app.include_router(diagnostics_router, prefix="/diagnostics")
+app.include_router(jobs_router, prefix="/jobs")
+app.include_router(metrics_router, prefix="/metrics")
 app.include_router(rpc_router, prefix="/api")
 app.include_router(shutdown_router, prefix="/shutdown")
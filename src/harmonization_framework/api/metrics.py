@@ -0,0 +1,319 @@
+"""
+Sidecar metrics in the Prometheus text exposition format.
+
+Counters and histograms are recorded without taking a lock: recording
+appends the value to a deque (an atomic operation), and the values are only
+added up when the metrics are read, e.g. by `GET /metrics`. A series folds
+its pending values itself only once more than MAX_PENDING accumulate between
+reads, and then only if no reader holds it.
+
+Gauges are computed when read from a callback (queue depth, job counts,
+memory), so keeping them current costs nothing.
+
+In a job worker process, values are not recorded locally but handed to the
+update forwarder (see `forward_updates`), which sends them to the API
+process; `apply_update` records them there.
+"""
+
+import asyncio
+import bisect
+import math
+import os
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Pending values per series above which the recording thread folds them.
+MAX_PENDING = 10_000
+# Seconds between event loop lag probes.
+LOOP_LAG_INTERVAL = 0.5
+
+UpdateForwarder = Callable[[str, tuple, Dict[str, Any]], None]
+_forward: Optional[UpdateForwarder] = None
+
+_METRICS: Dict[str, "_Metric"] = {}
+
+
+def forward_updates(forwarder: Optional[UpdateForwarder]) -> None:
+    """Send this process's metric values to `forwarder` (None records them locally)."""
+    global _forward
+    _forward = forwarder
+
+
+def apply_update(name: str, args: tuple, kwargs: Dict[str, Any]) -> None:
+    """Record a metric value forwarded from a worker process."""
+    metric_name, label_values, value = args
+    _METRICS[metric_name]._series(tuple(label_values))._append(value)
+
+
+UPDATE_NAME = "record_metric"
+
+
+class _Series:
+    """Values of one metric and label set, folded into `state` when read."""
+
+    def __init__(self, metric: "_Metric", label_values: Tuple[str, ...]):
+        self.metric = metric
+        self.label_values = label_values
+        self.state = metric._initial_state()
+        self._pending: deque = deque()
+        self._fold_lock = threading.Lock()
+
+    def record(self, value: float) -> None:
+        if _forward is not None:
+            _forward(UPDATE_NAME, (self.metric.name, self.label_values, value), {})
+            return
+        self._append(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.record(amount)
+
+    def observe(self, value: float) -> None:
+        self.record(value)
+
+    def _append(self, value: float) -> None:
+        self._pending.append(value)
+        if len(self._pending) > MAX_PENDING and self._fold_lock.acquire(blocking=False):
+            try:
+                self._fold_pending()
+            finally:
+                self._fold_lock.release()
+
+    def _fold_pending(self) -> None:
+        while True:
+            try:
+                value = self._pending.popleft()
+            except IndexError:
+                return
+            self.metric._fold(self.state, value)
+
+    def read(self) -> Any:
+        with self._fold_lock:
+            self._fold_pending()
+            return self.metric._snapshot(self.state)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], _Series] = {}
+        _METRICS[name] = self
+        if not self.labelnames and self.kind != "gauge":
+            # Report zeros before the first value.
+            self._series(())
+
+    def _series(self, label_values: Tuple[str, ...]) -> _Series:
+        series = self._children.get(label_values)
+        if series is None:
+            # setdefault keeps the first series if two threads race here.
+            series = self._children.setdefault(label_values, _Series(self, label_values))
+        return series
+
+    def labels(self, **labels: Any) -> _Series:
+        return self._series(tuple(str(labels[name]) for name in self.labelnames))
+
+    def _initial_state(self) -> Any:
+        raise NotImplementedError
+
+    def _fold(self, state: Any, value: float) -> None:
+        raise NotImplementedError
+
+    def _snapshot(self, state: Any) -> Any:
+        raise NotImplementedError
+
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic count, e.g. of finished jobs or cache lookups."""
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._series(()).record(amount)
+
+    def _initial_state(self) -> List[float]:
+        return [0.0]
+
+    def _fold(self, state: List[float], value: float) -> None:
+        state[0] += value
+
+    def _snapshot(self, state: List[float]) -> float:
+        return state[0]
+
+    def samples(self):
+        for label_values, series in list(self._children.items()):
+            yield self.name + "_total", dict(zip(self.labelnames, label_values)), series.read()
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative `le` buckets."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float], labelnames: Sequence[str] = ()):
+        self.buckets = sorted(buckets)
+        super().__init__(name, documentation, labelnames)
+
+    def observe(self, value: float) -> None:
+        self._series(()).record(value)
+
+    def _initial_state(self) -> Dict[str, Any]:
+        return {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0}
+
+    def _fold(self, state: Dict[str, Any], value: float) -> None:
+        state["counts"][bisect.bisect_left(self.buckets, value)] += 1
+        state["sum"] += value
+
+    def _snapshot(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        return {"counts": list(state["counts"]), "sum": state["sum"]}
+
+    def samples(self):
+        for label_values, series in list(self._children.items()):
+            labels = dict(zip(self.labelnames, label_values))
+            snapshot = series.read()
+            cumulative = 0
+            for bound, count in zip(self.buckets + [math.inf], snapshot["counts"]):
+                cumulative += count
+                yield self.name + "_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield self.name + "_sum", labels, snapshot["sum"]
+            yield self.name + "_count", labels, cumulative
+
+
+class Gauge(_Metric):
+    """
+    Value read from `read()` at collection time: a number, or a mapping of
+    label-value tuples to numbers for labelled gauges. None omits the gauge.
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], Any], labelnames: Sequence[str] = ()):
+        self.read = read
+        super().__init__(name, documentation, labelnames)
+
+    def samples(self):
+        value = self.read()
+        if value is None:
+            return
+        if not isinstance(value, dict):
+            value = {(): value}
+        for label_values, number in value.items():
+            yield self.name, dict(zip(self.labelnames, label_values)), number
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render() -> str:
+    """All registered metrics in the Prometheus text format (version 0.0.4)."""
+    lines = []
+    for metric in list(_METRICS.values()):
+        samples = list(metric.samples())
+        if not samples and metric.kind == "gauge":
+            continue
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in samples:
+            label_text = ",".join(f'{key}="{_escape(str(text))}"' for key, text in labels.items())
+            lines.append(f"{name}{{{label_text}}} {_format_value(value)}" if label_text else f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def resident_memory_bytes() -> Optional[int]:
+    """Current resident set size of this process, where the platform reports it."""
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current where /proc is unavailable (kilobytes on Linux, bytes on macOS).
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+# Metrics recorded by the sidecar. Gauges over the scheduler, registry and
+# caches are added by the /metrics route.
+JOBS_FINISHED = Counter("harmonization_jobs_finished", "Jobs that reached a final status.", ["status"])
+JOB_DURATION = Histogram(
+    "harmonization_job_duration_seconds",
+    "Seconds from a job starting to run to finishing.",
+    [0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600],
+)
+JOB_QUEUE_WAIT = Histogram(
+    "harmonization_job_queue_wait_seconds",
+    "Seconds a job waited in the queue before running.",
+    [0.01, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900],
+)
+JOB_ROWS_PER_SECOND = Histogram(
+    "harmonization_job_rows_per_second",
+    "Input rows harmonized and written per second, for completed jobs that were not served from the output cache.",
+    [100, 1_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000],
+)
+RULE_LOAD_SECONDS = Histogram(
+    "harmonization_rule_load_seconds",
+    "Seconds spent parsing and compiling a rule set on a rule-set cache miss.",
+    [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5],
+)
+RULES_CACHE_REQUESTS = Counter(
+    "harmonization_rules_cache_requests", "Rule-set cache lookups, by result.", ["result"]
+)
+OUTPUT_CACHE_REQUESTS = Counter(
+    "harmonization_output_cache_requests", "Output cache lookups of harmonize jobs, by result.", ["result"]
+)
+EVENT_LOOP_LAG = Histogram(
+    "harmonization_event_loop_lag_seconds",
+    "How late the API event loop ran a timer; high values mean requests wait for the loop.",
+    [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5],
+)
+_last_loop_lag = 0.0
+
+
+def _hit_ratio(counter: Counter) -> Optional[float]:
+    counts = {label_values[0]: series.read() for label_values, series in list(counter._children.items())}
+    total = sum(counts.values())
+    return counts.get("hit", 0.0) / total if total else None
+
+
+Gauge(
+    "harmonization_rules_cache_hit_ratio",
+    "Share of rule-set cache lookups served from the cache.",
+    lambda: _hit_ratio(RULES_CACHE_REQUESTS),
+)
+Gauge(
+    "harmonization_output_cache_hit_ratio",
+    "Share of output cache lookups served from the cache.",
+    lambda: _hit_ratio(OUTPUT_CACHE_REQUESTS),
+)
+Gauge("process_resident_memory_bytes", "Resident memory of the API process.", resident_memory_bytes)
+Gauge(
+    "harmonization_event_loop_lag_last_seconds",
+    "Event loop lag measured by the latest probe.",
+    lambda: _last_loop_lag,
+)
+
+
+async def monitor_event_loop(interval: float = LOOP_LAG_INTERVAL) -> None:
+    """Measure how late the running event loop wakes from a sleep, forever."""
+    global _last_loop_lag
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        _last_loop_lag = max(0.0, loop.time() - expected)
+        EVENT_LOOP_LAG.observe(_last_loop_lag)
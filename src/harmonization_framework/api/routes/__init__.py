@@ -1,9 +1,15 @@
 # src/api/routes/__init__.py
 
+from .diagnostics import router as diagnostics_router
 from .health import router as health_router
+from .jobs import router as jobs_router
+from .metrics import router as metrics_router
 from .rpc import router as rpc_router
 
 __all__ = [
+    "diagnostics_router",
     "health_router",
+    "jobs_router",
+    "metrics_router",
     "rpc_router",
 ]
@@ -0,0 +1,29 @@
+from typing import Dict
+
+from fastapi import APIRouter
+from pydantic import BaseModel
+
+from harmonization_framework.api.rpc_jobs import registry_stats
+from harmonization_framework.api.rpc_scheduler import SCHEDULER
+from harmonization_framework.api.rpc_sessions import SESSIONS
+from harmonization_framework.api.rule_set_cache import RULE_SETS
+
+router = APIRouter()
+
+
+class DiagnosticsResponse(BaseModel):
+    rules_cache: Dict[str, int]
+    jobs: Dict[str, int]
+    registry: Dict[str, int]
+    sessions: Dict[str, int]
+
+
+@router.get("/")
+def diagnostics() -> DiagnosticsResponse:
+    """Report the state of the sidecar's in-process caches, job scheduler, job registry and sessions."""
+    return DiagnosticsResponse(
+        rules_cache=RULE_SETS.stats(),
+        jobs=SCHEDULER.stats(),
+        registry=registry_stats(),
+        sessions=SESSIONS.stats(),
+    )
@@ -0,0 +1,56 @@
+import json
+from typing import AsyncIterator
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from harmonization_framework.api.rpc_errors import ErrorCode, build_error
+from harmonization_framework.api.rpc_handlers import job_snapshot
+from harmonization_framework.api.rpc_jobs import TERMINAL_STATUSES, JobId, get_job, wait_for_job_async
+
+router = APIRouter()
+
+# Seconds without a job update after which a keep-alive comment is sent. This
+# also bounds how long a closed stream goes unnoticed.
+KEEPALIVE_INTERVAL = 15.0
+
+
+async def _job_events(job_id: JobId) -> AsyncIterator[str]:
+    # Waits on the event loop, so open streams hold no server threads.
+    version = None
+    while True:
+        job = await wait_for_job_async(job_id, lambda current: current.version != version, KEEPALIVE_INTERVAL)
+        if job is None:
+            # Out of memory: read it back from the archive, if there is one.
+            job = await run_in_threadpool(get_job, job_id)
+        if job is None:
+            # Evicted with no archive to read it back from.
+            return
+        if job.version == version:
+            yield ": keep-alive\n\n"
+            continue
+        version = job.version
+        yield f"id: {version}\nevent: job\ndata: {json.dumps(job_snapshot(job), default=str)}\n\n"
+        if job.status in TERMINAL_STATUSES:
+            return
+
+
+@router.get("/{job_id}/events")
+def job_events(job_id: str):
+    """
+    Stream a job's state as Server-Sent Events.
+
+    Each `job` event carries the get_job result payload; one is sent at once
+    and another after every status or progress update (updates arriving
+    while the previous event is being sent are coalesced). The stream ends
+    after the event for a completed, failed or cancelled job.
+    """
+    if get_job(JobId(job_id)) is None:
+        error = build_error(ErrorCode.JOB_NOT_FOUND, f"Job not found: {job_id}", details={"job_id": job_id})
+        return JSONResponse(error.model_dump(), status_code=404)
+    return StreamingResponse(
+        _job_events(JobId(job_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
@@ -0,0 +1,39 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from harmonization_framework.api import metrics
+from harmonization_framework.api.rpc_jobs import status_counts
+from harmonization_framework.api.rpc_scheduler import SCHEDULER
+from harmonization_framework.api.rpc_sessions import SESSIONS
+from harmonization_framework.api.rule_set_cache import RULE_SETS
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+metrics.Gauge(
+    "harmonization_jobs",
+    "Jobs in the registry, by status.",
+    lambda: {(status,): count for status, count in status_counts().items()},
+    ["status"],
+)
+metrics.Gauge("harmonization_queue_depth", "Jobs waiting for a worker slot.", lambda: SCHEDULER.stats()["queued"])
+metrics.Gauge("harmonization_running_jobs", "Jobs running on a worker.", lambda: SCHEDULER.stats()["running"])
+metrics.Gauge(
+    "harmonization_running_job_memory_bytes",
+    "Estimated memory of the running jobs.",
+    lambda: SCHEDULER.stats()["running_memory"],
+)
+metrics.Gauge("harmonization_rules_cache_entries", "Rule sets in the API process's cache.", lambda: RULE_SETS.stats()["entries"])
+metrics.Gauge("harmonization_sessions", "Open rule-editing sessions.", lambda: SESSIONS.stats()["sessions"])
+metrics.Gauge(
+    "harmonization_sessions_memory_bytes",
+    "Estimated memory held by open sessions.",
+    lambda: SESSIONS.stats()["memory_bytes"],
+)
+
+
+@router.get("", response_class=PlainTextResponse)
+def scrape() -> PlainTextResponse:
+    """Report job, scheduler, cache and process metrics in the Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
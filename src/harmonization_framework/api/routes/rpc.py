@@ -1,7 +1,19 @@
 from fastapi import APIRouter
+from starlette.concurrency import run_in_threadpool
 
 from harmonization_framework.api.rpc_errors import ErrorCode, build_error
-from harmonization_framework.api.rpc_handlers import handle_get_job, handle_harmonize
+from harmonization_framework.api.rpc_handlers import (
+    handle_cancel_job,
+    handle_close_session,
+    handle_get_job,
+    handle_get_jobs,
+    handle_harmonize,
+    handle_harmonize_batch,
+    handle_harmonize_rows,
+    handle_open_session,
+    handle_update_session,
+    wait_on_event_loop,
+)
 from harmonization_framework.api.rpc_models import RpcRequest, RpcResponse
 
 router = APIRouter()
@@ -11,7 +23,13 @@ RPC API router.
 
 Implements a single POST /api endpoint with method dispatch. Currently supported:
 - harmonize: async CSV harmonization with row-based progress tracking
+- harmonize_batch: one async harmonize job per input, sharing one rules file
+- harmonize_rows: synchronous harmonization of inline rows (previews)
 - get_job: retrieve status/progress/result for a job
+- get_jobs: get_job for many jobs at once
+- cancel_job: stop a queued or running job
+- open_session / update_session / close_session: interactive rule editing
+  against a data file held in memory
 
 Method names use snake_case. The router also accepts camelCase aliases
 (e.g., getJob) for convenience.
@@ -30,14 +48,28 @@ def _normalize_method(method: str) -> str:
     """
     aliases = {
         "getJob": "get_job",
+        "getJobs": "get_jobs",
+        "harmonizeBatch": "harmonize_batch",
+        "cancelJob": "cancel_job",
+        "harmonizeRows": "harmonize_rows",
+        "openSession": "open_session",
+        "updateSession": "update_session",
+        "closeSession": "close_session",
         "harmonize": "harmonize",
+        "harmonize_rows": "harmonize_rows",
+        "open_session": "open_session",
+        "update_session": "update_session",
+        "close_session": "close_session",
         "get_job": "get_job",
+        "get_jobs": "get_jobs",
+        "harmonize_batch": "harmonize_batch",
+        "cancel_job": "cancel_job",
     }
     return aliases.get(method, method)
 
 
 @router.post("")
-def rpc_call(request: RpcRequest) -> RpcResponse:
+async def rpc_call(request: RpcRequest) -> RpcResponse:
     """
     Dispatch RPC methods and return a standardized response envelope.
 
@@ -57,22 +89,124 @@ def rpc_call(request: RpcRequest) -> RpcResponse:
           status: "accepted"
           job_id: string
 
+    - harmonize_batch:
+        params:
+          rules_file_path: absolute path to the RuleSet file shared by all items
+          items: [{data_file_path, output_file_path, replay_log_file_path,
+                   output_columns?, data_dictionary_path?}]
+          overwrite, output_columns, data_dictionary_path, bypass_cache:
+            as for harmonize, for every item (optional)
+
+        response:
+          status: "accepted"
+          result: {job_ids: [one job id per item, in item order]}
+          The rules file is read and compiled once for the whole batch.
+
+    - harmonize_rows:
+        params:
+          rows: list of input records (JSON objects), at most 10,000
+          rules: inline rules (RuleSet JSON contents), or
+          rules_file_path: absolute path to a rules file
+          output_columns: columns to return (optional)
+          dataset_name: `source dataset` value (optional, default "rows")
+
+        response:
+          status: "success"
+          result: {rows: [harmonized records]}
+          Runs synchronously; compiled rules are cached across calls.
+
     - get_job:
         params:
           job_id: string
+          wait: seconds to block until the status changes (optional, max 30)
+          status: status to wait for a change from (optional)
 
         response:
           status: "success"
           result: {
             job_id, status, progress, output_path, replay_log_path, result, error
           }
+
+    - get_jobs:
+        params:
+          job_ids: list of job ids
+          wait: seconds to block until any job's status changes (optional, max 30)
+
+        response:
+          status: "success"
+          result: {jobs: [get_job results], not_found: [job ids], counts: {status: n}}
+
+    - cancel_job:
+        params:
+          job_id: string
+
+        response:
+          status: "success"
+          result: {job_id, status, cancel_requested}
+          A queued job is "cancelled" at once; a running job stops at its
+          next rule, row batch or written chunk and then becomes "cancelled".
+
+    - open_session:
+        params:
+          data_file_path: absolute path to the input file
+          sample_rows, stratify_by, seed: keep a (stratified) sample (optional)
+          dataset_name: `source dataset` value (optional)
+
+        response:
+          status: "success"
+          result: {session_id, rows, columns, original_id, memory_bytes}
+
+    - update_session:
+        params:
+          session_id: string
+          rules / rules_file_path: the complete rule set, as for harmonize_rows
+
+        response:
+          status: "success"
+          result: {session_id, columns: {target: [values]}, unchanged, removed}
+          Only rules that are new or whose serialization changed are
+          recomputed and returned.
+
+    - close_session:
+        params:
+          session_id: string
+
+        response:
+          status: "success"
+          result: {session_id, closed: true}
     """
     method = _normalize_method(request.method)
+    # A get_job/get_jobs `wait` holds no server thread; the handlers run on one.
+    request = await wait_on_event_loop(method, request)
+    return await run_in_threadpool(_dispatch, method, request)
 
+
+def _dispatch(method: str, request: RpcRequest) -> RpcResponse:
     if method == "harmonize":
         return handle_harmonize(request)
 
+    if method == "harmonize_batch":
+        return handle_harmonize_batch(request)
+
+    if method == "harmonize_rows":
+        return handle_harmonize_rows(request)
+
     if method == "get_job":
         return handle_get_job(request)
 
+    if method == "open_session":
+        return handle_open_session(request)
+
+    if method == "update_session":
+        return handle_update_session(request)
+
+    if method == "close_session":
+        return handle_close_session(request)
+
+    if method == "get_jobs":
+        return handle_get_jobs(request)
+
+    if method == "cancel_job":
+        return handle_cancel_job(request)
+
     return build_error(ErrorCode.METHOD_NOT_FOUND, f"Unknown method: {request.method}")
@@ -32,6 +32,8 @@ class ErrorCode(str, Enum):
     RULE_NOT_FOUND = "RULE_NOT_FOUND"
     # Job id does not correspond to a known job.
     JOB_NOT_FOUND = "JOB_NOT_FOUND"
+    # Session id does not correspond to an open session.
+    SESSION_NOT_FOUND = "SESSION_NOT_FOUND"
     # Rules file could not be parsed or is invalid.
     INVALID_FORMAT = "INVALID_FORMAT"
     # Harmonization failed during execution.
@@ -1,23 +1,65 @@
+import functools
+import json
 import os
-import threading
+import time
 import uuid
-from typing import Optional, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
-import pandas as pd
+import yaml
 
-from harmonization_framework.harmonize import harmonize_dataset
+from harmonization_framework.data_dictionary import DataDictionary
+from harmonization_framework.dataset_io import dataset_exists, read_for_rules, storage_path, write_table
+from harmonization_framework.harmonize import HarmonizationCancelled, harmonize_dataset, harmonize_records
+from harmonization_framework.output_cache import OutputCache, cacheable, file_digest, fingerprint
 from harmonization_framework.replay_log import replay_logger as rlog
-from harmonization_framework.rule_registry import RuleSet
+from harmonization_framework.rule_registry import _YAML_LOADER, RuleSet, _is_yaml
+from harmonization_framework.api import metrics
 from harmonization_framework.api.rpc_errors import ErrorCode, build_error
 from harmonization_framework.api.rpc_jobs import (
+    TERMINAL_STATUSES,
     JobId,
     JobInfo,
     get_job,
+    job_statuses,
     register_job,
     update_job_status,
+    update_phase,
     update_progress,
+    wait_for_job,
+    wait_for_job_async,
+    wait_for_jobs,
+    wait_for_jobs_async,
 )
-from harmonization_framework.api.rpc_models import HarmonizeParams, RpcRequest, RpcResponse
+from harmonization_framework.api.rpc_models import (
+    HarmonizeBatchParams,
+    HarmonizeParams,
+    HarmonizeRowsParams,
+    OpenSessionParams,
+    RpcRequest,
+    RpcResponse,
+    UpdateSessionParams,
+)
+from harmonization_framework.api.rpc_scheduler import SCHEDULER, estimate_job_memory
+from harmonization_framework.api.rpc_sessions import SESSIONS, SessionTooLarge
+from harmonization_framework.api.rule_set_cache import RULE_SETS
+
+# Seconds between checks of a job's cancel event (a cross-process call for
+# worker processes).
+CANCEL_CHECK_INTERVAL = 0.05
+
+# Most rows a harmonize_rows call may send; it runs on the request thread.
+MAX_INLINE_ROWS = 10_000
+
+# Most items of one harmonize_batch call and job ids of one get_jobs call.
+MAX_BATCH_ITEMS = 10_000
+
+# Longest a get_job call with `wait` blocks (seconds). Through POST /api the
+# wait is done on the event loop (see `wait_on_event_loop`).
+MAX_GET_JOB_WAIT = 30.0
+
+# Directory of the content-addressed output cache; unset disables it.
+ENV_OUTPUT_CACHE_DIR = "API_OUTPUT_CACHE_DIR"
+ENV_OUTPUT_CACHE_MAX_BYTES = "API_OUTPUT_CACHE_MAX_BYTES"
 
 
 def _validate_paths(params: HarmonizeParams) -> Optional[RpcResponse]:
@@ -28,7 +70,12 @@ def _validate_paths(params: HarmonizeParams) -> Optional[RpcResponse]:
     - All paths must be absolute.
     - data_file_path and rules_file_path must exist.
     - output_file_path must not exist unless overwrite=True.
+    - data_file_path and output_file_path may be SQLite locations
+      (`/abs/file.sqlite::table`); the database file must be absolute, the
+      input table must exist, and an existing output table counts as an
+      existing output.
     - replay_log_file_path may be a new file and will be created if needed.
+    - data_dictionary_path, when given, must be absolute and exist.
     """
     for path_name, path_value in [
         ("data_file_path", params.data_file_path),
@@ -36,14 +83,14 @@ def _validate_paths(params: HarmonizeParams) -> Optional[RpcResponse]:
         ("output_file_path", params.output_file_path),
         ("replay_log_file_path", params.replay_log_file_path),
     ]:
-        if not os.path.isabs(path_value):
+        if not os.path.isabs(storage_path(path_value)):
             return build_error(
                 ErrorCode.INVALID_PATH,
                 f"{path_name} must be an absolute path",
                 details={"path": path_value, "path_type": path_name},
             )
 
-    if not os.path.exists(params.data_file_path):
+    if not dataset_exists(params.data_file_path):
         return build_error(
             ErrorCode.FILE_NOT_FOUND,
             f"Data file not found: {params.data_file_path}",
@@ -56,7 +103,21 @@ def _validate_paths(params: HarmonizeParams) -> Optional[RpcResponse]:
             details={"path": params.rules_file_path, "path_type": "rules_path"},
         )
 
-    if os.path.exists(params.output_file_path) and not params.overwrite:
+    if params.data_dictionary_path is not None:
+        if not os.path.isabs(params.data_dictionary_path):
+            return build_error(
+                ErrorCode.INVALID_PATH,
+                "data_dictionary_path must be an absolute path",
+                details={"path": params.data_dictionary_path, "path_type": "data_dictionary_path"},
+            )
+        if not os.path.exists(params.data_dictionary_path):
+            return build_error(
+                ErrorCode.FILE_NOT_FOUND,
+                f"Data dictionary not found: {params.data_dictionary_path}",
+                details={"path": params.data_dictionary_path, "path_type": "data_dictionary_path"},
+            )
+
+    if dataset_exists(params.output_file_path) and not params.overwrite:
         return build_error(
             ErrorCode.ALREADY_EXISTS,
             f"Output path already exists: {params.output_file_path}",
@@ -66,11 +127,10 @@ def _validate_paths(params: HarmonizeParams) -> Optional[RpcResponse]:
     return None
 
 
-def _load_rules(params: HarmonizeParams) -> Tuple[Optional[RuleSet], Optional[RpcResponse]]:
-    """Load a RuleSet from a rules JSON file."""
-    rules = RuleSet()
+def _load_rules(params: Union[HarmonizeParams, HarmonizeRowsParams, UpdateSessionParams]) -> Tuple[Optional[RuleSet], Optional[RpcResponse]]:
+    """Load a RuleSet from a rules file, reusing it while the file is unchanged."""
     try:
-        rules.load(params.rules_file_path, clean=True)
+        rules = RULE_SETS.get(params.rules_file_path)
     except Exception as exc:
         return None, build_error(ErrorCode.INVALID_FORMAT, f"Failed to load rules: {exc}")
     if len(rules) == 0:
@@ -82,7 +142,66 @@ def _load_rules(params: HarmonizeParams) -> Tuple[Optional[RuleSet], Optional[Rp
     return rules, None
 
 
-def _run_harmonize(job_id: JobId, params: HarmonizeParams) -> None:
+def _output_cache() -> Optional[OutputCache]:
+    """The output cache configured through the environment, if any."""
+    directory = os.environ.get(ENV_OUTPUT_CACHE_DIR)
+    if not directory:
+        return None
+    max_bytes = os.environ.get(ENV_OUTPUT_CACHE_MAX_BYTES)
+    if max_bytes:
+        return OutputCache(directory, max_bytes=int(max_bytes))
+    return OutputCache(directory)
+
+
+def _job_fingerprint(params: HarmonizeParams, rules: RuleSet) -> str:
+    dictionary = params.data_dictionary_path
+    return fingerprint(
+        params.data_file_path,
+        rules,
+        params.output_file_path,
+        output_columns=params.output_columns,
+        dataset_name=os.path.basename(params.data_file_path),
+        data_dictionary=file_digest(dictionary) if dictionary is not None else None,
+    )
+
+
+def _cancel_check(cancel_event: Any) -> Callable[[], bool]:
+    """A check of `cancel_event` that queries it at most every CANCEL_CHECK_INTERVAL."""
+    if cancel_event is None:
+        return lambda: False
+    state = {"checked": 0.0, "cancelled": False}
+
+    def cancelled() -> bool:
+        now = time.monotonic()
+        if not state["cancelled"] and now - state["checked"] >= CANCEL_CHECK_INTERVAL:
+            state["checked"] = now
+            state["cancelled"] = cancel_event.is_set()
+        return state["cancelled"]
+
+    return cancelled
+
+
+def _discard_partial_results(params: HarmonizeParams, logger, log_offset: int, output_started: bool) -> None:
+    """Remove what a cancelled job wrote: its replay log lines and any partial output file."""
+    for handler in list(logger.handlers):
+        handler.close()
+        logger.removeHandler(handler)
+    if os.path.exists(params.replay_log_file_path):
+        if log_offset == 0:
+            os.remove(params.replay_log_file_path)
+        else:
+            os.truncate(params.replay_log_file_path, log_offset)
+    # A SQLite output is written in one transaction, which the error rolled back.
+    if output_started and cacheable(params.output_file_path) and os.path.exists(params.output_file_path):
+        os.remove(params.output_file_path)
+
+
+def _run_harmonize(
+    job_id: JobId,
+    params: HarmonizeParams,
+    cancel_event: Any = None,
+    rules: Optional[RuleSet] = None,
+) -> None:
     """
     Worker that performs harmonization and updates job state.
 
@@ -90,11 +209,23 @@ def _run_harmonize(job_id: JobId, params: HarmonizeParams) -> None:
     1) Validate paths and overwrite behavior.
     2) Load rules from the rule set JSON file.
     3) Create output/log directories as needed.
-    4) Read input CSV, apply harmonization with row-based progress callbacks.
-    5) Write output CSV and finalize job state.
+    4) With an output cache configured, fingerprint the job and, unless
+       bypass_cache is set, complete it from a cached output.
+    5) Read input table (only the needed columns when output_columns is set),
+       apply harmonization with row-based progress callbacks.
+    6) Write output table (reported as the "writing" phase), store it in the
+       output cache and finalize job state.
 
     On failure, sets job status to "failed" and records a structured error.
+    `rules`, when given, is the compiled rule set to use instead of loading
+    rules_file_path. The handlers resolve it in the API process, so the
+    sidecar's rule-set cache serves every job even when jobs run in worker
+    processes (the RuleSet is pickled to the worker).
+    When `cancel_event` is set, the job stops at the next rule, row batch or
+    written chunk, drops the dataset, removes its partial output and replay
+    log lines, and ends "cancelled".
     """
+    cancelled = _cancel_check(cancel_event)
     update_job_status(job_id, status="running", progress=0.0)
 
     validation_error = _validate_paths(params)
@@ -102,29 +233,83 @@ def _run_harmonize(job_id: JobId, params: HarmonizeParams) -> None:
         update_job_status(job_id, status="failed", error=validation_error.error.model_dump())
         return
 
-    rules, error = _load_rules(params)
+    error = None
+    if rules is None:
+        rules, error = _load_rules(params)
     if error:
         update_job_status(job_id, status="failed", error=error.error.model_dump())
         return
 
-    os.makedirs(os.path.dirname(params.output_file_path), exist_ok=True)
+    os.makedirs(os.path.dirname(storage_path(params.output_file_path)), exist_ok=True)
     os.makedirs(os.path.dirname(params.replay_log_file_path), exist_ok=True)
 
-    dataset = pd.read_csv(params.data_file_path)
+    cache = _output_cache()
+    key = None
+    if cache is not None and cacheable(params.output_file_path):
+        try:
+            key = _job_fingerprint(params, rules)
+            if not params.bypass_cache:
+                hit = cache.fetch(key, params.output_file_path, params.replay_log_file_path)
+                metrics.OUTPUT_CACHE_REQUESTS.labels(result="hit" if hit else "miss").inc()
+                if hit:
+                    update_job_status(
+                        job_id,
+                        status="completed",
+                        progress=1.0,
+                        result={
+                            "output_path": params.output_file_path,
+                            "replay_log_path": params.replay_log_file_path,
+                            "cached": True,
+                        },
+                    )
+                    return
+        except OSError:
+            key = None
+
+    # The replay log is appended to; a cache entry keeps only this run's lines.
+    log_offset = os.path.getsize(params.replay_log_file_path) if os.path.exists(params.replay_log_file_path) else 0
     logger = rlog.configure_logger(3, params.replay_log_file_path)
 
     def progress_callback(processed: int, total: int) -> None:
         update_progress(job_id, processed, total)
 
+    def write_progress(written: int, total: int) -> None:
+        if cancelled():
+            raise HarmonizationCancelled()
+        update_phase(job_id, "writing", written, total)
+
+    dataset = harmonized = None
+    output_started = False
     try:
+        if cancelled():
+            raise HarmonizationCancelled()
+        dictionary = None
+        if params.data_dictionary_path is not None:
+            dictionary = DataDictionary.load(params.data_dictionary_path)
+        dataset = read_for_rules(params.data_file_path, rules, params.output_columns, dictionary)
+        update_phase(job_id, "harmonizing")
         harmonized = harmonize_dataset(
             dataset=dataset,
             rules=rules,
             dataset_name=os.path.basename(params.data_file_path),
             logger=logger,
             progress_callback=progress_callback,
+            cancel_check=cancelled,
         )
-        harmonized.to_csv(params.output_file_path, index=False)
+        dataset = None
+        rows = len(harmonized)
+        if params.output_columns is not None:
+            harmonized = harmonized[params.output_columns]
+        if cancelled():
+            raise HarmonizationCancelled()
+        update_phase(job_id, "writing")
+        output_started = True
+        write_table(harmonized, params.output_file_path, progress_callback=write_progress)
+    except HarmonizationCancelled:
+        dataset = harmonized = None
+        _discard_partial_results(params, logger, log_offset, output_started)
+        update_job_status(job_id, status="cancelled")
+        return
     except Exception as exc:
         update_job_status(
             job_id,
@@ -136,6 +321,8 @@ def _run_harmonize(job_id: JobId, params: HarmonizeParams) -> None:
         )
         return
 
+    if key is not None:
+        cache.store(key, params.output_file_path, params.replay_log_file_path, log_offset)
     update_job_status(
         job_id,
         status="completed",
@@ -143,6 +330,8 @@ def _run_harmonize(job_id: JobId, params: HarmonizeParams) -> None:
         result={
             "output_path": params.output_file_path,
             "replay_log_path": params.replay_log_file_path,
+            "cached": False,
+            "rows": rows,
         },
     )
 
@@ -164,13 +353,236 @@ def handle_harmonize(request: RpcRequest) -> RpcResponse:
     )
     register_job(job)
 
-    thread = threading.Thread(target=_run_harmonize, args=(job_id, params), daemon=True)
-    thread.start()
+    SCHEDULER.submit(
+        job_id,
+        functools.partial(_run_harmonize, job_id, params, rules=_job_rules(params)),
+        memory=estimate_job_memory(params.data_file_path),
+    )
     return RpcResponse(status="accepted", job_id=job_id)
 
 
+def _job_rules(params: HarmonizeParams) -> Optional[RuleSet]:
+    """
+    The job's rules from the API process's rule-set cache, or None to let the
+    job load them and report what is wrong with the rules file.
+    """
+    if not (os.path.isabs(params.rules_file_path) and os.path.isfile(params.rules_file_path)):
+        return None
+    rules, error = _load_rules(params)
+    return None if error else rules
+
+
+def _read_rules_payload(path: str) -> Any:
+    """The parsed contents of a JSON or YAML rules file."""
+    with open(path, "r") as handle:
+        text = handle.read()
+    return yaml.load(text, Loader=_YAML_LOADER) if _is_yaml(path) else json.loads(text)
+
+
+def handle_harmonize_batch(request: RpcRequest) -> RpcResponse:
+    """
+    Handle the harmonize_batch RPC method: one harmonize job per item, all
+    sharing one rules file that is read and compiled once.
+
+    Request-level problems (params, the rules file, duplicate output paths)
+    reject the whole batch; problems with one item's paths fail only its job.
+    """
+    try:
+        params = HarmonizeBatchParams(**request.params)
+    except Exception as exc:
+        return build_error(ErrorCode.VALIDATION_ERROR, str(exc), details={"params": request.params})
+    if not 0 < len(params.items) <= MAX_BATCH_ITEMS:
+        return build_error(
+            ErrorCode.VALIDATION_ERROR,
+            f"harmonize_batch takes between 1 and {MAX_BATCH_ITEMS} items",
+            details={"field": "items"},
+        )
+    outputs = [storage_path(item.output_file_path) for item in params.items]
+    if len(set(outputs)) != len(outputs):
+        return build_error(
+            ErrorCode.VALIDATION_ERROR,
+            "Each item needs its own output_file_path",
+            details={"field": "items"},
+        )
+    if not os.path.isabs(params.rules_file_path):
+        return build_error(
+            ErrorCode.INVALID_PATH,
+            "rules_file_path must be an absolute path",
+            details={"path": params.rules_file_path, "path_type": "rules_file_path"},
+        )
+    if not os.path.exists(params.rules_file_path):
+        return build_error(
+            ErrorCode.FILE_NOT_FOUND,
+            f"Rules file not found: {params.rules_file_path}",
+            details={"path": params.rules_file_path, "path_type": "rules_path"},
+        )
+    try:
+        rules_payload = _read_rules_payload(params.rules_file_path)
+        rules = RULE_SETS.get_inline(rules_payload)
+    except Exception as exc:
+        return build_error(ErrorCode.INVALID_FORMAT, f"Failed to load rules: {exc}")
+    if len(rules) == 0:
+        return build_error(
+            ErrorCode.RULE_NOT_FOUND,
+            "No rules found in rules file",
+            details={"path": params.rules_file_path},
+        )
+
+    job_ids = []
+    for item in params.items:
+        item_params = HarmonizeParams(
+            data_file_path=item.data_file_path,
+            rules_file_path=params.rules_file_path,
+            replay_log_file_path=item.replay_log_file_path,
+            output_file_path=item.output_file_path,
+            overwrite=params.overwrite,
+            output_columns=item.output_columns if item.output_columns is not None else params.output_columns,
+            data_dictionary_path=item.data_dictionary_path or params.data_dictionary_path,
+            bypass_cache=params.bypass_cache,
+        )
+        job_id = JobId(str(uuid.uuid4()))
+        register_job(JobInfo(
+            job_id=job_id,
+            status="queued",
+            progress=0.0,
+            output_path=item_params.output_file_path,
+            replay_log_path=item_params.replay_log_file_path,
+        ))
+        SCHEDULER.submit(
+            job_id,
+            functools.partial(_run_harmonize, job_id, item_params, rules=rules),
+            memory=estimate_job_memory(item_params.data_file_path),
+        )
+        job_ids.append(job_id)
+    return RpcResponse(status="accepted", result={"job_ids": job_ids})
+
+
+def _resolve_rules(
+    params: Union[HarmonizeRowsParams, UpdateSessionParams],
+    allow_empty: bool = False,
+) -> Tuple[Optional[RuleSet], Optional[RpcResponse]]:
+    """The rules given inline (`rules`) or by path (`rules_file_path`), from the rule-set cache."""
+    if (params.rules is None) == (params.rules_file_path is None):
+        return None, build_error(
+            ErrorCode.MISSING_FIELD,
+            "Exactly one of rules or rules_file_path is required",
+            details={"field": "rules"},
+        )
+
+    if params.rules is not None:
+        try:
+            rules = RULE_SETS.get_inline(params.rules)
+        except Exception as exc:
+            return None, build_error(ErrorCode.INVALID_FORMAT, f"Failed to load rules: {exc}", details={"field": "rules"})
+        if len(rules) == 0 and not allow_empty:
+            return None, build_error(ErrorCode.RULE_NOT_FOUND, "No rules found in rules", details={"field": "rules"})
+    else:
+        if not os.path.isabs(params.rules_file_path):
+            return None, build_error(
+                ErrorCode.INVALID_PATH,
+                "rules_file_path must be an absolute path",
+                details={"path": params.rules_file_path, "path_type": "rules_file_path"},
+            )
+        if not os.path.exists(params.rules_file_path):
+            return None, build_error(
+                ErrorCode.FILE_NOT_FOUND,
+                f"Rules file not found: {params.rules_file_path}",
+                details={"path": params.rules_file_path, "path_type": "rules_path"},
+            )
+        return _load_rules(params)
+    return rules, None
+
+
+def handle_harmonize_rows(request: RpcRequest) -> RpcResponse:
+    """
+    Handle the harmonize_rows RPC method: harmonize inline rows and return
+    them in the response, without a job or any files.
+    """
+    try:
+        params = HarmonizeRowsParams(**request.params)
+    except Exception as exc:
+        return build_error(ErrorCode.VALIDATION_ERROR, str(exc), details={"params": request.params})
+    if len(params.rows) > MAX_INLINE_ROWS:
+        return build_error(
+            ErrorCode.VALIDATION_ERROR,
+            f"harmonize_rows accepts at most {MAX_INLINE_ROWS} rows; use harmonize for larger inputs",
+            details={"field": "rows"},
+        )
+    rules, error = _resolve_rules(params)
+    if error:
+        return error
+
+    try:
+        rows = harmonize_records(params.rows, rules, params.dataset_name, params.output_columns)
+    except Exception as exc:
+        return build_error(ErrorCode.HARMONIZATION_FAILED, str(exc) or type(exc).__name__)
+    return RpcResponse(status="success", result={"rows": rows})
+
+
+def handle_cancel_job(request: RpcRequest) -> RpcResponse:
+    """Handle the cancel_job RPC method."""
+    job_id_value = request.params.get("job_id")
+    if not job_id_value:
+        return build_error(
+            ErrorCode.MISSING_FIELD,
+            "job_id is required",
+            details={"field": "job_id"},
+        )
+    job_id = JobId(job_id_value)
+    if not get_job(job_id):
+        return build_error(
+            ErrorCode.JOB_NOT_FOUND,
+            f"Job not found: {job_id}",
+            details={"job_id": job_id},
+        )
+    cancelled_in = SCHEDULER.cancel(job_id)
+    if cancelled_in == "queued":
+        update_job_status(job_id, status="cancelled")
+    job = get_job(job_id)
+    return RpcResponse(
+        status="success",
+        result={
+            "job_id": job.job_id,
+            "status": job.status,
+            "cancel_requested": cancelled_in is not None,
+        },
+    )
+
+
+def job_snapshot(job: JobInfo, queue_positions: Optional[Dict[JobId, int]] = None) -> Dict[str, Any]:
+    """
+    The get_job result payload for `job`. `queue_positions` (from
+    `SCHEDULER.queue_positions()`) saves a queue scan per job when
+    describing many jobs.
+    """
+    if job.status != "queued":
+        queue_position = None
+    elif queue_positions is not None:
+        queue_position = queue_positions.get(job.job_id)
+    else:
+        queue_position = SCHEDULER.queue_position(job.job_id)
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "progress": job.progress,
+        "phase": job.phase,
+        "phase_progress": job.phase_progress,
+        "queue_position": queue_position,
+        "output_path": job.output_path,
+        "replay_log_path": job.replay_log_path,
+        "result": job.result,
+        "error": job.error,
+    }
+
+
 def handle_get_job(request: RpcRequest) -> RpcResponse:
-    """Handle the get_job RPC method."""
+    """
+    Handle the get_job RPC method.
+
+    With `wait` (seconds), block until the job's status differs from
+    `status` (default: its status when the call arrives) or the wait runs
+    out, and then answer as usual. A finished job is returned at once.
+    """
     job_id_value = request.params.get("job_id")
     if not job_id_value:
         return build_error(
@@ -178,6 +590,13 @@ def handle_get_job(request: RpcRequest) -> RpcResponse:
             "job_id is required",
             details={"field": "job_id"},
         )
+    wait = request.params.get("wait")
+    if wait is not None and (isinstance(wait, bool) or not isinstance(wait, (int, float)) or wait < 0):
+        return build_error(
+            ErrorCode.VALIDATION_ERROR,
+            "wait must be a non-negative number of seconds",
+            details={"field": "wait"},
+        )
     job_id = JobId(job_id_value)
     job = get_job(job_id)
     if not job:
@@ -186,15 +605,188 @@ def handle_get_job(request: RpcRequest) -> RpcResponse:
             f"Job not found: {job_id}",
             details={"job_id": job_id},
         )
+    if wait:
+        seen_status = request.params.get("status") or job.status
+        job = wait_for_job(
+            job_id,
+            lambda current: current.status != seen_status or current.status in TERMINAL_STATUSES,
+            min(float(wait), MAX_GET_JOB_WAIT),
+        ) or job
+    return RpcResponse(status="success", result=job_snapshot(job))
+
+
+async def wait_on_event_loop(method: str, request: RpcRequest) -> RpcRequest:
+    """
+    Do the `wait` of a get_job or get_jobs call on the running event loop, so
+    waiting calls hold no server threads, and return the request without
+    `wait` for its handler to answer at once. Other requests, and ones whose
+    params the handler will reject, are returned unchanged.
+    """
+    wait = request.params.get("wait")
+    if method not in ("get_job", "get_jobs") or isinstance(wait, bool) or not isinstance(wait, (int, float)) or wait < 0:
+        return request
+    timeout = min(float(wait), MAX_GET_JOB_WAIT)
+    if method == "get_job":
+        job_id_value = request.params.get("job_id")
+        if not isinstance(job_id_value, str) or not job_id_value:
+            return request
+        job_id = JobId(job_id_value)
+        # Jobs out of memory are finished (or unknown) and answered at once.
+        seen = job_statuses([job_id])
+        if job_id in seen and timeout:
+            seen_status = request.params.get("status") or seen[job_id]
+            await wait_for_job_async(
+                job_id,
+                lambda current: current.status != seen_status or current.status in TERMINAL_STATUSES,
+                timeout,
+            )
+    else:
+        job_ids = request.params.get("job_ids")
+        if (
+            not job_ids
+            or not isinstance(job_ids, list)
+            or len(job_ids) > MAX_BATCH_ITEMS
+            or not all(isinstance(job_id, str) for job_id in job_ids)
+        ):
+            return request
+        seen = job_statuses(JobId(job_id) for job_id in job_ids)
+        if timeout and any(status not in TERMINAL_STATUSES for status in seen.values()):
+            await wait_for_jobs_async(seen, lambda current: current.status != seen[current.job_id], timeout)
+    params = {key: value for key, value in request.params.items() if key != "wait"}
+    return RpcRequest(method=request.method, params=params)
+
+
+def _session_not_found(session_id: str) -> RpcResponse:
+    return build_error(
+        ErrorCode.SESSION_NOT_FOUND,
+        f"Session not found: {session_id}",
+        details={"session_id": session_id},
+    )
+
+
+def handle_open_session(request: RpcRequest) -> RpcResponse:
+    """Handle the open_session RPC method: load a data file (or a sample) into a new session."""
+    try:
+        params = OpenSessionParams(**request.params)
+    except Exception as exc:
+        return build_error(ErrorCode.VALIDATION_ERROR, str(exc), details={"params": request.params})
+    if not os.path.isabs(storage_path(params.data_file_path)):
+        return build_error(
+            ErrorCode.INVALID_PATH,
+            "data_file_path must be an absolute path",
+            details={"path": params.data_file_path, "path_type": "data_file_path"},
+        )
+    if not dataset_exists(params.data_file_path):
+        return build_error(
+            ErrorCode.FILE_NOT_FOUND,
+            f"Data file not found: {params.data_file_path}",
+            details={"path": params.data_file_path, "path_type": "data_path"},
+        )
+    try:
+        session = SESSIONS.open(
+            params.data_file_path,
+            sample_rows=params.sample_rows,
+            stratify_by=params.stratify_by,
+            seed=params.seed,
+            dataset_name=params.dataset_name,
+        )
+    except SessionTooLarge as exc:
+        return build_error(ErrorCode.VALIDATION_ERROR, str(exc), details={"field": "sample_rows"})
+    except KeyError as exc:
+        return build_error(ErrorCode.VALIDATION_ERROR, str(exc.args[0]), details={"field": "stratify_by"})
+    except Exception as exc:
+        return build_error(ErrorCode.INVALID_FORMAT, f"Failed to read data file: {exc}")
     return RpcResponse(
         status="success",
         result={
-            "job_id": job.job_id,
-            "status": job.status,
-            "progress": job.progress,
-            "output_path": job.output_path,
-            "replay_log_path": job.replay_log_path,
-            "result": job.result,
-            "error": job.error,
+            "session_id": session.session_id,
+            "rows": len(session.dataset),
+            "columns": [str(column) for column in session.dataset.columns],
+            "original_id": session.dataset.index.to_list(),
+            "memory_bytes": session.memory,
         },
     )
+
+
+def handle_update_session(request: RpcRequest) -> RpcResponse:
+    """Handle the update_session RPC method: apply a rule set, recomputing only changed rules."""
+    try:
+        params = UpdateSessionParams(**request.params)
+    except Exception as exc:
+        return build_error(ErrorCode.VALIDATION_ERROR, str(exc), details={"params": request.params})
+    rules, error = _resolve_rules(params, allow_empty=True)
+    if error:
+        return error
+    try:
+        SESSIONS.get(params.session_id)
+    except KeyError:
+        return _session_not_found(params.session_id)
+    try:
+        result = SESSIONS.update(params.session_id, rules)
+    except SessionTooLarge as exc:
+        return build_error(ErrorCode.VALIDATION_ERROR, str(exc), details={"field": "rules"})
+    except Exception as exc:
+        return build_error(ErrorCode.HARMONIZATION_FAILED, str(exc) or type(exc).__name__)
+    return RpcResponse(status="success", result={"session_id": params.session_id, **result})
+
+
+def handle_close_session(request: RpcRequest) -> RpcResponse:
+    """Handle the close_session RPC method."""
+    session_id = request.params.get("session_id")
+    if not session_id:
+        return build_error(ErrorCode.MISSING_FIELD, "session_id is required", details={"field": "session_id"})
+    if not SESSIONS.close(session_id):
+        return _session_not_found(session_id)
+    return RpcResponse(status="success", result={"session_id": session_id, "closed": True})
+
+
+def handle_get_jobs(request: RpcRequest) -> RpcResponse:
+    """
+    Handle the get_jobs RPC method: the get_job payload of many jobs.
+
+    With `wait` (seconds), block until any of the jobs has a status other
+    than the one it had when the call arrived, or the wait runs out. Returns
+    at once when all of them are finished.
+    """
+    job_ids = request.params.get("job_ids")
+    if not job_ids:
+        return build_error(ErrorCode.MISSING_FIELD, "job_ids is required", details={"field": "job_ids"})
+    if not isinstance(job_ids, list) or len(job_ids) > MAX_BATCH_ITEMS:
+        return build_error(
+            ErrorCode.VALIDATION_ERROR,
+            f"job_ids must be a list of at most {MAX_BATCH_ITEMS} job ids",
+            details={"field": "job_ids"},
+        )
+    wait = request.params.get("wait")
+    if wait is not None and (isinstance(wait, bool) or not isinstance(wait, (int, float)) or wait < 0):
+        return build_error(
+            ErrorCode.VALIDATION_ERROR,
+            "wait must be a non-negative number of seconds",
+            details={"field": "wait"},
+        )
+
+    if wait:
+        seen = {}
+        for job_id in job_ids:
+            job = get_job(JobId(job_id))
+            if job is not None:
+                seen[job.job_id] = job.status
+        if any(status not in TERMINAL_STATUSES for status in seen.values()):
+            wait_for_jobs(
+                [JobId(job_id) for job_id in seen],
+                lambda current: current.status != seen[current.job_id],
+                min(float(wait), MAX_GET_JOB_WAIT),
+            )
+
+    queue_positions = SCHEDULER.queue_positions()
+    jobs = []
+    not_found = []
+    counts: Dict[str, int] = {}
+    for job_id in job_ids:
+        job = get_job(JobId(job_id))
+        if job is None:
+            not_found.append(job_id)
+            continue
+        jobs.append(job_snapshot(job, queue_positions))
+        counts[job.status] = counts.get(job.status, 0) + 1
+    return RpcResponse(status="success", result={"jobs": jobs, "not_found": not_found, "counts": counts})
@@ -0,0 +1,52 @@
+"""
+SQLite store for jobs evicted from the in-memory registry.
+
+Each finished job is stored as one JSON row (its `JobInfo` fields), so
+`get_job` can still answer for it after the registry dropped it. The store
+keeps at most `max_jobs` rows and drops the oldest beyond that.
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import closing
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_MAX_JOBS = 10_000
+
+
+class JobArchive:
+    """Finished jobs keyed by job id in a SQLite file."""
+
+    def __init__(self, path: str, max_jobs: int = DEFAULT_MAX_JOBS):
+        self.path = path
+        self.max_jobs = max_jobs
+        self._lock = threading.Lock()
+        with closing(sqlite3.connect(path)) as connection, connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id TEXT PRIMARY KEY, finished_at REAL NOT NULL, payload TEXT NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS jobs_finished_at ON jobs (finished_at)")
+
+    def store(self, jobs: Iterable[Dict[str, Any]]) -> None:
+        """Store job field dicts (with `job_id` and `finished_at`), replacing older rows of the same jobs."""
+        rows = [(job["job_id"], job.get("finished_at") or 0.0, json.dumps(job, default=str)) for job in jobs]
+        if not rows:
+            return
+        with self._lock, closing(sqlite3.connect(self.path)) as connection, connection:
+            connection.executemany("INSERT OR REPLACE INTO jobs VALUES (?, ?, ?)", rows)
+            connection.execute(
+                "DELETE FROM jobs WHERE job_id IN ("
+                "SELECT job_id FROM jobs ORDER BY finished_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_jobs,),
+            )
+
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock, closing(sqlite3.connect(self.path)) as connection:
+            row = connection.execute("SELECT payload FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def __len__(self) -> int:
+        with self._lock, closing(sqlite3.connect(self.path)) as connection:
+            return connection.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
@@ -1,6 +1,37 @@
-from dataclasses import dataclass
-from typing import Dict, Optional, NewType
+"""
+In-memory registry of RPC jobs.
+
+Finished (completed, failed or cancelled) jobs are evicted once they are
+older than the TTL or when the registry holds more than `max_jobs` jobs,
+oldest first; queued and running jobs are never evicted. With an archive
+configured, evicted jobs are written to a SQLite file and `get_job` still
+finds them there.
+
+Configured through the environment (read when the sidecar starts), or with
+`configure_registry`:
+- API_JOB_TTL: seconds a finished job stays in memory (default 3600).
+- API_MAX_JOBS: jobs kept in memory (default 1000).
+- API_JOB_ARCHIVE_PATH: SQLite file for evicted jobs (default: none, evicted
+  jobs are forgotten).
+
+Every update bumps the job's `version` and wakes the threads blocked in
+`wait_for_job`, so callers can wait for a change instead of polling. The
+`*_async` waits do the same on an asyncio event loop without holding a
+thread: updates wake them through `loop.call_soon_threadsafe`. When a job
+finishes, its status, queue wait, run time and throughput are recorded in
+`metrics`.
+"""
+
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Callable, Dict, Iterable, List, Optional, NewType, Set, Tuple
+import asyncio
+import os
 import threading
+import time
+
+from harmonization_framework.api import metrics
+from harmonization_framework.api.rpc_job_archive import JobArchive
 
 
 JobId = NewType("JobId", str)
@@ -13,12 +44,19 @@ class JobInfo:
 
     Fields:
         job_id: Unique identifier for the job.
-        status: One of queued|running|completed|failed.
-        progress: Float in [0.0, 1.0] representing completion.
+        status: One of queued|running|completed|failed|cancelled.
+        progress: Float in [0.0, 1.0] representing harmonization completion
+            (cells processed).
+        phase: What a running job is doing: "harmonizing" or "writing".
+        phase_progress: Float in [0.0, 1.0], completion of the current phase.
         output_path: Target CSV path for the harmonized output.
         replay_log_path: Path where the replay log is written.
         error: Optional structured error payload (matches ErrorDetail schema).
         result: Optional result payload (e.g., output/replay paths).
+        created_at: Unix time the job was registered.
+        started_at: Unix time the job started running.
+        finished_at: Unix time the job reached a terminal status.
+        version: Counter bumped by every update of the job.
     """
     job_id: JobId
     status: str
@@ -27,24 +65,274 @@ class JobInfo:
     replay_log_path: str
     error: Optional[Dict] = None
     result: Optional[Dict] = None
+    phase: Optional[str] = None
+    phase_progress: float = 0.0
+    created_at: Optional[float] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    version: int = 0
 
 
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled"})
+
+ENV_JOB_TTL = "API_JOB_TTL"
+ENV_MAX_JOBS = "API_MAX_JOBS"
+ENV_JOB_ARCHIVE_PATH = "API_JOB_ARCHIVE_PATH"
+DEFAULT_JOB_TTL = 3600.0
+DEFAULT_MAX_JOBS = 1000
+
 # In-memory job registry guarded by a lock for thread-safe updates.
 _jobs: Dict[JobId, JobInfo] = {}
 _jobs_lock = threading.Lock()
+# Notified (with _jobs_lock held) whenever a job changes or is evicted.
+_changed = threading.Condition(_jobs_lock)
+# Event loops and events of the `*_async` waiters, set like _changed is notified.
+_async_waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+# Finished job ids in the order they finished, for eviction.
+_finished: "OrderedDict[JobId, float]" = OrderedDict()
+_evicted = 0
+# Evicted jobs on their way to the archive, so get_job finds them meanwhile.
+_archiving: Dict[JobId, JobInfo] = {}
+_job_ttl = float(os.environ.get(ENV_JOB_TTL) or DEFAULT_JOB_TTL)
+_max_jobs = int(os.environ.get(ENV_MAX_JOBS) or DEFAULT_MAX_JOBS)
+_archive: Optional[JobArchive] = (
+    JobArchive(os.environ[ENV_JOB_ARCHIVE_PATH]) if os.environ.get(ENV_JOB_ARCHIVE_PATH) else None
+)
+
+# In a job worker process, updates are not applied to the (process-local)
+# registry but handed to this callable, which sends them to the API process.
+UpdateForwarder = Callable[[str, tuple, Dict[str, Any]], None]
+_forward: Optional[UpdateForwarder] = None
+
+
+def forward_updates(forwarder: Optional[UpdateForwarder]) -> None:
+    """Send this process's job updates to `forwarder` (None restores local updates)."""
+    global _forward
+    _forward = forwarder
+
+
+def apply_update(name: str, args: tuple, kwargs: Dict[str, Any]) -> None:
+    """Apply a job update forwarded from a worker process."""
+    _UPDATES[name](*args, **kwargs)
+
+
+def _notify_locked() -> None:
+    """Wake every waiter; caller holds _jobs_lock."""
+    _changed.notify_all()
+    for loop, event in _async_waiters:
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # The waiter's loop is closed.
+            pass
+
+
+def configure_registry(
+    ttl: Optional[float] = None,
+    max_jobs: Optional[int] = None,
+    archive_path: Optional[str] = None,
+) -> None:
+    """Change the eviction TTL, the in-memory job limit and/or the archive file."""
+    global _job_ttl, _max_jobs, _archive
+    with _jobs_lock:
+        if ttl is not None:
+            _job_ttl = ttl
+        if max_jobs is not None:
+            _max_jobs = max_jobs
+        if archive_path is not None:
+            _archive = JobArchive(archive_path)
+        evicted = _evict_locked()
+    _store_evicted(evicted)
+
+
+def _evict_locked() -> List[JobInfo]:
+    """
+    Evict expired and surplus finished jobs, oldest first, and return them.
+    Caller holds _jobs_lock and passes the jobs to `_store_evicted` after
+    releasing it, so the archive's disk writes never block the registry.
+    """
+    global _evicted
+    expired_before = time.time() - _job_ttl
+    evicted = []
+    while _finished:
+        job_id, finished_at = next(iter(_finished.items()))
+        if finished_at >= expired_before and len(_jobs) <= _max_jobs:
+            break
+        del _finished[job_id]
+        job = _jobs.pop(job_id, None)
+        if job is not None:
+            evicted.append(job)
+    _evicted += len(evicted)
+    if evicted:
+        _notify_locked()
+    if _archive is None:
+        return []
+    _archiving.update((job.job_id, job) for job in evicted)
+    return evicted
+
+
+def _store_evicted(evicted: List[JobInfo]) -> None:
+    if not evicted:
+        return
+    try:
+        _archive.store(asdict(job) for job in evicted)
+    finally:
+        with _jobs_lock:
+            for job in evicted:
+                _archiving.pop(job.job_id, None)
 
 
 def register_job(job: JobInfo) -> None:
+    if job.created_at is None:
+        job.created_at = time.time()
     with _jobs_lock:
         _jobs[job.job_id] = job
+        evicted = _evict_locked()
+    _store_evicted(evicted)
 
 
 def get_job(job_id: JobId) -> Optional[JobInfo]:
     with _jobs_lock:
-        return _jobs.get(job_id)
+        job = _jobs.get(job_id) or _archiving.get(job_id)
+        archive = _archive
+    if job is None and archive is not None:
+        payload = archive.load(job_id)
+        if payload is not None:
+            return JobInfo(**payload)
+    return job
+
+
+def wait_for_job(job_id: JobId, changed: Callable[[JobInfo], bool], timeout: float) -> Optional[JobInfo]:
+    """
+    Block until `changed(job)` is true, the job leaves the registry or
+    `timeout` seconds pass, then return a copy of the job (None if unknown).
+
+    `changed` is called with the registry lock held, once now and again
+    after every update.
+    """
+    deadline = time.monotonic() + timeout
+    with _changed:
+        job = _jobs.get(job_id)
+        while job is not None and not changed(job):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            _changed.wait(remaining)
+            job = _jobs.get(job_id)
+        if job is not None:
+            return replace(job)
+    return get_job(job_id)
+
+
+def wait_for_jobs(job_ids: Iterable[JobId], changed: Callable[[JobInfo], bool], timeout: float) -> None:
+    """
+    Block until `changed(job)` is true for any of `job_ids`, one of them
+    leaves the registry or `timeout` seconds pass. See `wait_for_job`.
+    """
+    job_ids = list(job_ids)
+    deadline = time.monotonic() + timeout
+    with _changed:
+        while True:
+            jobs = [_jobs.get(job_id) for job_id in job_ids]
+            if any(job is None or changed(job) for job in jobs):
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            _changed.wait(remaining)
+
+
+async def _wait_async(ready: Callable[[], bool], timeout: float) -> None:
+    """Wait on the running event loop until `ready()` (called with _jobs_lock held) or `timeout`."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    event = asyncio.Event()
+    waiter = (loop, event)
+    with _jobs_lock:
+        _async_waiters.add(waiter)
+    try:
+        while True:
+            # Cleared before checking, so an update made after the check sets it again.
+            event.clear()
+            with _jobs_lock:
+                if ready():
+                    return
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(event.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        with _jobs_lock:
+            _async_waiters.discard(waiter)
+
+
+async def wait_for_job_async(
+    job_id: JobId, changed: Callable[[JobInfo], bool], timeout: float
+) -> Optional[JobInfo]:
+    """
+    `wait_for_job` for async callers. Returns None, without reading the
+    archive, once the job is not in memory (see `get_job`).
+    """
+    found: List[JobInfo] = []
+
+    def ready() -> bool:
+        job = _jobs.get(job_id)
+        found[:] = [replace(job)] if job is not None else []
+        return job is None or changed(job)
+
+    await _wait_async(ready, timeout)
+    return found[0] if found else None
+
+
+async def wait_for_jobs_async(job_ids: Iterable[JobId], changed: Callable[[JobInfo], bool], timeout: float) -> None:
+    """`wait_for_jobs` for async callers."""
+    job_ids = list(job_ids)
+
+    def ready() -> bool:
+        return any(job is None or changed(job) for job in (_jobs.get(job_id) for job_id in job_ids))
+
+    await _wait_async(ready, timeout)
+
+
+def job_statuses(job_ids: Iterable[JobId]) -> Dict[JobId, str]:
+    """Status of each of `job_ids` held in memory (archived and unknown jobs are left out)."""
+    with _jobs_lock:
+        return {job_id: _jobs[job_id].status for job_id in job_ids if job_id in _jobs}
+
+
+def registry_stats() -> Dict[str, int]:
+    """Job counts of the registry (after evicting expired jobs)."""
+    with _jobs_lock:
+        evicted = _evict_locked()
+        stats = {
+            "jobs": len(_jobs),
+            "active": len(_jobs) - len(_finished),
+            "finished": len(_finished),
+            "evicted": _evicted,
+            "max_jobs": _max_jobs,
+        }
+        archive = _archive
+    _store_evicted(evicted)
+    stats["archived"] = len(archive) if archive is not None else 0
+    return stats
+
+
+def status_counts() -> Dict[str, int]:
+    """Number of jobs in the registry per status."""
+    with _jobs_lock:
+        counts = dict.fromkeys(["queued", "running", *sorted(TERMINAL_STATUSES)], 0)
+        for job in _jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
 
 
 def update_progress(job_id: JobId, processed: int, total: int) -> None:
+    if _forward is not None:
+        _forward("update_progress", (job_id, processed, total), {})
+        return
     with _jobs_lock:
         job = _jobs.get(job_id)
         if not job:
@@ -53,6 +341,25 @@ def update_progress(job_id: JobId, processed: int, total: int) -> None:
             job.progress = 1.0
         else:
             job.progress = min(1.0, processed / total)
+        if job.phase == "harmonizing":
+            job.phase_progress = job.progress
+        job.version += 1
+        _notify_locked()
+
+
+def update_phase(job_id: JobId, phase: str, processed: int = 0, total: int = 0) -> None:
+    """Set the job's current phase and its (processed, total) completion."""
+    if _forward is not None:
+        _forward("update_phase", (job_id, phase, processed, total), {})
+        return
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if not job:
+            return
+        job.phase = phase
+        job.phase_progress = 0.0 if total == 0 else min(1.0, processed / total)
+        job.version += 1
+        _notify_locked()
 
 
 def update_job_status(
@@ -62,14 +369,53 @@ def update_job_status(
     error: Optional[Dict] = None,
     result: Optional[Dict] = None,
 ) -> None:
+    if _forward is not None:
+        _forward("update_job_status", (job_id, status), {"progress": progress, "error": error, "result": result})
+        return
+    finished = None
+    evicted: List[JobInfo] = []
     with _jobs_lock:
         job = _jobs.get(job_id)
         if not job:
             return
         job.status = status
+        if status == "running" and job.started_at is None:
+            job.started_at = time.time()
+        if status in TERMINAL_STATUSES and job.finished_at is None:
+            job.finished_at = time.time()
+            _finished[job_id] = job.finished_at
+            finished = job
         if progress is not None:
             job.progress = progress
         if error is not None:
             job.error = error
         if result is not None:
             job.result = result
+        job.version += 1
+        _notify_locked()
+        if job.finished_at is not None:
+            evicted = _evict_locked()
+    _store_evicted(evicted)
+    if finished is not None:
+        _record_finished(finished)
+
+
+def _record_finished(job: JobInfo) -> None:
+    metrics.JOBS_FINISHED.labels(status=job.status).inc()
+    if job.started_at is None:
+        # Cancelled while queued.
+        return
+    if job.created_at is not None:
+        metrics.JOB_QUEUE_WAIT.observe(max(0.0, job.started_at - job.created_at))
+    duration = max(0.0, job.finished_at - job.started_at)
+    metrics.JOB_DURATION.observe(duration)
+    result = job.result or {}
+    if job.status == "completed" and not result.get("cached") and result.get("rows") and duration > 0:
+        metrics.JOB_ROWS_PER_SECOND.observe(result["rows"] / duration)
+
+
+_UPDATES = {
+    "update_progress": update_progress,
+    "update_phase": update_phase,
+    "update_job_status": update_job_status,
+}
@@ -1,6 +1,6 @@
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class HarmonizeParams(BaseModel):
@@ -8,13 +8,25 @@ class HarmonizeParams(BaseModel):
     Parameters for the harmonize RPC call.
 
     Required:
-        data_file_path: absolute path to the input CSV file.
+        data_file_path: absolute path to the input file (CSV, TSV, Parquet or
+            Feather, chosen by extension).
         rules_file_path: absolute path to a RuleSet JSON file.
         replay_log_file_path: absolute path for the replay log output.
-        output_file_path: absolute path for the harmonized CSV output.
+        output_file_path: absolute path for the harmonized output; the format
+            follows the extension as for data_file_path, CSV by default.
 
     Optional:
         overwrite: when True, allows output_path to be overwritten if it already exists.
+        output_columns: columns to write (targets, input columns, and/or the
+            `source dataset`/`original_id` metadata columns). When omitted the
+            output holds every input column plus the targets; when given, only
+            the rule sources and requested input columns are read from the input.
+        data_dictionary_path: absolute path to a data dictionary CSV (demo
+            dictionary format) whose Datatype and missing-code columns inform
+            how source columns are parsed.
+        bypass_cache: when the sidecar has an output cache, recompute the
+            output even if an identical job's output is cached (the new output
+            replaces the cache entry).
 
     All rules in the rules file are applied. To restrict which rules run,
     construct a rules file containing only the desired targets.
@@ -24,6 +36,106 @@ class HarmonizeParams(BaseModel):
     replay_log_file_path: str
     output_file_path: str
     overwrite: bool = False
+    output_columns: Optional[List[str]] = None
+    data_dictionary_path: Optional[str] = None
+    bypass_cache: bool = False
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class BatchItem(BaseModel):
+    """One input of a harmonize_batch call; fields as in HarmonizeParams."""
+    data_file_path: str
+    output_file_path: str
+    replay_log_file_path: str
+    output_columns: Optional[List[str]] = None
+    data_dictionary_path: Optional[str] = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class HarmonizeBatchParams(BaseModel):
+    """
+    Parameters for the harmonize_batch RPC call.
+
+    Required:
+        rules_file_path: absolute path to the RuleSet file shared by all items.
+        items: the inputs, each with its own data, output and replay log
+            paths (and optionally output_columns and data_dictionary_path,
+            overriding the batch-wide values).
+
+    Optional:
+        overwrite, output_columns, data_dictionary_path, bypass_cache: as for
+            harmonize, applied to every item.
+    """
+    rules_file_path: str
+    items: List[BatchItem]
+    overwrite: bool = False
+    output_columns: Optional[List[str]] = None
+    data_dictionary_path: Optional[str] = None
+    bypass_cache: bool = False
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class HarmonizeRowsParams(BaseModel):
+    """
+    Parameters for the harmonize_rows RPC call.
+
+    Required:
+        rows: input records, one JSON object per row (at most 10,000).
+        rules or rules_file_path: the rules, given inline (the contents of a
+            RuleSet JSON file) or as an absolute path to a rules file.
+
+    Optional:
+        output_columns: columns to return, as for harmonize.
+        dataset_name: value of the `source dataset` column (default "rows").
+    """
+    rows: List[Dict[str, Any]]
+    rules: Optional[Any] = None
+    rules_file_path: Optional[str] = None
+    output_columns: Optional[List[str]] = None
+    dataset_name: str = "rows"
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class OpenSessionParams(BaseModel):
+    """
+    Parameters for the open_session RPC call.
+
+    Required:
+        data_file_path: absolute path to the input file, as for harmonize.
+
+    Optional:
+        sample_rows: keep about this many rows instead of the whole file.
+        stratify_by: column whose values (including missing) each keep their
+            share of the sample, and at least one row.
+        seed: random seed of the sample (default 0).
+        dataset_name: value of the `source dataset` column (default: the
+            file name).
+    """
+    data_file_path: str
+    sample_rows: Optional[int] = Field(default=None, gt=0)
+    stratify_by: Optional[str] = None
+    seed: int = 0
+    dataset_name: Optional[str] = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class UpdateSessionParams(BaseModel):
+    """
+    Parameters for the update_session RPC call.
+
+    Required:
+        session_id: id returned by open_session.
+        rules or rules_file_path: the session's complete rule set, inline or
+            as an absolute path to a rules file (as for harmonize_rows).
+    """
+    session_id: str
+    rules: Optional[Any] = None
+    rules_file_path: Optional[str] = None
 
     model_config = ConfigDict(populate_by_name=True)
 
@@ -0,0 +1,300 @@
+"""
+Bounded scheduler for RPC jobs.
+
+Jobs wait in a FIFO queue and start when a worker slot is free and their
+estimated memory fits in the budget left by the running jobs. The queue is
+strictly first-in first-out: a large job at the head waits for memory rather
+than being overtaken by smaller jobs behind it, so it cannot starve. A job
+whose estimate exceeds the whole budget still runs, alone.
+
+With `use_processes`, jobs run in a pool of worker processes (started with
+"spawn", kept for the life of the sidecar) so CPU-bound harmonization never
+holds the API process's GIL. Workers send their `rpc_jobs` updates (and
+`metrics` values) back over
+one multiprocessing queue; progress updates are throttled to at most one per
+`PROGRESS_INTERVAL` seconds per job, and a listener thread applies them to
+the registry. The job body must then be picklable, e.g. a
+`functools.partial` of a module-level function.
+
+A job body is called with one argument, an event that `cancel` sets when the
+job should stop (a `threading.Event`, or a manager-backed event shared with
+the worker process); the body is expected to check it at safe points.
+
+Configured through the environment (read when the sidecar starts):
+- API_MAX_WORKERS: concurrent jobs (default 2).
+- API_JOB_MEMORY_BUDGET: bytes of estimated job memory that may run at once
+  (default: half the physical memory, or 4 GiB when it cannot be read).
+- API_JOB_PROCESSES: "0" runs jobs on threads of the API process instead of
+  worker processes (default "1").
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Set
+
+from harmonization_framework.dataset_io import split_compression, storage_path, table_format
+from harmonization_framework.api import metrics, rpc_jobs
+from harmonization_framework.api.rpc_errors import ErrorCode
+from harmonization_framework.api.rpc_jobs import JobId
+
+logger = logging.getLogger(__name__)
+
+ENV_MAX_WORKERS = "API_MAX_WORKERS"
+ENV_JOB_MEMORY_BUDGET = "API_JOB_MEMORY_BUDGET"
+ENV_JOB_PROCESSES = "API_JOB_PROCESSES"
+DEFAULT_MAX_WORKERS = 2
+FALLBACK_MEMORY_BUDGET = 4 * 1024 * 1024 * 1024
+
+# Estimated bytes of job memory per byte of input file: the parsed frame,
+# the harmonized columns and the formatted output. Compressed and columnar
+# inputs expand several times when they are parsed.
+MEMORY_PER_INPUT_BYTE = 6
+EXPANSION_BY_FORMAT = {"parquet": 5, "feather": 2}
+COMPRESSED_EXPANSION = 5
+
+# Minimum seconds between forwarded progress updates of one job.
+PROGRESS_INTERVAL = 0.1
+
+
+def estimate_data_memory(data_file_path: str) -> int:
+    """Rough memory of `data_file_path` once parsed, from its size on disk (0 if unknown)."""
+    try:
+        size = os.path.getsize(storage_path(data_file_path))
+    except OSError:
+        return 0
+    expansion = EXPANSION_BY_FORMAT.get(table_format(data_file_path), 1)
+    if split_compression(data_file_path)[1] is not None:
+        expansion *= COMPRESSED_EXPANSION
+    return size * expansion
+
+
+def estimate_job_memory(data_file_path: str) -> int:
+    """Rough peak memory of harmonizing `data_file_path`, from its size on disk."""
+    return estimate_data_memory(data_file_path) * MEMORY_PER_INPUT_BYTE
+
+
+def _physical_memory() -> Optional[int]:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+class _UpdateChannel:
+    """
+    Forwards a worker process's job updates to the API process.
+
+    Progress updates arriving faster than PROGRESS_INTERVAL are dropped,
+    except the last one of a phase (processed == total); status changes are
+    always sent. A job's throttling state is dropped once its final status
+    is sent.
+    """
+
+    def __init__(self, queue):
+        self.queue = queue
+        self._last_sent: Dict[Any, float] = {}
+
+    def __call__(self, name: str, args: tuple, kwargs: Dict[str, Any]) -> None:
+        if name in ("update_progress", "update_phase"):
+            processed, total = args[-2], args[-1]
+            key = (name, args[0])
+            now = time.monotonic()
+            if processed < total and now - self._last_sent.get(key, 0.0) < PROGRESS_INTERVAL:
+                return
+            self._last_sent[key] = now
+        elif name == "update_job_status" and args[1] in rpc_jobs.TERMINAL_STATUSES:
+            self._last_sent.pop(("update_progress", args[0]), None)
+            self._last_sent.pop(("update_phase", args[0]), None)
+        self.queue.put((name, args, kwargs))
+
+
+def _init_worker(queue) -> None:
+    channel = _UpdateChannel(queue)
+    rpc_jobs.forward_updates(channel)
+    metrics.forward_updates(channel)
+
+
+def _apply_updates(queue) -> None:
+    while True:
+        name, args, kwargs = queue.get()
+        try:
+            if name == metrics.UPDATE_NAME:
+                metrics.apply_update(name, args, kwargs)
+            else:
+                rpc_jobs.apply_update(name, args, kwargs)
+        except Exception:
+            logger.exception("Could not apply job update %s", name)
+
+
+JobBody = Callable[[Any], None]
+
+
+@dataclass
+class _Queued:
+    run: JobBody
+    memory: int
+
+
+class JobScheduler:
+    """
+    FIFO queue of jobs run on at most `max_workers` threads (or worker
+    processes) within a memory budget.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        memory_budget: int = FALLBACK_MEMORY_BUDGET,
+        use_processes: bool = False,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.memory_budget = memory_budget
+        self.use_processes = use_processes
+        self._queue: "OrderedDict[JobId, _Queued]" = OrderedDict()
+        self._running: Dict[JobId, int] = {}
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._updates = None
+        self._manager = None
+        self._cancel_events: Dict[JobId, Any] = {}
+        self._cancel_requested: Set[JobId] = set()
+
+    @classmethod
+    def from_environment(cls) -> "JobScheduler":
+        max_workers = int(os.environ.get(ENV_MAX_WORKERS) or DEFAULT_MAX_WORKERS)
+        budget = os.environ.get(ENV_JOB_MEMORY_BUDGET)
+        if budget:
+            memory_budget = int(budget)
+        else:
+            physical = _physical_memory()
+            memory_budget = physical // 2 if physical else FALLBACK_MEMORY_BUDGET
+        use_processes = os.environ.get(ENV_JOB_PROCESSES, "1") != "0"
+        return cls(max_workers=max_workers, memory_budget=memory_budget, use_processes=use_processes)
+
+    def submit(self, job_id: JobId, run: JobBody, memory: int = 0) -> None:
+        """Queue `run` as job `job_id` with an estimated peak of `memory` bytes."""
+        with self._lock:
+            self._queue[job_id] = _Queued(run, memory)
+            self._dispatch()
+
+    def cancel(self, job_id: JobId) -> Optional[str]:
+        """
+        Cancel a job: a queued job is dropped from the queue, a running job's
+        cancel event is set. Returns "queued" or "running" for the state the
+        job was cancelled in, or None if the scheduler does not hold it.
+        """
+        with self._lock:
+            if job_id in self._queue:
+                del self._queue[job_id]
+                return "queued"
+            if job_id in self._running:
+                self._cancel_requested.add(job_id)
+                event = self._cancel_events.get(job_id)
+                if event is not None:
+                    event.set()
+                return "running"
+        return None
+
+    def queue_position(self, job_id: JobId) -> Optional[int]:
+        """1-based position of a waiting job, or None if it is not queued."""
+        with self._lock:
+            for position, queued_id in enumerate(self._queue, start=1):
+                if queued_id == job_id:
+                    return position
+        return None
+
+    def queue_positions(self) -> Dict[JobId, int]:
+        """1-based positions of all waiting jobs."""
+        with self._lock:
+            return {job_id: position for position, job_id in enumerate(self._queue, start=1)}
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "queued": len(self._queue),
+                "running": len(self._running),
+                "running_memory": sum(self._running.values()),
+                "max_workers": self.max_workers,
+                "memory_budget": self.memory_budget,
+            }
+
+    def _admissible(self, memory: int) -> bool:
+        if len(self._running) >= self.max_workers:
+            return False
+        # An oversized job may run on its own rather than never.
+        return not self._running or sum(self._running.values()) + memory <= self.memory_budget
+
+    def _dispatch(self) -> None:
+        # Called with the lock held.
+        while self._queue:
+            job_id, queued = next(iter(self._queue.items()))
+            if not self._admissible(queued.memory):
+                return
+            del self._queue[job_id]
+            self._running[job_id] = queued.memory
+            threading.Thread(target=self._work, args=(job_id, queued.run), daemon=True).start()
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                context = multiprocessing.get_context("spawn")
+                if self._manager is None:
+                    self._manager = context.Manager()
+                if self._updates is None:
+                    self._updates = context.Queue()
+                    threading.Thread(target=_apply_updates, args=(self._updates,), daemon=True).start()
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(self._updates,),
+                )
+            return self._pool
+
+    def _cancel_event(self, job_id: JobId) -> Any:
+        event = self._manager.Event() if self.use_processes else threading.Event()
+        with self._lock:
+            self._cancel_events[job_id] = event
+            if job_id in self._cancel_requested:
+                event.set()
+        return event
+
+    def _work(self, job_id: JobId, run: JobBody) -> None:
+        try:
+            if self.use_processes:
+                pool = self._process_pool()
+                try:
+                    pool.submit(run, self._cancel_event(job_id)).result()
+                except BrokenProcessPool:
+                    # A worker died (e.g. killed for memory); start a fresh pool.
+                    with self._lock:
+                        if self._pool is pool:
+                            self._pool = None
+                    raise
+            else:
+                run(self._cancel_event(job_id))
+        except Exception as exc:
+            logger.exception("Job %s failed", job_id)
+            rpc_jobs.update_job_status(
+                job_id,
+                status="failed",
+                error={"code": ErrorCode.HARMONIZATION_FAILED.value, "message": str(exc) or type(exc).__name__},
+            )
+        finally:
+            with self._lock:
+                self._running.pop(job_id, None)
+                self._cancel_events.pop(job_id, None)
+                self._cancel_requested.discard(job_id)
+                self._dispatch()
+
+
+SCHEDULER = JobScheduler.from_environment()
@@ -0,0 +1,290 @@
+"""
+Interactive rule-editing sessions for the RPC handlers.
+
+A session holds one data file (or a sample of it) in memory so a user can
+edit rules against it without re-reading the file or re-running the whole
+rule set. Each rule's result column is cached under the SHA-256 of the rule's
+serialization; when rules are submitted, only rules whose hash changed (or
+that are new) are recomputed, and only their target columns are returned.
+
+Sessions are closed after `idle_timeout` seconds without use, checked on
+every session call and by a periodic sweep while the sidecar runs. Their
+estimated memory (data plus cached results) is bounded by `memory_budget`:
+the least recently used sessions are closed to make room, and a session
+whose data (or data plus results) alone exceeds the budget cannot be opened
+(or updated). A whole file whose estimated size, from its size on disk,
+already exceeds the budget is rejected before it is read.
+
+Configured through the environment (read when the sidecar starts):
+- API_SESSION_IDLE_TIMEOUT: seconds before an unused session is closed
+  (default 900).
+- API_SESSION_MEMORY_BUDGET: bytes all sessions may hold (default 1 GiB).
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from harmonization_framework.dataset_io import read_header, read_rows, read_table
+from harmonization_framework.harmonize import _plain_value, harmonize_dataset
+from harmonization_framework.rule_registry import RuleSet
+from harmonization_framework.api.rpc_scheduler import estimate_data_memory
+
+ENV_SESSION_IDLE_TIMEOUT = "API_SESSION_IDLE_TIMEOUT"
+ENV_SESSION_MEMORY_BUDGET = "API_SESSION_MEMORY_BUDGET"
+DEFAULT_IDLE_TIMEOUT = 900.0
+DEFAULT_MEMORY_BUDGET = 1024 * 1024 * 1024
+# Longest time (seconds) between sweeps for idle sessions.
+SWEEP_INTERVAL = 60.0
+
+
+class SessionTooLarge(ValueError):
+    """Raised when a session's data does not fit in the sessions' memory budget."""
+
+
+def sample_dataset(
+    dataset: pd.DataFrame,
+    rows: int,
+    stratify_by: Optional[str] = None,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    About `rows` rows of `dataset`, in file order with their original index.
+
+    With `stratify_by`, every value of that column (including missing) keeps
+    its share of the rows and at least one row, so rare categories still
+    show up in the sample.
+    """
+    if rows >= len(dataset):
+        return dataset
+    if stratify_by is None:
+        return dataset.sample(n=rows, random_state=seed).sort_index()
+    generator = np.random.default_rng(seed)
+    fraction = rows / len(dataset)
+    picked = []
+    for positions in dataset.groupby(stratify_by, dropna=False, sort=False).indices.values():
+        take = min(len(positions), max(1, round(len(positions) * fraction)))
+        picked.append(generator.choice(positions, size=take, replace=False))
+    return dataset.iloc[np.sort(np.concatenate(picked))]
+
+
+def rule_digest(rule) -> str:
+    """Hash of a rule's serialization (sources, target and operations)."""
+    return hashlib.sha256(rule.serialization.encode("utf-8")).hexdigest()
+
+
+def _memory(data) -> int:
+    if isinstance(data, pd.DataFrame):
+        return int(data.memory_usage(index=True, deep=True).sum())
+    return int(data.memory_usage(index=False, deep=True))
+
+
+@dataclass
+class Session:
+    session_id: str
+    data_file_path: str
+    dataset_name: str
+    dataset: pd.DataFrame
+    last_used: float
+    # Rule target -> (rule digest, result column).
+    results: Dict[str, Any] = field(default_factory=dict)
+    memory: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def measure(self) -> None:
+        self.memory = _memory(self.dataset) + sum(_memory(column) for _digest, column in self.results.values())
+
+
+class SessionRegistry:
+    """Open sessions, closed when idle or, least recently used first, to stay within the memory budget."""
+
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT, memory_budget: int = DEFAULT_MEMORY_BUDGET):
+        self.idle_timeout = idle_timeout
+        self.memory_budget = memory_budget
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.expired = 0
+        self.evicted = 0
+
+    @classmethod
+    def from_environment(cls) -> "SessionRegistry":
+        return cls(
+            idle_timeout=float(os.environ.get(ENV_SESSION_IDLE_TIMEOUT) or DEFAULT_IDLE_TIMEOUT),
+            memory_budget=int(os.environ.get(ENV_SESSION_MEMORY_BUDGET) or DEFAULT_MEMORY_BUDGET),
+        )
+
+    def open(
+        self,
+        data_file_path: str,
+        sample_rows: Optional[int] = None,
+        stratify_by: Optional[str] = None,
+        seed: int = 0,
+        dataset_name: Optional[str] = None,
+    ) -> Session:
+        """
+        Read `data_file_path` (all of it, or a sample of about `sample_rows`
+        rows) into a new session.
+
+        A sample is drawn from the file's row count (or its `stratify_by`
+        column) and then only the sampled rows are read, so a large file can
+        be sampled within the memory budget. Without a sample, a file whose
+        estimated size (`estimate_data_memory`) exceeds the budget is
+        rejected before it is read.
+
+        Raises what `read_table` raises, KeyError for an unknown
+        `stratify_by` column and SessionTooLarge when the data exceeds the
+        memory budget.
+        """
+        header = read_header(data_file_path)
+        if stratify_by is not None and stratify_by not in header:
+            raise KeyError(f"Column not found: {stratify_by}")
+        if sample_rows is None or not header:
+            estimate = estimate_data_memory(data_file_path)
+            if estimate > self.memory_budget:
+                raise SessionTooLarge(
+                    f"The data file needs about {estimate} bytes once read, more than the "
+                    f"{self.memory_budget} bytes sessions may use; open it on a sample"
+                )
+            dataset = read_table(data_file_path)
+        else:
+            keys = read_table(data_file_path, columns=[stratify_by or header[0]])
+            picked = sample_dataset(keys, sample_rows, stratify_by, seed).index
+            keys = None
+            dataset = read_rows(data_file_path, picked)
+        session = Session(
+            session_id=str(uuid.uuid4()),
+            data_file_path=data_file_path,
+            dataset_name=dataset_name or os.path.basename(data_file_path),
+            dataset=dataset,
+            last_used=time.monotonic(),
+        )
+        session.measure()
+        if session.memory > self.memory_budget:
+            raise SessionTooLarge(
+                f"The session needs about {session.memory} bytes, more than the "
+                f"{self.memory_budget} bytes sessions may use; open it on a sample"
+            )
+        with self._lock:
+            self._expire_locked()
+            self._sessions[session.session_id] = session
+            self._fit_budget_locked(keep=session.session_id)
+        return session
+
+    def get(self, session_id: str) -> Session:
+        """The open session `session_id`, marked as used; KeyError if there is none."""
+        with self._lock:
+            self._expire_locked()
+            session = self._sessions[session_id]
+            session.last_used = time.monotonic()
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def close(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def update(self, session_id: str, rules: RuleSet) -> Dict[str, Any]:
+        """
+        Make `rules` the session's rule set and recompute the rules that are
+        new or whose serialization changed.
+
+        Returns the recomputed target columns (`columns`, as lists in row
+        order), the targets whose cached results were kept (`unchanged`) and
+        the targets no longer in the rule set (`removed`). Raises KeyError for
+        an unknown session or a rule source missing from the data, what a
+        rule raises, and SessionTooLarge when the results would take the
+        session alone over the memory budget; the session then keeps its
+        previous results.
+        """
+        session = self.get(session_id)
+        with session.lock:
+            previous = dict(session.results)
+            digests = {rule.target: rule_digest(rule) for rule in rules}
+            changed = RuleSet()
+            for rule in rules:
+                cached = session.results.get(rule.target)
+                if cached is None or cached[0] != digests[rule.target]:
+                    changed.add_rule(rule)
+
+            columns: Dict[str, List[Any]] = {}
+            if len(changed):
+                sources = list(dict.fromkeys(source for rule in changed for source in rule.sources))
+                missing = [source for source in sources if source not in session.dataset.columns]
+                if missing:
+                    raise KeyError(f"Rule sources not found in the data: {missing}")
+                harmonized = harmonize_dataset(session.dataset[sources], changed, session.dataset_name)
+                for rule in changed:
+                    column = harmonized[rule.target]
+                    session.results[rule.target] = (digests[rule.target], column)
+                    columns[rule.target] = [_plain_value(value) for value in column.tolist()]
+
+            removed = [target for target in session.results if target not in digests]
+            for target in removed:
+                del session.results[target]
+            session.measure()
+            if session.memory > self.memory_budget:
+                needed = session.memory
+                session.results = previous
+                session.measure()
+                raise SessionTooLarge(
+                    f"The session would need about {needed} bytes, more than the "
+                    f"{self.memory_budget} bytes sessions may use; use fewer rules or a smaller sample"
+                )
+        with self._lock:
+            self._fit_budget_locked(keep=session_id)
+        return {
+            "columns": columns,
+            "unchanged": [target for target in digests if target not in columns],
+            "removed": removed,
+        }
+
+    def _expire_locked(self) -> None:
+        idle_before = time.monotonic() - self.idle_timeout
+        for session_id in [key for key, session in self._sessions.items() if session.last_used < idle_before]:
+            del self._sessions[session_id]
+            self.expired += 1
+
+    def _fit_budget_locked(self, keep: str) -> None:
+        total = sum(session.memory for session in self._sessions.values())
+        for session_id in list(self._sessions):
+            if total <= self.memory_budget:
+                break
+            if session_id == keep:
+                continue
+            total -= self._sessions.pop(session_id).memory
+            self.evicted += 1
+
+    def sweep(self) -> None:
+        """Close idle sessions now rather than on the next session call."""
+        with self._lock:
+            self._expire_locked()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._expire_locked()
+            return {
+                "sessions": len(self._sessions),
+                "memory_bytes": sum(session.memory for session in self._sessions.values()),
+                "memory_budget": self.memory_budget,
+                "expired": self.expired,
+                "evicted": self.evicted,
+            }
+
+
+async def sweep_sessions(registry: SessionRegistry) -> None:
+    """Close `registry`'s idle sessions periodically, forever."""
+    while True:
+        await asyncio.sleep(min(SWEEP_INTERVAL, registry.idle_timeout / 2))
+        registry.sweep()
+
+
+SESSIONS = SessionRegistry.from_environment()
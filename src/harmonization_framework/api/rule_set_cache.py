@@ -0,0 +1,173 @@
+"""
+Process-wide LRU cache of loaded rule sets for the RPC handlers.
+
+The UI re-submits the same rules file on every harmonize call while a user
+iterates on it. `RULE_SETS.get(path)` returns a ready-to-run RuleSet for the
+file's current contents, loading it only when the file is new to the cache
+or has changed.
+
+An entry is reused while the file's mtime and size are unchanged. When they
+differ, or when the file was modified so recently that a same-size rewrite
+within the filesystem's timestamp resolution could go unnoticed, the file is
+hashed and the entry is reused only if the SHA-256 still matches.
+
+Rules sent inline with a request (`RULE_SETS.get_inline(payload)`) are
+cached in the same LRU, keyed by the SHA-256 of their JSON.
+
+Lookups and the time spent loading rules on a miss are also recorded in
+`metrics`, so they add up across worker processes.
+
+Cached rule sets are shared by concurrent jobs, so callers must not modify
+them; `harmonize_dataset` only reads its rules.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from harmonization_framework.api import metrics
+from harmonization_framework.rule_registry import RuleSet, _is_yaml
+
+DEFAULT_MAX_ENTRIES = 32
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Loaded, compiled rules take about twice the size of their JSON file; the
+# estimate errs high.
+MEMORY_PER_FILE_BYTE = 3
+# Files modified this recently (seconds) are always verified by hash.
+RACY_WINDOW = 2.0
+
+
+@dataclass
+class _Entry:
+    rules: RuleSet
+    mtime_ns: int
+    size: int
+    digest: str
+    memory: int
+
+
+class RuleSetCache:
+    """LRU cache of RuleSets keyed by absolute path, bounded by count and memory."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._memory = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path: str) -> RuleSet:
+        """
+        Return the RuleSet for `path`'s current contents.
+
+        Raises what `RuleSet.loads` raises for a missing or malformed file;
+        failed loads are not cached.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        recent = time.time() - stat.st_mtime < RACY_WINDOW
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and not recent and (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size):
+                self._entries.move_to_end(path)
+                self.hits += 1
+                metrics.RULES_CACHE_REQUESTS.labels(result="hit").inc()
+                return entry.rules
+
+        with open(path, "rb") as handle:
+            content = handle.read()
+        digest = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.digest == digest:
+                # Touched or rewritten with the same contents.
+                entry.mtime_ns, entry.size = stat.st_mtime_ns, stat.st_size
+                self._entries.move_to_end(path)
+                self.hits += 1
+                metrics.RULES_CACHE_REQUESTS.labels(result="hit").inc()
+                return entry.rules
+            self.misses += 1
+        metrics.RULES_CACHE_REQUESTS.labels(result="miss").inc()
+
+        started = time.perf_counter()
+        rules = RuleSet()
+        rules.loads(content.decode("utf-8"), yaml_format=_is_yaml(path))
+        for rule in rules:
+            rule.compile()
+        metrics.RULE_LOAD_SECONDS.observe(time.perf_counter() - started)
+        self._store(path, _Entry(rules, stat.st_mtime_ns, stat.st_size, digest, len(content) * MEMORY_PER_FILE_BYTE))
+        return rules
+
+    def get_inline(self, payload: Any) -> RuleSet:
+        """
+        Return the RuleSet for rules given as data (the parsed contents of a
+        JSON rules file), building and compiling it only on first use.
+
+        Raises what `RuleSet.loads` raises for malformed rules.
+        """
+        # Keys keep their order: in the legacy nested schema it is the rule order.
+        text = json.dumps(payload, separators=(",", ":"), default=str)
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        key = "inline:" + digest
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                metrics.RULES_CACHE_REQUESTS.labels(result="hit").inc()
+                return entry.rules
+            self.misses += 1
+        metrics.RULES_CACHE_REQUESTS.labels(result="miss").inc()
+
+        started = time.perf_counter()
+        rules = RuleSet()
+        rules.loads(text)
+        for rule in rules:
+            rule.compile()
+        metrics.RULE_LOAD_SECONDS.observe(time.perf_counter() - started)
+        self._store(key, _Entry(rules, 0, len(text), digest, len(text) * MEMORY_PER_FILE_BYTE))
+        return rules
+
+    def _store(self, path: str, entry: _Entry) -> None:
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self._memory -= previous.memory
+            if entry.memory > self.max_bytes:
+                # Larger than the whole cache: use it once, keep nothing.
+                return
+            self._entries[path] = entry
+            self._memory += entry.memory
+            while len(self._entries) > self.max_entries or self._memory > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._memory -= evicted.memory
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._memory = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "memory_bytes": self._memory,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+RULE_SETS = RuleSetCache()
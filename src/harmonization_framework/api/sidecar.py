@@ -9,6 +9,7 @@ import os
 import sys
 import json
 import logging
+import multiprocessing
 from datetime import datetime, timezone
 from typing import Optional, List
 
@@ -94,6 +95,8 @@ def main() -> None:
     Optional:
         API_HOST: host to bind, defaults to 127.0.0.1.
     """
+    # Job worker processes re-enter the frozen executable; let them run their task.
+    multiprocessing.freeze_support()
     log_path = os.getenv(ENV_LOG_PATH)
     try:
         _configure_logging(log_path)
@@ -1,11 +1,14 @@
 import argparse
 import os
-from typing import Iterable, List, Sequence
-
-import pandas as pd
+from typing import Dict, Iterable, List, Optional, Sequence
 
+from .combine import METADATA_COLUMNS, harmonize_many
+from .data_dictionary import DataDictionary
+from .dataset_io import read_dtypes, read_header, read_table, required_columns, write_table
 from .harmonize import harmonize_dataset
 from .harmonization_rule import HarmonizationRule
+from .output_cache import OutputCache, cacheable, file_digest, fingerprint
+from .rule_cache import load_rules
 from .rule_registry import RuleSet
 
 
@@ -22,25 +25,16 @@ def _split_list(values: Sequence[str]) -> List[str]:
     return items
 
 
-def _read_table(path: str) -> pd.DataFrame:
-    _, ext = os.path.splitext(path.lower())
-    sep = "\t" if ext in {".tsv", ".tab"} else ","
-    return pd.read_csv(path, sep=sep)
-
-
-def _write_table(df: pd.DataFrame, path: str) -> None:
-    _, ext = os.path.splitext(path.lower())
-    sep = "\t" if ext in {".tsv", ".tab"} else ","
-    df.to_csv(path, index=False, sep=sep)
-
-
-def _load_rules(rule_paths: Iterable[str]) -> RuleSet:
+def _load_rules(
+    rule_paths: Iterable[str],
+    use_cache: bool = False,
+    cache_dir: Optional[str] = None,
+) -> RuleSet:
     # Merge multiple rules files into a single rule set.
     rules = RuleSet()
-    first = True
     for path in rule_paths:
-        rules.load(path, clean=first)
-        first = False
+        for rule in load_rules(path, cache_dir=cache_dir, use_cache=use_cache):
+            rules.add_rule(rule)
     return rules
 
 
@@ -88,7 +82,7 @@ def _filter_missing_sources(
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="harmonize",
-        description="Apply harmonization rules to a CSV/TSV file.",
+        description="Apply harmonization rules to a CSV/TSV/Parquet/Feather file.",
     )
     parser.add_argument(
         "--rules",
@@ -97,8 +91,23 @@ def build_parser() -> argparse.ArgumentParser:
         help="Path to a rules file (JSON, or YAML if the path ends in "
         ".yaml/.yml). Can be provided multiple times.",
     )
-    parser.add_argument("--input", required=True, help="Input CSV/TSV file.")
-    parser.add_argument("--output", required=True, help="Output CSV/TSV file.")
+    parser.add_argument("--input", default=None, help="Input file (.csv, .tsv, .parquet or .feather).")
+    parser.add_argument(
+        "--dataset",
+        action="append",
+        default=[],
+        metavar="NAME=PATH",
+        help="Harmonize several inputs into one combined CSV/TSV --output instead "
+        "of --input; NAME fills the source dataset column. Can be provided "
+        "multiple times.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="With --dataset, inputs harmonized at once in worker processes.",
+    )
+    parser.add_argument("--output", required=True, help="Output file; format follows the extension as for --input.")
     parser.add_argument(
         "--targets",
         action="append",
@@ -121,20 +130,149 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Include source dataset and original_id columns in output.",
     )
+    parser.add_argument(
+        "--keep-columns",
+        action="append",
+        default=[],
+        help="Comma-separated list of input columns to copy into the output.",
+    )
+    parser.add_argument(
+        "--data-dictionary",
+        default=None,
+        help="Data dictionary CSV (Id, Datatype, Enumeration, Additional Missing "
+        "Value Codes) used to choose how source columns are parsed.",
+    )
+    parser.add_argument(
+        "--rules-cache",
+        action="store_true",
+        help="Reuse compiled rules stored next to each rules file; they are "
+        "rebuilt whenever the file changes.",
+    )
+    parser.add_argument(
+        "--rules-cache-dir",
+        default=None,
+        help="Directory for compiled rules (implies --rules-cache).",
+    )
+    parser.add_argument(
+        "--output-cache-dir",
+        default=None,
+        help="Directory of cached outputs. A run whose input, rules and options "
+        "match an earlier run copies that output instead of harmonizing.",
+    )
+    parser.add_argument(
+        "--output-cache-max-bytes",
+        type=int,
+        default=None,
+        help="Evict least recently used cached outputs beyond this total size.",
+    )
+    parser.add_argument(
+        "--bypass-output-cache",
+        action="store_true",
+        help="Harmonize even if a cached output matches; the result replaces it.",
+    )
     return parser
 
 
+def _parse_datasets(values: Sequence[str]) -> Dict[str, str]:
+    # NAME=PATH pairs, in the order given.
+    datasets: Dict[str, str] = {}
+    for value in values:
+        name, sep, path = value.partition("=")
+        if not sep or not name or not path:
+            raise ValueError(f"--dataset expects NAME=PATH, got {value!r}")
+        if name in datasets:
+            raise ValueError(f"Dataset given twice: {name}")
+        datasets[name] = path
+    return datasets
+
+
+def _main_many(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    # --dataset mode: every input gets the same rules (minus those whose
+    # sources it lacks) and its rows go to one combined output, always with
+    # the source dataset and original_id columns.
+    for flag, value in [
+        ("--input", args.input),
+        ("--dataset-name", args.dataset_name),
+        ("--output-cache-dir", args.output_cache_dir),
+    ]:
+        if value is not None:
+            parser.error(f"{flag} cannot be combined with --dataset.")
+            return
+    try:
+        paths = _parse_datasets(args.dataset)
+        rules = _load_rules(
+            args.rules,
+            use_cache=args.rules_cache or args.rules_cache_dir is not None,
+            cache_dir=args.rules_cache_dir,
+        )
+        headers = {name: read_header(path) for name, path in paths.items()}
+        dictionary = DataDictionary.load(args.data_dictionary) if args.data_dictionary else None
+    except FileNotFoundError as exc:
+        parser.error(f"{exc.filename} not found.")
+        return
+    except (ValueError, ImportError) as exc:
+        parser.error(str(exc))
+        return
+
+    rules = _filter_to_targets(rules, _split_list(args.targets))
+    if len(rules) == 0:
+        parser.error("No harmonization rules selected. Check --targets or rules.")
+        return
+    keep_columns = _split_list(args.keep_columns)
+    overwritten = [column for column in keep_columns if column in rules.all_targets()]
+    if overwritten:
+        parser.error(f"Columns to keep are also rule targets: {', '.join(overwritten)}")
+        return
+
+    datasets = {}
+    for name, path in paths.items():
+        missing_keep = [column for column in keep_columns if column not in headers[name]]
+        if missing_keep:
+            parser.error(f"Columns to keep not found in {name}: {', '.join(missing_keep)}")
+            return
+        try:
+            dataset_rules = _filter_missing_sources(rules, headers[name], args.on_missing)
+        except ValueError as exc:
+            parser.error(f"{name}: {exc}")
+            return
+        datasets[name] = (path, dataset_rules)
+
+    try:
+        harmonize_many(
+            datasets,
+            args.output,
+            output_columns=keep_columns + rules.all_targets() + METADATA_COLUMNS,
+            data_dictionary=dictionary,
+            workers=args.workers,
+        )
+    except (ValueError, RuntimeError) as exc:
+        parser.error(str(exc))
+        return
+
+
 def main(argv: Sequence[str] | None = None) -> None:
     parser = build_parser()
     args = parser.parse_args(argv)
 
+    if args.dataset:
+        _main_many(parser, args)
+        return
+    if args.input is None:
+        parser.error("one of --input or --dataset is required.")
+        return
+
     try:
-        rules = _load_rules(args.rules)
-        dataset = _read_table(args.input)
+        rules = _load_rules(
+            args.rules,
+            use_cache=args.rules_cache or args.rules_cache_dir is not None,
+            cache_dir=args.rules_cache_dir,
+        )
+        header = read_header(args.input)
+        dictionary = DataDictionary.load(args.data_dictionary) if args.data_dictionary else None
     except FileNotFoundError as exc:
         parser.error(f"{exc.filename} not found.")
         return
-    except ValueError as exc:
+    except (ValueError, ImportError) as exc:
         parser.error(str(exc))
         return
 
@@ -145,8 +283,9 @@ def main(argv: Sequence[str] | None = None) -> None:
         parser.error("No harmonization rules selected. Check --targets or rules.")
         return
 
+    # Missing sources are detected from the header alone, before any rows are read.
     try:
-        rules = _filter_missing_sources(rules, dataset.columns, args.on_missing)
+        rules = _filter_missing_sources(rules, header, args.on_missing)
     except ValueError as exc:
         parser.error(str(exc))
         return
@@ -154,10 +293,56 @@ def main(argv: Sequence[str] | None = None) -> None:
         parser.error("No harmonization rules available after filtering missing columns.")
         return
 
+    keep_columns = _split_list(args.keep_columns)
+    missing_keep = [column for column in keep_columns if column not in header]
+    if missing_keep:
+        parser.error(f"Columns to keep not found in input: {', '.join(missing_keep)}")
+        return
+    overwritten = [column for column in keep_columns if column in rules.all_targets()]
+    if overwritten:
+        parser.error(f"Columns to keep are also rule targets: {', '.join(overwritten)}")
+        return
+
     dataset_name = args.dataset_name
     if dataset_name is None:
         dataset_name = os.path.basename(args.input)
 
+    target_columns = keep_columns + rules.all_targets()
+    if args.include_metadata:
+        target_columns = target_columns + ["source dataset", "original_id"]
+
+    cache = None
+    key = None
+    if args.output_cache_dir is not None and cacheable(args.output):
+        cache = OutputCache(args.output_cache_dir)
+        if args.output_cache_max_bytes is not None:
+            cache.max_bytes = args.output_cache_max_bytes
+        try:
+            key = fingerprint(
+                args.input,
+                rules,
+                args.output,
+                output_columns=target_columns,
+                dataset_name=dataset_name,
+                data_dictionary=file_digest(args.data_dictionary) if args.data_dictionary else None,
+            )
+        except ValueError as exc:
+            parser.error(str(exc))
+            return
+        if not args.bypass_output_cache and cache.fetch(key, args.output):
+            return
+
+    # Parse only the rule sources and the input columns copied to the output;
+    # rule sources are parsed straight into the rule's dtype.
+    columns = required_columns(rules, header, keep_columns)
+    sources = {source for rule in rules for source in rule.sources}
+    try:
+        dtypes = read_dtypes(rules, [c for c in columns if c in sources], dictionary)
+        dataset = read_table(args.input, columns=columns, dtypes=dtypes)
+    except (ValueError, ImportError) as exc:
+        parser.error(str(exc))
+        return
+
     try:
         harmonized = harmonize_dataset(
             dataset=dataset,
@@ -169,12 +354,15 @@ def main(argv: Sequence[str] | None = None) -> None:
         parser.error(f"Failed to harmonize: {exc}")
         return
 
-    target_columns = rules.all_targets()
-    if args.include_metadata:
-        target_columns = target_columns + ["source dataset", "original_id"]
     harmonized = harmonized[target_columns]
 
-    _write_table(harmonized, args.output)
+    try:
+        write_table(harmonized, args.output)
+    except ImportError as exc:
+        parser.error(str(exc))
+        return
+    if key is not None:
+        cache.store(key, args.output)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,221 @@
+"""
+Harmonize several datasets into one combined output.
+
+`harmonize_many` is the streaming counterpart of harmonizing each dataset
+with `harmonize_dataset` and joining the results with `combine_datasets`.
+Each dataset is read and harmonized by a worker, which formats its rows as
+CSV CHUNK_ROWS rows at a time and hands each chunk to the parent through a
+queue of at most QUEUED_CHUNKS chunks. The parent writes the chunks to the
+combined output in the order the datasets were given, so every row is
+written once. A worker whose dataset is not being written yet waits once
+its queue is full, and datasets are only submitted `workers` at a time.
+So memory holds at most `workers` harmonized datasets (one per worker) and
+a few formatted chunks per worker, never a whole formatted dataset.
+
+Every part holds the same columns (`output_columns`). A dataset without one
+of them, e.g. a target none of its rules produce, leaves it empty. Values
+are formatted per dataset, so an integer column stays integral in one
+dataset even if another dataset's values are floats.
+
+The combined output is CSV or TSV, optionally compressed (see `dataset_io`).
+It is written to a temporary file and moved into place when complete.
+"""
+
+import contextlib
+import multiprocessing
+import os
+import queue
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Deque, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .csv_writer import CHUNK_ROWS, _format_chunk, _open_output, default_workers
+from .data_dictionary import DataDictionary
+from .dataset_io import read_for_rules, read_header, split_compression, table_format, table_separator
+from .harmonize import harmonize_dataset
+from .rule_registry import RuleSet
+
+# Formatted chunks a worker may queue ahead of the parent, per dataset.
+QUEUED_CHUNKS = 2
+# Seconds between checks for a failed worker or a cancelled combine.
+POLL_INTERVAL = 0.1
+
+METADATA_COLUMNS = ["source dataset", "original_id"]
+
+
+class _Cancelled(Exception):
+    """The combine failed elsewhere; the worker stops sending chunks."""
+
+
+def _harmonize_part(
+    dataset_name: str,
+    input_path: str,
+    rules: RuleSet,
+    columns: List[str],
+    sep: str,
+    data_dictionary: Optional[DataDictionary],
+    chunks: Any,
+    cancelled: Any,
+) -> int:
+    """
+    Harmonize one dataset and put its rows on `chunks`, formatted as CSV (no
+    header) CHUNK_ROWS at a time, followed by None; returns the row count.
+    """
+    dataset = read_for_rules(input_path, rules, columns, data_dictionary)
+    harmonized = harmonize_dataset(dataset, rules, dataset_name)
+    dataset = None
+    part = harmonized.reindex(columns=columns)
+    harmonized = None
+    for start in range(0, len(part), CHUNK_ROWS):
+        _put(chunks, _format_chunk(part.iloc[start:start + CHUNK_ROWS], sep, header=False), cancelled)
+    _put(chunks, None, cancelled)
+    return len(part)
+
+
+def _put(chunks: Any, chunk: Optional[bytes], cancelled: Any) -> None:
+    while True:
+        if cancelled.is_set():
+            raise _Cancelled()
+        try:
+            chunks.put(chunk, timeout=POLL_INTERVAL)
+            return
+        except queue.Full:
+            pass
+
+
+def _default_columns(datasets: Mapping[str, Tuple[str, RuleSet]]) -> List[str]:
+    targets: Dict[str, None] = {}
+    for _input_path, rules in datasets.values():
+        targets.update(dict.fromkeys(rules.all_targets()))
+    return list(targets) + METADATA_COLUMNS
+
+
+def _check_columns(
+    datasets: Mapping[str, Tuple[str, RuleSet]],
+    headers: Dict[str, List[str]],
+    columns: Sequence[str],
+) -> None:
+    problems = []
+    for name, (_input_path, rules) in datasets.items():
+        missing = sorted({source for rule in rules for source in rule.sources if source not in headers[name]})
+        if missing:
+            problems.append(f"{name}: missing source columns {', '.join(missing)}")
+    known = set(METADATA_COLUMNS)
+    for name, (_input_path, rules) in datasets.items():
+        known.update(rules.all_targets())
+        known.update(headers[name])
+    unknown = [column for column in columns if column not in known]
+    if unknown:
+        problems.append(f"output columns in no dataset: {', '.join(unknown)}")
+    if problems:
+        raise ValueError("; ".join(problems))
+
+
+def harmonize_many(
+    datasets: Mapping[str, Tuple[str, RuleSet]],
+    output_path: str,
+    output_columns: Optional[Sequence[str]] = None,
+    data_dictionary: Optional[DataDictionary] = None,
+    workers: Optional[int] = None,
+    use_processes: bool = True,
+) -> Dict[str, int]:
+    """
+    Harmonize each dataset with its own rules, in parallel, into one CSV/TSV.
+
+    Args:
+        datasets: Dataset name -> (input path, RuleSet). The name fills the
+            `source dataset` column; rows keep their `original_id`.
+        output_path: Combined output (.csv or .tsv, optionally compressed).
+        output_columns: Columns of the output. Defaults to every target of
+            any rule set, in first-seen order, then `source dataset` and
+            `original_id`. Input columns may be listed too.
+        data_dictionary: Optional dictionary used to parse source columns
+            (see `dataset_io.read_dtypes`).
+        workers: Datasets harmonized at once (default: CPU count, at most 8).
+        use_processes: Harmonize in worker processes (default) rather than
+            threads. Rule sets are pickled to the workers.
+
+    Returns:
+        Rows written per dataset, in the order given.
+
+    Raises ValueError, before any dataset is harmonized, if a rule source is
+    missing from its dataset or an output column is in no dataset. If a
+    dataset fails, the others are cancelled, no output is written and
+    RuntimeError is raised naming the dataset.
+    """
+    if table_format(output_path) not in {"csv", "tsv"}:
+        raise ValueError(f"harmonize_many writes CSV or TSV output, not {table_format(output_path)}")
+    headers = {name: read_header(input_path) for name, (input_path, _rules) in datasets.items()}
+    columns = list(output_columns) if output_columns is not None else _default_columns(datasets)
+    _check_columns(datasets, headers, columns)
+
+    sep = table_separator(output_path)
+    compression = split_compression(output_path)[1]
+    directory = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(directory, exist_ok=True)
+    descriptor, combined = tempfile.mkstemp(dir=directory, prefix=".harmonize-many-")
+    os.close(descriptor)
+    workers = max(1, min(workers or default_workers(), len(datasets) or 1))
+    rows: Dict[str, int] = {}
+    try:
+        with contextlib.ExitStack() as stack:
+            if use_processes:
+                manager = stack.enter_context(multiprocessing.Manager())
+                make_queue: Callable[[], Any] = lambda: manager.Queue(QUEUED_CHUNKS)
+                cancelled = manager.Event()
+                executor: Executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            else:
+                make_queue = lambda: queue.Queue(QUEUED_CHUNKS)
+                cancelled = threading.Event()
+                executor = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+            pending: Deque[Tuple[str, Future, Any]] = deque()
+            try:
+                with _open_output(combined, compression) as handle:
+                    handle.write(_format_chunk(pd.DataFrame(columns=columns), sep, header=True))
+                    for name, (input_path, rules) in datasets.items():
+                        chunks = make_queue()
+                        future = executor.submit(
+                            _harmonize_part, name, input_path, rules, columns, sep, data_dictionary, chunks, cancelled
+                        )
+                        pending.append((name, future, chunks))
+                        if len(pending) >= workers:
+                            rows.update(_write_part(handle, *pending.popleft()))
+                    while pending:
+                        rows.update(_write_part(handle, *pending.popleft()))
+            except BaseException:
+                # Stop the workers before the executor waits for them.
+                cancelled.set()
+                for _name, future, _chunks in pending:
+                    future.cancel()
+                raise
+        os.replace(combined, output_path)
+    finally:
+        if os.path.exists(combined):
+            os.remove(combined)
+    return rows
+
+
+def _write_part(handle: BinaryIO, name: str, future: Future, chunks: Any) -> Dict[str, int]:
+    """Write a dataset's chunks to `handle` as they arrive; returns its row count."""
+    while True:
+        try:
+            chunk = chunks.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            if future.done():
+                # A worker that failed never sends the closing None.
+                _row_count(name, future)
+            continue
+        if chunk is None:
+            return {name: _row_count(name, future)}
+        handle.write(chunk)
+
+
+def _row_count(name: str, future: Future) -> int:
+    try:
+        return future.result()
+    except Exception as exc:
+        raise RuntimeError(f"Failed to harmonize dataset {name!r}: {exc}") from exc
@@ -0,0 +1,180 @@
+"""
+Chunked CSV/TSV writer that formats large frames in worker processes.
+
+`DataFrame.to_csv` formats and writes on one thread, and holds the GIL
+while it formats, so formatting chunks on threads gains nothing. For large
+frames on a machine with more than one CPU, `write_csv` splits the rows
+into chunks, formats each chunk to bytes in a pool of worker processes with
+the same `to_csv` call, and writes the chunks in order through one file
+handle. Only a bounded number of formatted chunks are held in memory at a
+time. Every other frame is written with one `to_csv` call per chunk on the
+calling thread, so progress is still reported chunk by chunk.
+
+The output is byte-identical to `df.to_csv(path, index=False, sep=sep)`:
+every value is formatted on its own, so formatting a chunk gives the same
+text as the same rows within the whole frame. Columns whose text format is
+chosen from the whole column (datetime, timedelta and period columns, where
+pandas drops the time part if no value has one) would break that, so frames
+containing them are written with a single `to_csv` call.
+"""
+
+import bz2
+import gzip
+import importlib
+import io
+import lzma
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import BinaryIO, Callable, Optional
+
+import pandas as pd
+
+# Rows formatted per task.
+CHUNK_ROWS = 50_000
+# Rows below which starting worker processes costs more than it saves.
+PROCESS_MIN_ROWS = 500_000
+
+ProgressCallback = Callable[[int, int], None]
+
+
+def default_workers() -> int:
+    return max(1, min(8, os.cpu_count() or 1))
+
+
+def _use_processes(df: pd.DataFrame, workers: int) -> bool:
+    # Inside a worker process (a job or dataset worker), the pool that
+    # started it already spreads work over the CPUs.
+    return workers > 1 and len(df) >= PROCESS_MIN_ROWS and multiprocessing.parent_process() is None
+
+
+def _format_chunk(chunk: pd.DataFrame, sep: str, header: bool) -> bytes:
+    return chunk.to_csv(index=False, sep=sep, header=header).encode("utf-8")
+
+
+def _whole_column_formats(df: pd.DataFrame) -> bool:
+    """True if any column's text format depends on all of its values."""
+    for dtype in df.dtypes:
+        if isinstance(dtype, pd.CategoricalDtype):
+            dtype = dtype.categories.dtype
+        if (
+            pd.api.types.is_datetime64_any_dtype(dtype)
+            or pd.api.types.is_timedelta64_dtype(dtype)
+            or isinstance(dtype, pd.PeriodDtype)
+        ):
+            return True
+    return False
+
+
+def _open_output(path: str, compression: Optional[str]) -> BinaryIO:
+    if compression is None:
+        return open(path, "wb")
+    if compression == "gzip":
+        return gzip.open(path, "wb")
+    if compression == "bz2":
+        return bz2.open(path, "wb")
+    if compression == "xz":
+        return lzma.open(path, "wb")
+    if compression == "zstd":
+        return importlib.import_module("zstandard").open(path, "wb")
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+def write_csv(
+    df: pd.DataFrame,
+    path: str,
+    sep: str = ",",
+    compression: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunk_rows: int = CHUNK_ROWS,
+    use_processes: Optional[bool] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+    header: bool = True,
+) -> None:
+    """
+    Write `df` as CSV without the index, formatting large frames in worker processes.
+
+    Args:
+        df: Frame to write.
+        path: Output path.
+        sep: Field separator.
+        compression: None, "gzip", "bz2", "xz" or "zstd"; the data is
+            compressed while it is written.
+        workers: Formatting processes (default: CPU count, at most 8).
+        chunk_rows: Rows per formatting task.
+        use_processes: Format chunks in worker processes (True) or with
+            one `to_csv` call per chunk in this thread (False). By default
+            processes are used for frames of at least PROCESS_MIN_ROWS rows
+            when there is more than one worker and this is not already a
+            worker process (so not for API jobs run in job processes).
+            Chunks are pickled to the workers.
+        progress_callback: Optional callback invoked with (rows written,
+            total rows) after each chunk reaches the file.
+        header: Write the header line (False for rows that are appended
+            to an existing CSV).
+    """
+    total = len(df)
+    workers = workers or default_workers()
+    if use_processes is None:
+        use_processes = _use_processes(df, workers)
+    with _open_output(path, compression) as handle:
+        if _whole_column_formats(df):
+            _write_sequential(handle, df, sep, max(total, 1), progress_callback, header)
+            return
+        if not use_processes or total <= chunk_rows or workers == 1:
+            _write_sequential(handle, df, sep, chunk_rows, progress_callback, header)
+            return
+        # Spawned, not forked: the caller may be the threaded API process.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            _write_chunks(executor, handle, df, sep, chunk_rows, workers, progress_callback, header)
+
+
+def _write_sequential(
+    handle: BinaryIO,
+    df: pd.DataFrame,
+    sep: str,
+    chunk_rows: int,
+    progress_callback: Optional[ProgressCallback],
+    header: bool = True,
+) -> None:
+    """Write `df` with one `to_csv` call per chunk, reporting progress after each."""
+    total = len(df)
+    # Let to_csv stream into the handle rather than build one string.
+    text = io.TextIOWrapper(handle, encoding="utf-8", newline="")
+    for start in range(0, max(total, 1), chunk_rows):
+        df.iloc[start:start + chunk_rows].to_csv(text, index=False, sep=sep, header=header and start == 0)
+        text.flush()
+        if progress_callback:
+            progress_callback(min(total, start + chunk_rows), total)
+    text.detach()
+
+
+def _write_chunks(
+    executor: Executor,
+    handle: BinaryIO,
+    df: pd.DataFrame,
+    sep: str,
+    chunk_rows: int,
+    workers: int,
+    progress_callback: Optional[ProgressCallback],
+    header: bool = True,
+) -> None:
+    total = len(df)
+    starts = iter(range(0, total, chunk_rows))
+    pending = deque()
+    # Keep at most two chunks per worker formatted or in flight.
+    for start in starts:
+        pending.append(executor.submit(_format_chunk, df.iloc[start:start + chunk_rows], sep, header and start == 0))
+        if len(pending) >= 2 * workers:
+            break
+    written = 0
+    while pending:
+        handle.write(pending.popleft().result())
+        written = min(total, written + chunk_rows)
+        if progress_callback:
+            progress_callback(written, total)
+        start = next(starts, None)
+        if start is not None:
+            pending.append(executor.submit(_format_chunk, df.iloc[start:start + chunk_rows], sep, False))
@@ -0,0 +1,72 @@
+"""
+Data dictionaries describing the columns of a source dataset.
+
+The format is the one used by the demo dictionaries (`demo/demo_dictionary*.csv`):
+one row per column with `Id`, `Datatype`, `Enumeration` and
+`Additional Missing Value Codes` columns (plus descriptive columns that are
+ignored here). Enumerations and missing codes are written as
+`"code"=[label] |"code"=[label]`.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import pandas as pd
+
+from .primitives.base import isnull
+
+_CODE_ENTRY = re.compile(r'"([^"]*)"\s*=\s*\[([^\]]*)\]')
+
+
+@dataclass
+class DictionaryEntry:
+    """Declared datatype, permitted values and missing-value codes of one column."""
+    datatype: Optional[str] = None
+    enumeration: Dict[str, str] = field(default_factory=dict)
+    missing_codes: Dict[str, str] = field(default_factory=dict)
+
+
+def parse_codes(text: Optional[str]) -> Dict[str, str]:
+    """Parse `"1"=[Working now] |"2"=[Retired]` into {"1": "Working now", ...}."""
+    if text is None or isnull(text):
+        return {}
+    return {code: label.strip() for code, label in _CODE_ENTRY.findall(str(text))}
+
+
+class DataDictionary:
+    """Column-keyed collection of DictionaryEntry objects."""
+
+    def __init__(self, entries: Optional[Dict[str, DictionaryEntry]] = None):
+        self.entries: Dict[str, DictionaryEntry] = dict(entries or {})
+
+    def get(self, column: str) -> Optional[DictionaryEntry]:
+        return self.entries.get(column)
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @classmethod
+    def load(cls, path: str) -> "DataDictionary":
+        """
+        Load a dictionary CSV. Only `Id` is required; rows without an Id are
+        skipped and absent optional columns are treated as empty.
+        """
+        table = pd.read_csv(path, dtype=str, keep_default_na=False)
+        if "Id" not in table.columns:
+            raise ValueError(f"Data dictionary {path} has no 'Id' column")
+        entries = {}
+        for row in table.to_dict("records"):
+            column = row["Id"].strip()
+            if not column:
+                continue
+            datatype = row.get("Datatype", "").strip().lower() or None
+            entries[column] = DictionaryEntry(
+                datatype=datatype,
+                enumeration=parse_codes(row.get("Enumeration")),
+                missing_codes=parse_codes(row.get("Additional Missing Value Codes")),
+            )
+        return cls(entries)
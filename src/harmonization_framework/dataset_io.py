@@ -0,0 +1,424 @@
+"""
+Reading and writing tabular datasets for the CLI, `harmonize_file` and the
+RPC worker.
+
+The reading side supports column projection: callers compute the columns a
+rule set actually needs (`required_columns`) and only those are parsed, so a
+rule set touching a dozen columns of a very wide export does not load the
+rest. `read_header` inspects the column names without reading any rows.
+
+Read dtypes can be derived from the rules and an optional data dictionary
+(`read_dtypes`), so values are parsed once by the C parser into the type the
+first primitive expects instead of being guessed and re-parsed per cell.
+
+The file format is chosen by extension: `.parquet`/`.pq` and
+`.feather`/`.arrow`/`.ipc` are columnar formats that keep dtypes and read
+only the requested columns (they need the optional `pyarrow` package);
+`.tsv`/`.tab` are tab-separated and everything else is CSV.
+
+CSV/TSV files may carry a compression suffix (`.gz`, `.bz2`, `.xz`, and
+`.zst`/`.zstd` when the optional `zstandard` package is installed), e.g.
+`data.tsv.gz`. The format is taken from the extension before that suffix,
+and the parser decompresses as it reads, without a temporary file; output
+with such a suffix is compressed as it is written.
+
+`<file>.sqlite::<table or query>` locations read from and write to SQLite
+(see `sqlite_io`).
+"""
+
+import importlib
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data_dictionary import DataDictionary, DictionaryEntry
+from .primitives.base import isnull
+from .primitives.cast import Cast
+from .primitives.enum2enum import EnumToEnum
+from .csv_writer import ProgressCallback, write_csv
+from .rule_registry import RuleSet
+from . import sqlite_io
+
+logger = logging.getLogger(__name__)
+
+# enum_to_enum sources are read as `category` when the mapping (or the
+# dictionary enumeration plus missing codes) has at most this many values.
+CATEGORY_MAX_VALUES = 256
+
+_INTEGER_DATATYPES = {"int", "integer"}
+_STRING_DATATYPES = {"string", "text", "str"}
+_BOOLEAN_STRINGS = {"True": True, "TRUE": True, "true": True, "False": False, "FALSE": False, "false": False}
+
+
+_FORMATS_BY_EXTENSION = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".ipc": "feather",
+    ".tsv": "tsv",
+    ".tab": "tsv",
+}
+
+
+_COMPRESSION_BY_EXTENSION = {
+    ".gz": "gzip",
+    ".gzip": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+}
+
+
+def split_compression(path: str) -> Tuple[str, Optional[str]]:
+    """
+    Split a trailing compression suffix off `path`.
+
+    Returns the path without the suffix and the pandas compression name
+    ("gzip", "bz2", "xz", "zstd"), or `(path, None)` when uncompressed.
+    """
+    stem, ext = os.path.splitext(path)
+    compression = _COMPRESSION_BY_EXTENSION.get(ext.lower())
+    if compression is None:
+        return path, None
+    return stem, compression
+
+
+def table_format(path: str) -> str:
+    """
+    Return "sqlite" for a SQLite location, otherwise "parquet", "feather",
+    "tsv" or "csv" by the extension, looking past a compression suffix
+    (`data.tsv.gz` is "tsv").
+    """
+    if sqlite_io.parse_location(path) is not None:
+        return "sqlite"
+    _, ext = os.path.splitext(split_compression(path)[0].lower())
+    return _FORMATS_BY_EXTENSION.get(ext, "csv")
+
+
+def _compression(path: str) -> Optional[str]:
+    """Return the compression for a CSV/TSV path, checking it can be handled."""
+    if table_format(path) == "sqlite":
+        return None
+    compression = split_compression(path)[1]
+    if compression is None:
+        return None
+    fmt = table_format(path)
+    if fmt in {"parquet", "feather"}:
+        raise ValueError(
+            f"Compressed {fmt} files are not supported ({path}); {fmt} compresses internally"
+        )
+    if compression == "zstd":
+        try:
+            importlib.import_module("zstandard")
+        except ImportError as exc:
+            raise ImportError("Reading or writing .zst files requires the 'zstandard' package") from exc
+    return compression
+
+
+def table_separator(path: str) -> str:
+    """Return the field separator implied by the file extension (TSV or CSV)."""
+    return "\t" if table_format(path) == "tsv" else ","
+
+
+def _require_pyarrow(fmt: str):
+    try:
+        return importlib.import_module("pyarrow")
+    except ImportError as exc:
+        raise ImportError(f"Reading or writing {fmt} files requires the 'pyarrow' package") from exc
+
+
+def storage_path(path: str) -> str:
+    """The file behind `path`: the database file for a SQLite location."""
+    location = sqlite_io.parse_location(path)
+    return location[0] if location is not None else path
+
+
+def dataset_exists(path: str) -> bool:
+    """True if `path` names an existing file, or an existing SQLite table."""
+    location = sqlite_io.parse_location(path)
+    if location is None:
+        return os.path.exists(path)
+    return sqlite_io.table_exists(*location)
+
+
+def read_header(path: str) -> List[str]:
+    """Return the column names of a table without reading its rows."""
+    fmt = table_format(path)
+    compression = _compression(path)
+    if fmt == "sqlite":
+        return sqlite_io.read_header(*sqlite_io.parse_location(path))
+    if fmt == "parquet":
+        _require_pyarrow(fmt)
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(path).names)
+    if fmt == "feather":
+        pa = _require_pyarrow(fmt)
+        with pa.memory_map(path) as source:
+            return list(pa.ipc.open_file(source).schema.names)
+    return pd.read_csv(
+        path, sep=table_separator(path), nrows=0, compression=compression
+    ).columns.tolist()
+
+
+def required_columns(
+    rules: RuleSet,
+    header: Sequence[str],
+    output_columns: Optional[Iterable[str]] = None,
+) -> List[str]:
+    """
+    Columns of `header` needed to apply `rules` and produce `output_columns`.
+
+    That is the union of every rule's sources plus any requested output
+    column that is an input column rather than a rule target. The result
+    keeps header order, and names absent from the header are dropped (the
+    caller decides how to treat missing sources).
+    """
+    wanted = {source for rule in rules for source in rule.sources}
+    if output_columns is not None:
+        targets = set(rules.all_targets())
+        wanted.update(column for column in output_columns if column not in targets)
+    return [column for column in header if column in wanted]
+
+
+def read_dtypes(
+    rules: RuleSet,
+    columns: Iterable[str],
+    dictionary: Optional[DataDictionary] = None,
+) -> Dict[str, Any]:
+    """
+    Derive read dtypes for `columns` from the rules that consume them.
+
+    A column is typed from the rules only when every rule reading it is a
+    single-source rule and all of them begin with the same kind of step:
+
+    - `cast` to integer (from a non-boolean source) reads as nullable `Int64`,
+      so blanks do not turn the column into float.
+    - `enum_to_enum` with at most CATEGORY_MAX_VALUES mapping entries reads
+      as `category`; the mapping only has to be applied per category.
+
+    Otherwise a `DataDictionary` entry is used: `int` columns read as `Int64`
+    when every declared code is an integer, `string` columns read as text
+    (keeping leading zeros), and enumerated columns with few declared values
+    read as `category`. Columns with neither stay with pandas' inference.
+
+    Callers should pass only the columns that feed rules: columns copied to
+    the output unchanged keep their inferred dtype.
+    """
+    first_steps: Dict[str, List[Any]] = {}
+    multi_source = set()
+    for rule in rules:
+        for source in rule.sources:
+            if len(rule.sources) > 1:
+                multi_source.add(source)
+            operations = rule._transform or []
+            first_steps.setdefault(source, []).append(operations[0] if operations else None)
+
+    dtypes: Dict[str, Any] = {}
+    for column in columns:
+        dtype = None
+        if column in first_steps and column not in multi_source:
+            dtype = _dtype_from_first_steps(first_steps[column])
+        if dtype is None and dictionary is not None and column in dictionary:
+            dtype = _dtype_from_dictionary(dictionary.get(column))
+        if dtype is not None:
+            dtypes[column] = dtype
+    return dtypes
+
+
+def _dtype_from_first_steps(steps: List[Any]) -> Any:
+    if all(isinstance(step, Cast) and step.target == "integer" and step.source != "boolean" for step in steps):
+        return "Int64"
+    if all(isinstance(step, EnumToEnum) and len(step.mapping) <= CATEGORY_MAX_VALUES for step in steps):
+        return "category"
+    return None
+
+
+def _dtype_from_dictionary(entry: DictionaryEntry) -> Any:
+    codes = list(entry.enumeration) + list(entry.missing_codes)
+    if entry.datatype in _INTEGER_DATATYPES and all(_is_integer(code) for code in codes):
+        if entry.enumeration and len(codes) <= CATEGORY_MAX_VALUES:
+            return "category"
+        return "Int64"
+    if entry.datatype in _STRING_DATATYPES:
+        return str
+    return None
+
+
+def _is_integer(text: str) -> bool:
+    try:
+        int(text)
+    except ValueError:
+        return False
+    return True
+
+
+def read_table(
+    path: str,
+    columns: Optional[Sequence[str]] = None,
+    dtypes: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """
+    Read a CSV/TSV file, parsing only `columns` when given.
+
+    Projection does not change how the selected columns are parsed, so the
+    result equals a full read followed by column selection.
+
+    Parquet, Feather and SQLite sources carry their own column types, so
+    `dtypes` only applies to CSV/TSV. For those, `dtypes` (see `read_dtypes`) are handed
+    to the parser. `category`
+    columns get their categories converted the way pandas would infer the
+    values (integers, floats or booleans), so a category column holds the same
+    values as an inferred one. If the data does not fit a requested dtype
+    (e.g. "1.5" in an integer column) the file is read again with inferred
+    dtypes.
+    """
+    usecols = list(columns) if columns is not None else None
+    fmt = table_format(path)
+    compression = _compression(path)
+    if fmt == "sqlite":
+        database, relation = sqlite_io.parse_location(path)
+        return sqlite_io.read_table(database, relation, columns=usecols)
+    if fmt == "parquet":
+        _require_pyarrow(fmt)
+        return pd.read_parquet(path, columns=usecols, engine="pyarrow")
+    if fmt == "feather":
+        _require_pyarrow(fmt)
+        return pd.read_feather(path, columns=usecols)
+    sep = table_separator(path)
+    if dtypes:
+        try:
+            dataset = pd.read_csv(path, sep=sep, usecols=usecols, dtype=dtypes, compression=compression)
+        except (ValueError, TypeError, OverflowError) as exc:
+            logger.warning("Falling back to inferred dtypes for %s: %s", path, exc)
+        else:
+            for column, dtype in dtypes.items():
+                if dtype == "category" and column in dataset.columns:
+                    dataset[column] = _typed_categories(dataset[column])
+            return dataset
+    return pd.read_csv(path, sep=sep, usecols=usecols, compression=compression)
+
+
+def read_rows(path: str, positions: Sequence[int]) -> pd.DataFrame:
+    """
+    Read only the rows at the 0-based `positions`, indexed by position.
+
+    CSV/TSV rows not selected are skipped while parsing, so only the selected
+    rows are held in memory. Parquet, Feather and SQLite sources are read
+    whole and the rows taken from the result.
+    """
+    positions = sorted(positions)
+    if table_format(path) not in {"csv", "tsv"}:
+        return read_table(path).iloc[positions]
+    wanted = set(positions)
+    dataset = pd.read_csv(
+        path,
+        sep=table_separator(path),
+        compression=_compression(path),
+        skiprows=lambda line: line > 0 and line - 1 not in wanted,
+    )
+    dataset.index = pd.Index(positions[:len(dataset)])
+    return dataset
+
+
+def read_for_rules(
+    path: str,
+    rules: RuleSet,
+    output_columns: Optional[Sequence[str]] = None,
+    dictionary: Optional[DataDictionary] = None,
+) -> pd.DataFrame:
+    """
+    Read the input of a harmonization run.
+
+    With `output_columns`, only the rule sources and requested input columns
+    are parsed; without it every column is read, since all input columns are
+    written out. Rule sources are typed with `read_dtypes`; the other columns
+    are passed through with pandas' inference.
+    """
+    header = read_header(path)
+    columns = None
+    if output_columns is not None:
+        columns = required_columns(rules, header, output_columns)
+    sources = {source for rule in rules for source in rule.sources}
+    typed = [column for column in (columns or header) if column in sources]
+    return read_table(path, columns=columns, dtypes=read_dtypes(rules, typed, dictionary))
+
+
+def _typed_categories(column: pd.Series) -> pd.Series:
+    """
+    Convert the string categories pandas parses into numbers or booleans when
+    every category converts, mirroring the parser's own type inference.
+    """
+    categories = column.cat.categories
+    if len(categories) == 0 or categories.dtype != object:
+        return column
+    values = categories.tolist()
+    if all(value in _BOOLEAN_STRINGS for value in values):
+        typed = pd.Index([_BOOLEAN_STRINGS[value] for value in values], dtype=object)
+    else:
+        try:
+            typed = pd.Index(pd.to_numeric(values))
+        except (ValueError, TypeError):
+            return column
+    if typed.is_unique:
+        return column.cat.rename_categories(typed)
+    # Distinct spellings of one value ("1", "01"): rebuild from the values.
+    codes = column.cat.codes.to_numpy()
+    data = typed.to_numpy(dtype=object)[codes]
+    data[codes == -1] = np.nan
+    return pd.Series(pd.Categorical(data), index=column.index, name=column.name)
+
+
+def write_table(df: pd.DataFrame, path: str, progress_callback: Optional[ProgressCallback] = None) -> None:
+    """
+    Write a dataframe without the index, in the format chosen by extension.
+
+    CSV/TSV output goes through `csv_writer`, which formats large frames in
+    worker processes and produces the same bytes as `to_csv(index=False)`.
+    `progress_callback`, if given, receives (rows written, total rows); for
+    the other formats it is called once when the write completes.
+
+    Parquet and Feather keep column dtypes, including the nullable `Int64`,
+    `Float64`, `boolean` and `string` dtypes. Object columns that Arrow cannot
+    type (e.g. a mapping that yields both numbers and text) are written as
+    text, which is what a CSV would contain for them.
+
+    A SQLite location replaces the named table (see `sqlite_io.write_table`).
+    """
+    fmt = table_format(path)
+    compression = _compression(path)
+    if fmt in {"csv", "tsv"}:
+        write_csv(df, path, sep=table_separator(path), compression=compression, progress_callback=progress_callback)
+        return
+    if fmt == "sqlite":
+        database, table = sqlite_io.parse_location(path)
+        sqlite_io.write_table(df, database, table)
+    else:
+        pa = _require_pyarrow(fmt)
+        df = _arrow_compatible(df, pa).reset_index(drop=True)
+        if fmt == "parquet":
+            df.to_parquet(path, index=False, engine="pyarrow")
+        else:
+            df.to_feather(path)
+    if progress_callback:
+        progress_callback(len(df), len(df))
+
+
+def _arrow_compatible(df: pd.DataFrame, pa) -> pd.DataFrame:
+    """Return `df` with object columns Arrow cannot type converted to text."""
+    converted = {}
+    for name in df.columns:
+        column = df[name]
+        if column.dtype != object:
+            continue
+        try:
+            pa.array(column, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            converted[name] = column.map(lambda value: value if isnull(value) else str(value)).astype("string")
+    if not converted:
+        return df
+    return df.assign(**converted)
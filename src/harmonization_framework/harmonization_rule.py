@@ -1,9 +1,12 @@
 from typing import Any, Dict, List, Optional
+from .primitives.array_column import ArrayColumn
 from .primitives.base import PrimitiveOperation
-from .primitives.factory import deserialize_operation
+from .primitives.factory import check_operation, deserialize_operation
 
 import json
 
+import pandas as pd
+
 
 class HarmonizationRule:
     def __init__(
@@ -15,17 +18,42 @@ class HarmonizationRule:
     ):
         self.sources = list(sources) if sources is not None else []
         self.target = target
-        self._transform = transformation
+        self._operations = transformation
+        # Serialized operations not yet deserialized (see from_serialization).
+        self._pending_operations: Optional[List[Dict[str, Any]]] = None
+        self._serialization: Optional[str] = None
         self.metadata = metadata
-        self.serialization = json.dumps(self.serialize())
+
+    @property
+    def _transform(self) -> Optional[List[PrimitiveOperation]]:
+        """The operation chain, deserialized on first access."""
+        if self._pending_operations is not None:
+            self._operations = [deserialize_operation(op) for op in self._pending_operations]
+            self._pending_operations = None
+        return self._operations
+
+    @property
+    def serialization(self) -> str:
+        """JSON form of `serialize()`, computed on first access."""
+        if self._serialization is None:
+            self._serialization = json.dumps(self.serialize())
+        return self._serialization
+
+    def compile(self) -> "HarmonizationRule":
+        """Deserialize the operation chain now rather than on first execution."""
+        self._transform
+        return self
 
     def serialize(self):
+        if self._pending_operations is not None:
+            # Not executed yet: hand back the operations as they were loaded.
+            operations = list(self._pending_operations)
+        else:
+            operations = [primitive.to_dict() for primitive in (self._operations or [])]
         output = {
             "sources": list(self.sources),
             "target": f"{self.target}",
-            "operations": [
-                primitive.to_dict() for primitive in (self._transform or [])
-            ],
+            "operations": operations,
         }
         if self.metadata:
             output["metadata"] = self.metadata
@@ -57,8 +85,55 @@ class HarmonizationRule:
             value = transform(value)
         return value
 
+    def transform_column(self, column: pd.Series, shared: Optional[Dict[Any, ArrayColumn]] = None) -> pd.Series:
+        """
+        Apply transformation primitives in serial to a whole source column.
+
+        Only meaningful for single-source rules. Each primitive receives the
+        previous primitive's output column, so vectorized primitives keep
+        their (nullable) dtypes between steps. Array-valued intermediates
+        (`ArrayColumn`, from ParseArray) stay compact until a primitive that
+        needs Python lists, or the end of the chain, materializes them. When
+        the chain ends in an object column, its dtype is re-inferred exactly
+        as building the column from per-row results would, so the output
+        matches `transform` applied row by row.
+
+        `shared`, when given, caches array-valued intermediates across rules
+        keyed by source column and the serialized operations that produced
+        them. Rules that start with the same operations on the same column
+        (e.g. one-hot rules over one parsed multi-select answer) then parse
+        it only once.
+        """
+        operations = self._transform or []
+        keys = _prefix_keys(column.name, operations) if shared is not None else []
+        start = 0
+        for position in range(len(keys), 0, -1):
+            cached = shared.get(keys[position - 1])
+            if cached is not None:
+                column, start = cached, position
+                break
+        for position in range(start, len(operations)):
+            transform = operations[position]
+            if isinstance(column, ArrayColumn) and not transform.accepts_array_column:
+                column = column.to_series()
+            column = transform.transform_column(column)
+            if shared is not None and isinstance(column, ArrayColumn):
+                shared[keys[position]] = column
+        if isinstance(column, ArrayColumn):
+            column = column.to_series()
+        if column.dtype == object:
+            column = pd.Series(column.tolist(), index=column.index, name=column.name)
+        return column
+
     @classmethod
     def from_serialization(cls, serialization):
+        """
+        Build a rule from its serialized dict.
+
+        Operation names are checked here, but the operations themselves are
+        only deserialized when the rule is first executed, so rules that are
+        loaded and then filtered out never pay for it.
+        """
         # Accept both new "sources": [...] schema and legacy "source": "..." key.
         if "sources" in serialization:
             sources = list(serialization["sources"])
@@ -67,5 +142,18 @@ class HarmonizationRule:
         target = serialization["target"]
         operations = serialization["operations"]
         metadata = serialization.get("metadata")
-        transformation = [deserialize_operation(op) for op in operations]
-        return HarmonizationRule(sources, target, transformation, metadata=metadata)
+        for operation in operations:
+            check_operation(operation)
+        rule = HarmonizationRule(sources, target, metadata=metadata)
+        rule._pending_operations = list(operations)
+        return rule
+
+
+def _prefix_keys(source: Any, operations: List[PrimitiveOperation]) -> List[Any]:
+    """Cache keys for each prefix of an operation chain applied to `source`."""
+    keys = []
+    prefix = (source,)
+    for operation in operations:
+        prefix = prefix + (json.dumps(operation.to_dict(), sort_keys=True, default=str),)
+        keys.append(prefix)
+    return keys
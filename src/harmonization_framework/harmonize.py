@@ -1,13 +1,27 @@
 import os
+import numpy as np
 import pandas as pd
 
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
 
+from .data_dictionary import DataDictionary
+from .dataset_io import read_for_rules, write_table
 from .rule_registry import RuleSet
 from .replay_log import replay_logger as rlog
 from .primitives.base import isnull
 from .primitives.missing_code import MissingCode
 
+# Rows of a multi-source rule between cancellation checks.
+CANCEL_CHECK_ROWS = 1024
+
+# Up to this many records, harmonize_records applies the rules row by row in
+# plain Python; building a DataFrame costs more than it saves below it.
+ROW_MODE_MAX_ROWS = 1000
+
+
+class HarmonizationCancelled(Exception):
+    """Raised by harmonize_dataset when its cancel_check reports cancellation."""
+
 
 def harmonize_dataset(
     dataset: pd.DataFrame,
@@ -15,14 +29,18 @@ def harmonize_dataset(
     dataset_name: str,
     logger=None,
     progress_callback: Optional[Callable[[int, int], None]] = None,
+    cancel_check: Optional[Callable[[], bool]] = None,
 ) -> pd.DataFrame:
     """
     Apply every rule in the rule set to the provided dataset and return a new dataframe.
 
-    For each rule, the columns named in `rule.sources` are read from the dataset
+    Single-source rules are applied column-wise via `rule.transform_column`,
+    which lets vectorized primitives process the whole column at once; rules
+    that begin with the same array-producing operations on the same column
+    reuse one parsed `ArrayColumn`. For
+    multi-source rules, the columns named in `rule.sources` are read row by row
     and passed (as a list, one element per source) to `rule.transform`. The
-    result is written to a new column named `rule.target`. Single-source rules
-    transparently unwrap to a scalar inside `transform`.
+    result is written to a new column named `rule.target`.
 
     The output dataframe contains every column from the input plus the produced
     target columns, along with `source dataset` and `original_id` metadata
@@ -34,29 +52,50 @@ def harmonize_dataset(
         dataset_name: Name used for the `source dataset` metadata column.
         logger: Optional replay logger for recording applied rules.
         progress_callback: Optional callback invoked with (processed, total) counts.
+            Counts are cells (rows x rules); column-wise rules report once per rule.
+        cancel_check: Optional callable returning True once the work should
+            stop. It is checked before every rule and every CANCEL_CHECK_ROWS
+            rows of a multi-source rule; HarmonizationCancelled is raised then.
     """
     dataset_harmonized = dataset.copy()
 
     rules_list = rules.all_rules()
     total_steps = len(dataset) * len(rules_list) if rules_list else 0
     processed = 0
+    # Array-valued intermediates shared between rules on the same column.
+    shared_columns = {}
+
+    def check_cancelled():
+        if cancel_check is not None and cancel_check():
+            raise HarmonizationCancelled()
 
     for rule in rules_list:
+        check_cancelled()
         print(f"Applying rule -> {rule.target} (sources: {rule.sources})")
         if logger:
             rlog.log_operation(logger, rule, dataset_name)
 
-        def transform_with_progress(row, _rule=rule):
-            nonlocal processed
-            result = _rule.transform(row.tolist())
-            processed += 1
+        if len(rule.sources) == 1:
+            dataset_harmonized[rule.target] = rule.transform_column(
+                dataset[rule.sources[0]], shared=shared_columns
+            )
+            processed += len(dataset)
             if progress_callback:
                 progress_callback(processed, total_steps)
-            return result
+        else:
+            def transform_with_progress(row, _rule=rule):
+                nonlocal processed
+                result = _rule.transform(row.tolist())
+                processed += 1
+                if processed % CANCEL_CHECK_ROWS == 0:
+                    check_cancelled()
+                if progress_callback:
+                    progress_callback(processed, total_steps)
+                return result
 
-        dataset_harmonized[rule.target] = dataset[rule.sources].apply(
-            transform_with_progress, axis=1
-        )
+            dataset_harmonized[rule.target] = dataset[rule.sources].apply(
+                transform_with_progress, axis=1
+            )
 
         if logger:
             _log_missing_code_hits(logger, rule, dataset, dataset_name)
@@ -66,6 +105,109 @@ def harmonize_dataset(
     return dataset_harmonized
 
 
+def harmonize_records(
+    records: Sequence[Mapping[str, Any]],
+    rules: RuleSet,
+    dataset_name: str,
+    output_columns: Optional[Sequence[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Apply every rule to in-memory records (one dict per row) and return the
+    harmonized records.
+
+    The result matches `harmonize_dataset` on a DataFrame of the records:
+    every input field plus the targets, `source dataset` and `original_id`
+    (the record's position), or only `output_columns` when given. Missing
+    values are returned as None and numpy scalars as Python values, so the
+    records can be serialized as JSON. A rule target whose values are all
+    numbers is returned as ints when every value is integral and as floats
+    otherwise, so its types do not depend on how many records were sent.
+
+    Up to ROW_MODE_MAX_ROWS records are harmonized row by row without
+    creating a DataFrame; larger inputs go through `harmonize_dataset`. A
+    field absent from some records is null in those; a rule source absent
+    from all of them raises KeyError.
+    """
+    columns: Dict[str, None] = {}
+    for record in records:
+        columns.update(dict.fromkeys(record))
+    missing = [source for rule in rules for source in rule.sources if source not in columns]
+    if records and missing:
+        raise KeyError(f"Rule sources not found in records: {missing}")
+
+    if len(records) > ROW_MODE_MAX_ROWS:
+        # Object columns keep the record values as given: pandas would upcast
+        # ints with gaps to float64, unlike row mode.
+        frame = pd.DataFrame(
+            {column: pd.Series([record.get(column) for record in records], dtype=object) for column in columns},
+            columns=list(columns),
+        )
+        harmonized = harmonize_dataset(frame, rules, dataset_name)
+        if output_columns is not None:
+            harmonized = harmonized[list(output_columns)]
+        return _plain_records(harmonized.to_dict("records"), rules)
+
+    # Rules read the input values, never another rule's target.
+    inputs = [{column: record.get(column) for column in columns} for record in records]
+    rows = [dict(values) for values in inputs]
+    for rule in rules:
+        target = rule.target
+        if len(rule.sources) == 1:
+            source = rule.sources[0]
+            for values, row in zip(inputs, rows):
+                row[target] = rule.transform(values[source])
+        else:
+            for values, row in zip(inputs, rows):
+                row[target] = rule.transform([values[source] for source in rule.sources])
+    for position, row in enumerate(rows):
+        row["source dataset"] = dataset_name
+        row["original_id"] = position
+    if output_columns is not None:
+        rows = [{column: row[column] for column in output_columns} for row in rows]
+    return _plain_records(rows, rules)
+
+
+def _plain_records(rows: List[Dict[str, Any]], rules: RuleSet) -> List[Dict[str, Any]]:
+    """`rows` with `_plain_value` values and the numbers of each rule target made uniform."""
+    records = [{column: _plain_value(value) for column, value in row.items()} for row in rows]
+    for target in rules.all_targets():
+        if records and target in records[0]:
+            values = _plain_numbers([record[target] for record in records])
+            for record, value in zip(records, values):
+                record[target] = value
+    return records
+
+
+def _plain_numbers(values: List[Any]) -> List[Any]:
+    """
+    A column of numbers (and None) as ints if every number is integral, else as floats.
+
+    Row mode keeps the ints a primitive returns, while the DataFrame path
+    can turn them into floats (pandas stores ints with gaps, or next to
+    floats, as float64); this gives both the same values.
+    """
+    numbers = [value for value in values if value is not None]
+    if not numbers or any(isinstance(value, bool) or not isinstance(value, (int, float)) for value in numbers):
+        return values
+    if all(isinstance(value, int) or (value.is_integer() and abs(value) <= 2**53) for value in numbers):
+        return [None if value is None else int(value) for value in values]
+    try:
+        return [None if value is None else float(value) for value in values]
+    except OverflowError:
+        return values
+
+
+def _plain_value(value: Any) -> Any:
+    """`value` with nulls as None and numpy scalars and arrays as Python values."""
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_plain_value(item) for item in value]
+    if isnull(value) or value is pd.NaT:
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
 def _log_missing_code_hits(logger, rule, dataset, dataset_name):
     """
     Report which source cells a rule's MissingCode primitive(s) nulled.
@@ -98,19 +240,34 @@ def harmonize_file(
     rules: RuleSet,
     dataset_name: Optional[str] = None,
     logger=None,
+    output_columns: Optional[Sequence[str]] = None,
+    data_dictionary: Optional[DataDictionary] = None,
 ) -> pd.DataFrame:
     """
-    Load a CSV file, apply harmonization, and save the result to disk.
+    Load a table, apply harmonization, and save the result to disk.
+
+    Input and output formats are chosen by extension (CSV, TSV, Parquet or
+    Feather; see `dataset_io`).
+
+    By default the output holds every input column plus the targets and
+    metadata columns, so the whole file is read. When `output_columns` is
+    given, the output is restricted to those columns (targets, input columns
+    and/or `source dataset`/`original_id`) and only the rule sources plus the
+    requested input columns are parsed from the input file. Either way, rule
+    source columns are read with dtypes derived from the rules and the
+    optional `data_dictionary` (see `dataset_io.read_dtypes`).
     """
     if dataset_name is None:
         dataset_name = os.path.basename(input_path)
 
-    dataset = pd.read_csv(input_path)
+    dataset = read_for_rules(input_path, rules, output_columns, data_dictionary)
     harmonized = harmonize_dataset(
         dataset=dataset,
         rules=rules,
         dataset_name=dataset_name,
         logger=logger,
     )
-    harmonized.to_csv(output_path, index=False)
+    if output_columns is not None:
+        harmonized = harmonized[list(output_columns)]
+    write_table(harmonized, output_path)
     return harmonized
@@ -0,0 +1,199 @@
+"""
+Content-addressed cache of harmonized outputs.
+
+Re-running the same input with the same rules produces the same output. A
+job's fingerprint (`fingerprint`) hashes the input's bytes, the canonical
+serialization of the rules, the library version and any options that shape
+the output (columns, dataset name, output format). `OutputCache` keeps the
+output written for a fingerprint, plus the replay log lines the run wrote, so
+a later job with the same fingerprint can copy them into place instead of
+harmonizing again.
+
+Entries are directories named by fingerprint. They are created atomically
+(staged in a temporary directory, then renamed), marked as used on every
+hit, and the least recently used entries are removed once the cache grows
+beyond `max_bytes`.
+
+Only file outputs are cached; SQLite outputs (`file.sqlite::table`) are
+always written.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Any, Optional
+
+from .dataset_io import split_compression, table_format
+from .rule_cache import library_version
+from .rule_registry import RuleSet
+from .sqlite_io import parse_location
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+_OUTPUT = "output"
+_REPLAY_LOG = "replay.log"
+_HASH_BLOCK = 1024 * 1024
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(_HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def dataset_digest(path: str) -> str:
+    """Hash of an input's contents; for a SQLite location, the database file plus the table or query."""
+    location = parse_location(path)
+    if location is None:
+        return file_digest(path)
+    database, relation = location
+    return hashlib.sha256(f"{file_digest(database)}\0{relation}".encode()).hexdigest()
+
+
+def rules_digest(rules: RuleSet) -> str:
+    """Hash of the rules' canonical serialization, in rule order."""
+    payload = [rule.compile().serialize() for rule in rules]
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def fingerprint(input_path: str, rules: RuleSet, output_path: str, **options: Any) -> str:
+    """
+    Fingerprint of a harmonization job writing `output_path`.
+
+    The output's format and compression are part of the fingerprint;
+    `options` must hold everything else besides the input and the rules that
+    changes the output, e.g. the output columns and the dataset name.
+    """
+    payload = {
+        "input": dataset_digest(input_path),
+        "rules": rules_digest(rules),
+        "version": library_version(),
+        "output_format": [table_format(output_path), split_compression(output_path)[1]],
+        "options": options,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def cacheable(output_path: str) -> bool:
+    """True if `output_path` is a file the cache can store and restore."""
+    return parse_location(output_path) is None
+
+
+class OutputCache:
+    """
+    Directory of cached outputs keyed by job fingerprint.
+
+    `link=True` hard-links cached outputs into place instead of copying them.
+    This is instant, but the output then shares its file with the cache
+    entry, so it must not be modified in place.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES, link: bool = False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.link = link
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def fetch(self, key: str, output_path: str, replay_log_path: Optional[str] = None) -> bool:
+        """
+        Put the cached output for `key` at `output_path` (replacing any file
+        there) and append its replay log lines to `replay_log_path`.
+        Returns False when there is no entry.
+        """
+        entry = self._entry(key)
+        cached_output = os.path.join(entry, _OUTPUT)
+        if not os.path.isfile(cached_output):
+            return False
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        if os.path.lexists(output_path):
+            os.unlink(output_path)
+        if self.link:
+            try:
+                os.link(cached_output, output_path)
+            except OSError:
+                shutil.copyfile(cached_output, output_path)
+        else:
+            shutil.copyfile(cached_output, output_path)
+        cached_log = os.path.join(entry, _REPLAY_LOG)
+        if replay_log_path is not None and os.path.isfile(cached_log):
+            os.makedirs(os.path.dirname(os.path.abspath(replay_log_path)), exist_ok=True)
+            with open(cached_log, "rb") as source, open(replay_log_path, "ab") as target:
+                shutil.copyfileobj(source, target)
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return True
+
+    def store(
+        self,
+        key: str,
+        output_path: str,
+        replay_log_path: Optional[str] = None,
+        replay_log_offset: int = 0,
+    ) -> None:
+        """
+        Store `output_path` (and the replay log written from byte
+        `replay_log_offset` on) as the entry for `key`, replacing any existing
+        entry, then evict entries beyond `max_bytes`. Failures are logged,
+        never raised: the cache is an optimization.
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            staging = tempfile.mkdtemp(dir=self.directory, prefix=".staging-")
+            try:
+                shutil.copyfile(output_path, os.path.join(staging, _OUTPUT))
+                if replay_log_path is not None and os.path.isfile(replay_log_path):
+                    with open(replay_log_path, "rb") as source, open(os.path.join(staging, _REPLAY_LOG), "wb") as target:
+                        source.seek(replay_log_offset)
+                        shutil.copyfileobj(source, target)
+                shutil.rmtree(self._entry(key), ignore_errors=True)
+                os.rename(staging, self._entry(key))
+            except BaseException:
+                # Also reached when a concurrent job stored the same key in between.
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+        except OSError as exc:
+            logger.debug("Could not store output cache entry %s: %s", key, exc)
+            return
+        self.evict()
+
+    def _entries(self):
+        """(last used, bytes, path) of every entry."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        entries = []
+        for name in names:
+            path = os.path.join(self.directory, name)
+            if name.startswith(".") or not os.path.isdir(path):
+                continue
+            try:
+                size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+                entries.append((os.stat(path).st_mtime, size, path))
+            except OSError:
+                continue
+        return entries
+
+    def size(self) -> int:
+        """Total bytes held by cache entries."""
+        return sum(size for _used, size, _path in self._entries())
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits in `max_bytes`."""
+        entries = self._entries()
+        total = sum(size for _used, size, _path in entries)
+        for _used, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
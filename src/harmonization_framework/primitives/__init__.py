@@ -1,3 +1,7 @@
+from .array_column import ArrayColumn
+from .array_contains import ArrayContains
+from .array_count import ArrayCount
+from .array_join import ArrayJoin
 from .base import PrimitiveOperation
 from .bin_primitive import Bin 
 from .cast import Cast
@@ -0,0 +1,123 @@
+"""
+Compact column representation for array-valued cells.
+"""
+
+from typing import Any, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .base import isnull
+
+
+class ArrayColumn:
+    """
+    Column whose cells are arrays, stored as one flat value array plus offsets.
+
+    Cell `i` holds `values[offsets[i]:offsets[i + 1]]`. Storing a column of
+    N arrays this way costs two numpy arrays instead of N Python lists, and
+    list-aware primitives can count, test membership or aggregate with
+    vectorized operations over `values`.
+
+    Cells that could not be parsed (non-strict ParseArray) are flagged in
+    `missing` and hold no values; they materialize as `missing_value`.
+
+    The column is only turned into Python lists (`to_series`) when a
+    downstream primitive needs them.
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        offsets: np.ndarray,
+        index: pd.Index,
+        name: Any = None,
+        missing: Optional[np.ndarray] = None,
+        missing_value: Any = None,
+    ):
+        if len(offsets) != len(index) + 1:
+            raise ValueError("ArrayColumn offsets must have one more entry than the index")
+        self.values = values
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.index = index
+        self.name = name
+        self.missing = missing if missing is not None and missing.any() else None
+        self.missing_value = missing_value
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def lengths(self) -> np.ndarray:
+        """Number of values in each cell."""
+        return np.diff(self.offsets)
+
+    def row_ids(self) -> np.ndarray:
+        """Row position of each entry in `values`."""
+        return np.repeat(np.arange(len(self), dtype=np.int64), self.lengths())
+
+    def missing_mask(self) -> np.ndarray:
+        """Boolean mask of cells that hold `missing_value` instead of an array."""
+        if self.missing is None:
+            return np.zeros(len(self), dtype=bool)
+        return self.missing
+
+    def with_rows(self, data: Any, missing_result: Any = None) -> pd.Series:
+        """
+        Build a per-row result column on this column's index.
+
+        `data` holds one result per row; rows of missing cells are replaced
+        by `missing_result` (what the per-cell transform returns for
+        `missing_value`). A null replacement turns numpy bool/int results into
+        the nullable `boolean`/`Int64` dtypes rather than object or float.
+        """
+        result = pd.Series(data, index=self.index, name=self.name)
+        if self.missing is None:
+            return result
+        if isnull(missing_result):
+            if pd.api.types.is_bool_dtype(result.dtype):
+                result = result.astype("boolean")
+            elif pd.api.types.is_integer_dtype(result.dtype):
+                result = result.astype("Int64")
+            else:
+                result = result.astype(object)
+            result[self.missing] = pd.NA if result.dtype != object else missing_result
+            return result
+        values = result.to_numpy(dtype=object, copy=True)
+        for position in self.missing.nonzero()[0].tolist():
+            values[position] = missing_result
+        return pd.Series(values, index=self.index, name=self.name, dtype=object)
+
+    def to_series(self) -> pd.Series:
+        """Materialize the cells as a column of Python lists."""
+        flat = self.values.tolist()
+        bounds = self.offsets.tolist()
+        lists: List[Any] = [flat[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+        if self.missing is not None:
+            for position in self.missing.nonzero()[0].tolist():
+                lists[position] = self.missing_value
+        return pd.Series(lists, index=self.index, name=self.name, dtype=object)
+
+    def tolist(self) -> List[Any]:
+        return self.to_series().tolist()
+
+
+def object_array(items: List[Any]) -> np.ndarray:
+    """
+    Build a 1-D object array from `items` without numpy treating nested
+    sequences as extra dimensions.
+    """
+    return np.fromiter(items, dtype=object, count=len(items))
+
+
+def match_values(values: np.ndarray, needle: Any) -> np.ndarray:
+    """
+    Elementwise `item == needle` over a flat value array, as a bool mask.
+
+    Mirrors the equality `list.count` and `in` use on the materialized lists:
+    typed arrays compare numerically (3 == 3.0 == True), and a needle of an
+    incomparable type (a string against an integer array) matches nothing.
+    """
+    matches = values == needle
+    if not isinstance(matches, np.ndarray) or matches.shape != values.shape:
+        return np.zeros(len(values), dtype=bool)
+    return matches.astype(bool)
@@ -0,0 +1,55 @@
+from typing import Any, List, Union
+
+import numpy as np
+import pandas as pd
+
+from .array_column import ArrayColumn, match_values
+from .base import PrimitiveOperation, handle_null
+
+
+class ArrayContains(PrimitiveOperation):
+    """
+    Test whether an array-valued cell contains a given value.
+
+    Typical use is a membership flag for a multi-select answer after
+    `parse_array` (e.g. "did the participant select option 3"). The input
+    must be a list or tuple; a null cell passes through unchanged.
+    """
+
+    accepts_array_column = True
+
+    def __init__(self, value: Union[str, int, float, bool]):
+        if not isinstance(value, (str, int, float, bool)):
+            raise TypeError(f"ArrayContains value must be a scalar, got {type(value).__name__}")
+        self.value = value
+
+    def __str__(self):
+        return f"Check whether the array contains {self.value!r}"
+
+    def to_dict(self):
+        return {
+            "operation": "array_contains",
+            "value": self.value,
+        }
+
+    @handle_null
+    def transform(self, values: List[Any]) -> bool:
+        if not isinstance(values, (list, tuple)):
+            raise TypeError(f"ArrayContains expects a list or tuple, got {type(values).__name__}")
+        return self.value in values
+
+    def transform_column(self, column: Union[ArrayColumn, pd.Series]) -> pd.Series:
+        """
+        Vectorized membership test over an ArrayColumn's flat values: one
+        comparison per item, then a per-row bincount of the hits.
+        """
+        if not isinstance(column, ArrayColumn):
+            return super().transform_column(column)
+        hits = match_values(column.values, self.value)
+        found = np.bincount(column.row_ids()[hits], minlength=len(column)) > 0
+        missing_result = self.transform(column.missing_value) if column.missing is not None else None
+        return column.with_rows(found, missing_result)
+
+    @classmethod
+    def from_serialization(cls, serialization):
+        return ArrayContains(serialization["value"])
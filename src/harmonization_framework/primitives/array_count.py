@@ -0,0 +1,65 @@
+from typing import Any, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .array_column import ArrayColumn, match_values
+from .base import PrimitiveOperation, handle_null
+
+
+class ArrayCount(PrimitiveOperation):
+    """
+    Count the items of an array-valued cell.
+
+    With no `value`, returns the array length (e.g. the number of options
+    selected in a multi-select answer). With a `value`, returns how many
+    items equal it. The input must be a list or tuple; a null cell passes
+    through unchanged.
+    """
+
+    accepts_array_column = True
+
+    def __init__(self, value: Optional[Union[str, int, float, bool]] = None):
+        if value is not None and not isinstance(value, (str, int, float, bool)):
+            raise TypeError(f"ArrayCount value must be a scalar, got {type(value).__name__}")
+        self.value = value
+
+    def __str__(self):
+        if self.value is None:
+            return "Count array items"
+        return f"Count array items equal to {self.value!r}"
+
+    def to_dict(self):
+        output = {
+            "operation": "array_count",
+        }
+        if self.value is not None:
+            output["value"] = self.value
+        return output
+
+    @handle_null
+    def transform(self, values: List[Any]) -> int:
+        if not isinstance(values, (list, tuple)):
+            raise TypeError(f"ArrayCount expects a list or tuple, got {type(values).__name__}")
+        if self.value is None:
+            return len(values)
+        return list(values).count(self.value)
+
+    def transform_column(self, column: Union[ArrayColumn, pd.Series]) -> pd.Series:
+        """
+        Vectorized count over an ArrayColumn: offsets give the lengths, and a
+        per-row bincount of matching items gives value counts.
+        """
+        if not isinstance(column, ArrayColumn):
+            return super().transform_column(column)
+        if self.value is None:
+            counts = column.lengths()
+        else:
+            hits = match_values(column.values, self.value)
+            counts = np.bincount(column.row_ids()[hits], minlength=len(column)).astype(np.int64)
+        missing_result = self.transform(column.missing_value) if column.missing is not None else None
+        return column.with_rows(counts, missing_result)
+
+    @classmethod
+    def from_serialization(cls, serialization):
+        return ArrayCount(serialization.get("value"))
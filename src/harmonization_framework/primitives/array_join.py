@@ -0,0 +1,78 @@
+from typing import Any, List, Union
+
+import numpy as np
+import pandas as pd
+
+from .array_column import ArrayColumn
+from .base import PrimitiveOperation, handle_null
+
+
+class ArrayJoin(PrimitiveOperation):
+    """
+    Join the items of an array-valued cell into one string.
+
+    Each item is converted with `str()` and items are joined with
+    `separator`; an empty array gives "". The input must be a list or tuple;
+    a null cell passes through unchanged.
+    """
+
+    accepts_array_column = True
+
+    def __init__(self, separator: str = ","):
+        if not isinstance(separator, str):
+            raise TypeError("Separator must be a string")
+        self.separator = separator
+
+    def __str__(self):
+        return f"Join array items with {self.separator!r}"
+
+    def to_dict(self):
+        return {
+            "operation": "array_join",
+            "separator": self.separator,
+        }
+
+    @handle_null
+    def transform(self, values: List[Any]) -> str:
+        if not isinstance(values, (list, tuple)):
+            raise TypeError(f"ArrayJoin expects a list or tuple, got {type(values).__name__}")
+        return self.separator.join(str(item) for item in values)
+
+    def transform_column(self, column: Union[ArrayColumn, pd.Series]) -> pd.Series:
+        """
+        Join every row of an ArrayColumn with a single `str.join`.
+
+        Items are stringified in bulk, each item is followed by either the
+        separator or (for the last item of a row) a terminator character that
+        occurs nowhere in the data, and the whole column is joined once and
+        split on the terminator.
+        """
+        if not isinstance(column, ArrayColumn):
+            return super().transform_column(column)
+        items = [str(item) for item in column.values.tolist()]
+
+        lengths = column.lengths()
+        joined = np.full(len(column), "", dtype=object)
+        filled = lengths > 0
+        if filled.any():
+            terminator = _terminator(items, self.separator)
+            suffixes = np.full(len(items), self.separator, dtype=object)
+            suffixes[column.offsets[1:][filled] - 1] = terminator
+            text = "".join(item + suffix for item, suffix in zip(items, suffixes.tolist()))
+            joined[filled] = text.split(terminator)[:-1]
+        missing_result = self.transform(column.missing_value) if column.missing is not None else None
+        return column.with_rows(joined, missing_result)
+
+    @classmethod
+    def from_serialization(cls, serialization):
+        return ArrayJoin(serialization.get("separator", ","))
+
+
+def _terminator(items: List[str], separator: str) -> str:
+    """Pick a character absent from every item and the separator."""
+    text = "".join(items) + separator
+    for codepoint in (0, *range(0xE000, 0xF900)):
+        candidate = chr(codepoint)
+        if candidate not in text:
+            return candidate
+    raise ValueError("ArrayJoin could not find an unused terminator character")
@@ -1,8 +1,9 @@
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 import json
 import math
 
+import numpy as np
 import pandas as pd
 
 """
@@ -33,6 +34,10 @@ def isnull(value: Any) -> bool:
     return False
 
 class PrimitiveOperation:
+    # Whether `transform_column` accepts an ArrayColumn. Other primitives
+    # receive array-valued columns materialized as Python lists.
+    accepts_array_column = False
+
     def __init__(self):
         """Constructor for primitive-specific parameters."""
 
@@ -67,6 +72,19 @@ class PrimitiveOperation:
     def __call__(self, value: Any) -> Any:
         return self.transform(value)
 
+    def transform_column(self, column: pd.Series) -> pd.Series:
+        """
+        Apply this operation to a whole column and return a new column.
+
+        The default applies `transform` to each cell and returns an object
+        column, so every primitive can take part in column-wise execution.
+        Primitives whose transform is a single arithmetic or string expression
+        override this with a vectorized implementation; an override must agree
+        with `transform` cell for cell, including on nulls.
+        """
+        values = [self.transform(value) for value in column.tolist()]
+        return pd.Series(values, index=column.index, name=column.name, dtype=object)
+
     @classmethod
     def from_serialization(cls, serialization: Dict[str, Any]) -> "PrimitiveOperation":
         """Primitive-specific parsing of serialization."""
@@ -116,3 +134,125 @@ def handle_null(transform):
             return value
         return transform(self, value)
     return wrapper
+
+
+INT64_MIN = int(np.iinfo(np.int64).min)
+INT64_MAX = int(np.iinfo(np.int64).max)
+
+
+def fits_int64(*values: int) -> bool:
+    """Return True if every Python int in `values` is representable as int64."""
+    return all(INT64_MIN <= value <= INT64_MAX for value in values)
+
+
+def integer_bounds(column: pd.Series) -> Optional[Tuple[int, int]]:
+    """Smallest and largest value of an integer column as Python ints, or None if it has no values."""
+    present = column.dropna()
+    if present.empty:
+        return None
+    return int(present.min()), int(present.max())
+
+
+def numeric_column(column: pd.Series) -> Optional[pd.Series]:
+    """
+    Return `column` as a numeric column for vectorized arithmetic, or None.
+
+    Numeric dtypes (numpy or nullable) are returned unchanged. Object columns
+    whose non-null values are all ints, or all floats, are converted to the
+    nullable `Int64` / `Float64` dtype so integer columns with gaps stay
+    integral. Boolean columns, mixed int/float object columns, ints outside
+    the int64 range and anything non-numeric return None; callers fall back
+    to the per-cell transform so that type errors, Python's numeric promotion
+    rules and unbounded ints are preserved.
+
+    Integer arithmetic on the result can still overflow int64; callers that
+    add or multiply check the result range with `integer_bounds` first.
+    """
+    if pd.api.types.is_bool_dtype(column.dtype):
+        return None
+    if pd.api.types.is_numeric_dtype(column.dtype):
+        return column
+    if column.dtype != object:
+        return None
+    kind = pd.api.types.infer_dtype(column, skipna=True)
+    if kind == "integer":
+        dtype = "Int64"
+    elif kind == "floating":
+        dtype = "Float64"
+    else:
+        return None
+    values = [None if isnull(value) else value for value in column.tolist()]
+    if dtype == "Int64" and not fits_int64(*(value for value in values if value is not None)):
+        return None
+    return pd.Series(pd.array(values, dtype=dtype), index=column.index, name=column.name)
+
+
+def string_column(column: pd.Series) -> Optional[pd.Series]:
+    """
+    Return `column` if every non-null value is a string, otherwise None.
+
+    Used to gate pandas `.str` methods, which silently turn non-string values
+    into NaN where the scalar transform would raise or behave differently.
+    """
+    if pd.api.types.is_string_dtype(column.dtype) and column.dtype != object:
+        return column
+    if column.dtype != object:
+        return None
+    if pd.api.types.infer_dtype(column, skipna=True) not in ("string", "empty"):
+        return None
+    return column
+
+
+def factorize_column(column: pd.Series) -> Optional[Tuple[np.ndarray, List[Any]]]:
+    """
+    Encode `column` as (codes, distinct non-null values) for per-token work.
+
+    Primitives that convert tokens (casts, boolean normalization) can convert
+    each distinct value once and broadcast the results back through `codes`
+    with `take_codes`. Null cells get code -1. Equal values of different types
+    (1, 1.0, True) share a code, so callers must only use this when their
+    conversion treats such values identically. Returns None when the column
+    holds unhashable values such as lists.
+    """
+    try:
+        codes, uniques = pd.factorize(column, use_na_sentinel=True)
+    except TypeError:
+        return None
+    return codes, uniques.tolist()
+
+
+def take_codes(values: List[Any], codes: np.ndarray, dtype: Any, column: pd.Series) -> pd.Series:
+    """
+    Build a column of `dtype` by indexing converted distinct `values` with
+    `codes`; code -1 becomes the dtype's missing value.
+    """
+    array = pd.array(values, dtype=dtype)
+    return pd.Series(array.take(codes, allow_fill=True), index=column.index, name=column.name)
+
+
+def python_round(values: np.ndarray, precision: int) -> np.ndarray:
+    """
+    Round a float array with the semantics of Python's built-in `round`.
+
+    `np.round` computes rint(x * 10**p) / 10**p. The final division is
+    correctly rounded, so the result only differs from `round` when the
+    scaled product lands within rounding error of a half (where Python rounds
+    the exact decimal value) or overflows. Those elements are recomputed with
+    `round` itself; everything else stays vectorized.
+    """
+    values = np.asarray(values, dtype=float)
+    if precision > 15:
+        return np.array([round(value, precision) for value in values.tolist()], dtype=float)
+    with np.errstate(over="ignore", invalid="ignore"):
+        scaled = values * (10.0 ** precision)
+        rounded = np.round(values, precision)
+        fraction = np.abs(scaled - np.trunc(scaled))
+        tolerance = np.maximum(np.abs(scaled), 1.0) * (4 * np.finfo(float).eps)
+        suspect = np.isfinite(values) & (
+            ~np.isfinite(scaled)
+            | (np.abs(scaled) >= 2.0 ** 52)
+            | (np.abs(fraction - 0.5) <= tolerance)
+        )
+    if suspect.any():
+        rounded[suspect] = [round(value, precision) for value in values[suspect].tolist()]
+    return rounded
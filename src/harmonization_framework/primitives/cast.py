@@ -1,6 +1,18 @@
-from .base import PrimitiveOperation, handle_null, support_iterable
+from .base import (
+    PrimitiveOperation,
+    factorize_column,
+    handle_null,
+    isnull,
+    numeric_column,
+    string_column,
+    support_iterable,
+    take_codes,
+)
 from enum import Enum
-from typing import Any
+from typing import Any, Callable, List
+
+import numpy as np
+import pandas as pd
 
 class CastType(Enum):
     TEXT = "text"
@@ -9,12 +21,25 @@ class CastType(Enum):
     DECIMAL = "decimal"
     FLOAT = "float"
 
+# Nullable pandas dtype produced by the column-level cast for each target.
+_COLUMN_DTYPES = {
+    "text": "string",
+    "integer": "Int64",
+    "boolean": "boolean",
+    "decimal": "Float64",
+    "float": "Float64",
+}
+
+
 class Cast(PrimitiveOperation):
     """
     Cast values between supported primitive types.
 
     Supported targets: "text", "integer", "boolean", "decimal", "float".
     Boolean casting accepts common string/number representations.
+
+    Column-level casts produce nullable `string`, `Int64`, `boolean` and
+    `Float64` columns rather than object columns of Python values.
     """
     def __init__(self, source: str, target: str):
         if target not in {member.value for member in CastType}:
@@ -51,6 +76,102 @@ class Cast(PrimitiveOperation):
             case _:
                 return value
 
+    def transform_column(self, column: pd.Series) -> pd.Series:
+        """
+        Vectorized `transform` producing a nullable column.
+
+        Numeric and boolean columns are converted with array operations;
+        other columns are converted once per distinct value and broadcast
+        back through factorized codes. Every value that cannot be cast is
+        reported in a single ValueError instead of failing on the first cell.
+        """
+        dtype = _COLUMN_DTYPES[self.target]
+        if self.target == "text":
+            return self._text_column(column)
+        if pd.api.types.is_bool_dtype(column.dtype):
+            return column.astype(dtype)
+        numeric = numeric_column(column)
+        if numeric is not None and column.dtype != object:
+            converted = self._numeric_column(numeric)
+            if converted is not None:
+                return converted
+        factorized = factorize_column(column)
+        if factorized is None:
+            return super().transform_column(column)
+        codes, uniques = factorized
+        converted_values = self._convert_distinct(uniques, self._scalar_converter())
+        try:
+            return take_codes(converted_values, codes, dtype, column)
+        except (TypeError, ValueError, OverflowError):
+            # e.g. integers beyond the Int64 range: keep exact Python values.
+            return take_codes(converted_values, codes, object, column)
+
+    def _scalar_converter(self) -> Callable[[Any], Any]:
+        match self.target:
+            case "integer":
+                return int
+            case "boolean":
+                return self._to_boolean
+            case _:
+                return float
+
+    def _convert_distinct(self, uniques: List[Any], convert: Callable[[Any], Any]) -> List[Any]:
+        """Convert each distinct value, collecting every failure before raising."""
+        converted = []
+        offending = []
+        for value in uniques:
+            try:
+                converted.append(convert(value))
+            except (TypeError, ValueError, OverflowError):
+                offending.append(value)
+                converted.append(None)
+        if offending:
+            raise ValueError(
+                f"Cannot cast {len(offending)} value(s) to {self.target}: {offending!r}"
+            )
+        return converted
+
+    def _text_column(self, column: pd.Series) -> pd.Series:
+        strings = string_column(column)
+        if strings is not None:
+            return strings.astype("string")
+        if pd.api.types.is_numeric_dtype(column.dtype):
+            # numpy's str() of numbers and bools matches Python's str().
+            present = column.notna().to_numpy()
+            values = np.full(len(column), None, dtype=object)
+            values[present] = column.to_numpy(dtype=object)[present].astype(str)
+        else:
+            values = [None if isnull(value) else str(value) for value in column.tolist()]
+        return pd.Series(pd.array(values, dtype="string"), index=column.index, name=column.name)
+
+    def _numeric_column(self, numeric: pd.Series) -> Any:
+        """
+        Cast a numeric column with array operations, or return None to fall
+        back to per-value conversion (for values outside the Int64 range).
+        """
+        if self.target in ("decimal", "float"):
+            return numeric.astype("Float64")
+        if self.target == "boolean":
+            result = (numeric != 0).astype("boolean")
+            result[numeric.isna()] = pd.NA
+            return result
+        if pd.api.types.is_integer_dtype(numeric.dtype):
+            return numeric.astype("Int64")
+        # int() truncates toward zero and rejects inf.
+        values = numeric.to_numpy(dtype=float, na_value=np.nan)
+        present = ~np.isnan(values)
+        if not np.isfinite(values[present]).all():
+            offending = sorted(set(values[present & ~np.isfinite(values)].tolist()))
+            raise ValueError(
+                f"Cannot cast {len(offending)} value(s) to {self.target}: {offending!r}"
+            )
+        if (np.abs(values[present]) >= 2.0 ** 63).any():
+            return None
+        truncated = np.zeros(len(values), dtype=np.int64)
+        truncated[present] = np.trunc(values[present]).astype(np.int64)
+        array = pd.arrays.IntegerArray(truncated, ~present)
+        return pd.Series(array, index=numeric.index, name=numeric.name)
+
     def _to_boolean(self, value: Any) -> bool:
         """
         Convert common string/number representations into a boolean.
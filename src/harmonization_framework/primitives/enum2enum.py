@@ -1,6 +1,10 @@
 import logging
 from typing import Any, Dict
 
+import numpy as np
+import pandas as pd
+
+from .array_column import object_array
 from .base import PrimitiveOperation, support_iterable
 
 logger = logging.getLogger(__name__)
@@ -62,6 +66,23 @@ class EnumToEnum(PrimitiveOperation):
             return self.default
         return self.mapping[value]
 
+    def transform_column(self, column: pd.Series) -> pd.Series:
+        """
+        Map a `category` column once per category present in the data and
+        broadcast the results through the category codes. Other columns use
+        the per-cell transform.
+        """
+        if not isinstance(column.dtype, pd.CategoricalDtype):
+            return super().transform_column(column)
+        column = column.cat.remove_unused_categories()
+        codes = column.cat.codes.to_numpy()
+        mapped = object_array([self.transform(value) for value in column.cat.categories.tolist()])
+        nulls = codes == -1
+        if nulls.any():
+            mapped = np.append(mapped, object_array([self.transform(np.nan)]))
+            codes = np.where(nulls, len(mapped) - 1, codes)
+        return pd.Series(mapped[codes], index=column.index, name=column.name, dtype=object)
+
     @classmethod
     def from_serialization(cls, serialization):
         """
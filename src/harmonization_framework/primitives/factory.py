@@ -9,6 +9,9 @@ primitives/__init__.py.
 
 from typing import Any, Dict
 
+from .array_contains import ArrayContains
+from .array_count import ArrayCount
+from .array_join import ArrayJoin
 from .base import PrimitiveOperation
 from .bin_primitive import Bin
 from .cast import Cast
@@ -34,6 +37,19 @@ from .validate_pattern import ValidatePattern
 from .vocabulary import PrimitiveVocabulary
 
 
+_OPERATION_NAMES = frozenset(entry.value for entry in PrimitiveVocabulary)
+
+
+def check_operation(operation: Dict[str, Any]) -> None:
+    """
+    Raise ValueError if `operation` does not name a known primitive, without
+    building it.
+    """
+    name = operation["operation"]
+    if name not in _OPERATION_NAMES:
+        raise ValueError(f"Unknown operation: {name}")
+
+
 def deserialize_operation(operation: Dict[str, Any]) -> PrimitiveOperation:
     """
     Build a PrimitiveOperation from its serialized dict.
@@ -42,6 +58,12 @@ def deserialize_operation(operation: Dict[str, Any]) -> PrimitiveOperation:
     """
     name = operation["operation"]
     match name:
+        case PrimitiveVocabulary.ARRAY_CONTAINS.value:
+            return ArrayContains.from_serialization(operation)
+        case PrimitiveVocabulary.ARRAY_COUNT.value:
+            return ArrayCount.from_serialization(operation)
+        case PrimitiveVocabulary.ARRAY_JOIN.value:
+            return ArrayJoin.from_serialization(operation)
         case PrimitiveVocabulary.BIN.value:
             return Bin.from_serialization(operation)
         case PrimitiveVocabulary.CAST.value:
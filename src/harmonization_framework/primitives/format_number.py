@@ -1,6 +1,9 @@
-from .base import PrimitiveOperation, handle_null, support_iterable
+from .base import PrimitiveOperation, handle_null, numeric_column, support_iterable
 from typing import Union
 
+import numpy as np
+import pandas as pd
+
 class FormatNumber(PrimitiveOperation):
     """
     Format numeric values to a fixed number of decimal places.
@@ -32,6 +35,24 @@ class FormatNumber(PrimitiveOperation):
             raise TypeError(f"FormatNumber expects a numeric value, got {type(value).__name__}")
         return f"{value:.{self.precision}f}"
 
+    def transform_column(self, column: pd.Series) -> pd.Series:
+        """
+        Vectorized `transform`: format a numeric column with printf-style
+        fixed precision (`%.Nf` rounds exactly like the `.Nf` format spec).
+
+        Nulls are passed through unchanged; the result is an object column.
+        """
+        numeric = numeric_column(column)
+        if numeric is None:
+            return super().transform_column(column)
+        present = numeric.notna().to_numpy()
+        values = numeric.to_numpy(dtype=float, na_value=np.nan)
+        output = column.astype(object).to_numpy(copy=True)
+        if present.any():
+            formatted = np.char.mod(f"%.{self.precision}f", values[present])
+            output[present] = formatted.astype(object)
+        return pd.Series(output, index=column.index, name=column.name, dtype=object)
+
     @classmethod
     def from_serialization(cls, serialization):
         """Reconstruct a FormatNumber operation from a serialized dict."""
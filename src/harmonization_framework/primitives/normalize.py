@@ -1,8 +1,11 @@
 import re
 import unicodedata
 
-from .base import PrimitiveOperation, handle_null, support_iterable
+from .base import PrimitiveOperation, factorize_column, handle_null, string_column, support_iterable, take_codes
 from enum import Enum
+from typing import Callable, Dict, FrozenSet, List, Sequence, Union
+
+import pandas as pd
 
 class Normalization(Enum):
     STRIP = "strip" # strip white space
@@ -12,42 +15,200 @@ class Normalization(Enum):
     PUNCTUATION = "remove_punctuation"
     SPECIAL = "remove_special_characters"
 
+
+# Characters deleted by the character-class normalizations, expressed as the
+# regexes they have always used so the translate tables match them exactly.
+_DELETE_PATTERNS = {
+    # everything other than letter, digit, underscore and white space
+    Normalization.PUNCTUATION: r"[^\w\s]",
+    # everything other than ASCII letters, digits and white space
+    Normalization.SPECIAL: r"[^\da-zA-Z\s]",
+}
+
+
+class _DeletionTable(dict):
+    """
+    `str.translate` table that deletes every character matching any of the
+    given regex character classes.
+
+    The ASCII range is precomputed; other code points are classified on first
+    sight and cached (`str.translate` consults `__missing__` for unknown keys),
+    so a table covers all of Unicode without compiling anything per call.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        super().__init__()
+        self._patterns = [re.compile(pattern) for pattern in patterns]
+        for codepoint in range(128):
+            self.__missing__(codepoint)
+
+    def __missing__(self, codepoint: int):
+        char = chr(codepoint)
+        result = None if any(p.match(char) for p in self._patterns) else codepoint
+        self[codepoint] = result
+        return result
+
+
+class _CombiningTable(dict):
+    """`str.translate` table that deletes combining marks, filled lazily."""
+
+    def __missing__(self, codepoint: int):
+        result = None if unicodedata.combining(chr(codepoint)) else codepoint
+        self[codepoint] = result
+        return result
+
+
+_COMBINING_TABLE = _CombiningTable()
+_DELETION_TABLES: Dict[FrozenSet[Normalization], _DeletionTable] = {}
+
+
+def _deletion_table(normalizations: FrozenSet[Normalization]) -> _DeletionTable:
+    """Return the shared deletion table for a set of character-class normalizations."""
+    table = _DELETION_TABLES.get(normalizations)
+    if table is None:
+        patterns = [_DELETE_PATTERNS[n] for n in sorted(normalizations, key=lambda n: n.value)]
+        table = _DELETION_TABLES.setdefault(normalizations, _DeletionTable(patterns))
+    return table
+
+
+def _remove_accents(value: str) -> str:
+    # NFKD of pure-ASCII text is itself and has no combining marks.
+    if value.isascii():
+        return value
+    return unicodedata.normalize("NFKD", value).translate(_COMBINING_TABLE)
+
+
+def _compile(normalizations: Sequence[Normalization]) -> Callable[[str], str]:
+    """
+    Fuse an ordered list of normalizations into a single str -> str function.
+
+    Consecutive character deletions commute, so runs of them are merged into
+    one translate table and applied in a single `str.translate` call.
+    """
+    steps: List[Callable[[str], str]] = []
+    pending_deletes = set()
+
+    def flush():
+        if pending_deletes:
+            steps.append(_translate(_deletion_table(frozenset(pending_deletes))))
+            pending_deletes.clear()
+
+    for normalization in normalizations:
+        if normalization in _DELETE_PATTERNS:
+            pending_deletes.add(normalization)
+            continue
+        flush()
+        match normalization:
+            case Normalization.STRIP:
+                steps.append(str.strip)
+            case Normalization.LOWER:
+                steps.append(str.lower)
+            case Normalization.UPPER:
+                steps.append(str.upper)
+            case Normalization.ACCENT:
+                steps.append(_remove_accents)
+    flush()
+
+    if len(steps) == 1:
+        return steps[0]
+
+    def fused(value: str) -> str:
+        for step in steps:
+            value = step(value)
+        return value
+
+    return fused
+
+
+def _translate(table: dict) -> Callable[[str], str]:
+    def translate(value: str) -> str:
+        return value.translate(table)
+    return translate
+
+
 class NormalizeText(PrimitiveOperation):
     """
-    Perform a text normalization operation.
+    Perform one text normalization, or an ordered list of them in a single pass.
+
+    A list such as [strip, lower, remove_accents, remove_punctuation] is fused
+    into one function per value instead of one primitive (and one intermediate
+    column) per step. Character removals use precomputed `str.translate`
+    tables, and accent removal skips Unicode normalization for ASCII input.
     """
-    def __init__(self, normalization: Normalization):
-        self.normalization = normalization
+    def __init__(self, normalization: Union[Normalization, Sequence[Normalization]]):
+        if isinstance(normalization, (Normalization, str)):
+            normalizations = [normalization]
+        else:
+            normalizations = list(normalization)
+        if not normalizations:
+            raise ValueError("NormalizeText requires at least one normalization")
+        self.normalizations = [Normalization(n) for n in normalizations]
+        self._apply = _compile(self.normalizations)
+
+    def __getstate__(self):
+        # The fused function is a closure; it is rebuilt when unpickled.
+        state = self.__dict__.copy()
+        del state["_apply"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._apply = _compile(self.normalizations)
+
+    @property
+    def normalization(self) -> Union[Normalization, List[Normalization]]:
+        """The single normalization, or the ordered list when there are several."""
+        if len(self.normalizations) == 1:
+            return self.normalizations[0]
+        return list(self.normalizations)
 
     def __str__(self):
-        text = f"Apply {self.normalization} normalization"
-        return text
+        if len(self.normalizations) == 1:
+            return f"Apply {self.normalizations[0]} normalization"
+        names = ", ".join(n.value for n in self.normalizations)
+        return f"Apply {names} normalizations"
 
     def to_dict(self):
+        """
+        Serialize this operation to a JSON-friendly dict.
+
+        A single normalization serializes as a string (the original schema);
+        several serialize as an ordered list under the same key.
+        """
+        if len(self.normalizations) == 1:
+            normalization = self.normalizations[0].value
+        else:
+            normalization = [n.value for n in self.normalizations]
         output = {
             "operation": "normalize_text",
-            "normalization": self.normalization.value,
+            "normalization": normalization,
         }
         return output
 
     @support_iterable
     @handle_null
     def transform(self, value: str) -> str:
-        match self.normalization:
-            case Normalization.STRIP:
-                return value.strip()
-            case Normalization.LOWER:
-                return value.lower()
-            case Normalization.UPPER:
-                return value.upper()
-            case Normalization.ACCENT:
-                return self.remove_accents(value)
-            case Normalization.PUNCTUATION:
-                return self.remove_punctuation(value)
-            case Normalization.SPECIAL:
-                return self.remove_special_characters(value)
-            case _:
-                return value
+        return self._apply(value)
+
+    def transform_column(self, column: pd.Series) -> pd.Series:
+        """
+        Vectorized `transform` for string columns.
+
+        Free-text columns repeat heavily, so the fused function runs once per
+        distinct value and the results are broadcast back through factorized
+        codes. Nulls are passed through unchanged.
+        """
+        strings = string_column(column)
+        factorized = factorize_column(strings) if strings is not None else None
+        if factorized is None:
+            return super().transform_column(column)
+        codes, uniques = factorized
+        normalized = [self._apply(value) for value in uniques]
+        result = take_codes(normalized, codes, column.dtype, column)
+        nulls = codes == -1
+        if nulls.any():
+            result[nulls] = column[nulls]
+        return result
 
     def remove_accents(self, value: str) -> str:
         """
@@ -65,23 +226,24 @@ class NormalizeText(PrimitiveOperation):
         Callers needing to preserve those should pre-normalize input to
         NFC and apply this transform afterwards.
         """
-        normalized = unicodedata.normalize("NFKD", value)
-        return "".join(char for char in normalized if not unicodedata.combining(char))
+        return _remove_accents(value)
 
     def remove_punctuation(self, value: str) -> str:
         """
         Remove all characters other than letter, digit, underscore,
         space, tab, and newline
         """
-        return re.sub(r"[^\w\s]", "", value)
+        return value.translate(_deletion_table(frozenset({Normalization.PUNCTUATION})))
 
     def remove_special_characters(self, value: str) -> str:
         """
         Remove all characters other than letters, digits, and white space.
         """
-        return re.sub(r"[^\da-zA-Z\s]", "", value)
+        return value.translate(_deletion_table(frozenset({Normalization.SPECIAL})))
 
     @classmethod
     def from_serialization(cls, serialization):
-        normalization = Normalization(serialization["normalization"])
-        return NormalizeText(normalization)
+        normalization = serialization["normalization"]
+        if isinstance(normalization, list):
+            return NormalizeText([Normalization(n) for n in normalization])
+        return NormalizeText(Normalization(normalization))
@@ -1,6 +1,12 @@
-from .base import PrimitiveOperation, support_iterable
+from .base import PrimitiveOperation, factorize_column, support_iterable, take_codes
 from typing import Any, Iterable, List, Optional
 
+import pandas as pd
+
+
+# Sentinel for values that are neither truthy nor falsy.
+_UNKNOWN = object()
+
 
 class NormalizeBoolean(PrimitiveOperation):
     """
@@ -73,14 +79,65 @@ class NormalizeBoolean(PrimitiveOperation):
         Raises:
             ValueError if strict=True and the value is not recognized.
         """
+        result = self._lookup(value)
+        if result is not _UNKNOWN:
+            return result
+        if self.strict:
+            raise ValueError(f"Unknown boolean-like value: {value!r}")
+        return self.default
+
+    def transform_column(self, column: pd.Series) -> pd.Series:
+        """
+        Vectorized `transform` producing a nullable `boolean` column.
+
+        Only the distinct values are normalized and looked up; results are
+        broadcast back through factorized codes. Null cells are not tokens
+        of the column's vocabulary but still go through `transform`, exactly
+        as the per-cell path does (so they raise in strict mode unless listed
+        in truthy/falsy). In strict mode every unrecognized value is reported
+        in a single ValueError.
+        """
+        factorized = factorize_column(column)
+        if factorized is None:
+            return super().transform_column(column)
+        codes, uniques = factorized
+        converted = []
+        offending = []
+        for value in uniques:
+            result = self._lookup(value)
+            if result is _UNKNOWN:
+                offending.append(value)
+            converted.append(result)
+
+        null_positions = (codes == -1).nonzero()[0]
+        null_values = column.iloc[null_positions].tolist() if len(null_positions) else []
+        null_results = [self._lookup(value) for value in null_values]
+        # Null cells repeat; report each kind of null (None, NaN, pd.NA) once.
+        unknown_nulls = {
+            type(value): value
+            for value, result in zip(null_values, null_results)
+            if result is _UNKNOWN
+        }
+        offending.extend(unknown_nulls.values())
+        if offending and self.strict:
+            raise ValueError(f"Unknown boolean-like values: {offending!r}")
+
+        converted = [self.default if result is _UNKNOWN else result for result in converted]
+        null_results = [self.default if result is _UNKNOWN else result for result in null_results]
+        dtype = "boolean" if self.default is None or isinstance(self.default, bool) else object
+        result = take_codes(converted, codes, dtype, column)
+        if len(null_positions):
+            result.iloc[null_positions] = pd.array(null_results, dtype=dtype)
+        return result
+
+    def _lookup(self, value: Any) -> Any:
+        """Return True/False for a recognized value, or `_UNKNOWN`."""
         token = self._normalize_token(value)
         if token in self._truthy_set:
             return True
         if token in self._falsy_set:
             return False
-        if self.strict:
-            raise ValueError(f"Unknown boolean-like value: {value!r}")
-        return self.default
+        return _UNKNOWN
 
     @classmethod
     def from_serialization(cls, serialization):
@@ -1,6 +1,8 @@
-from .base import PrimitiveOperation, handle_null, support_iterable
+from .base import PrimitiveOperation, fits_int64, handle_null, integer_bounds, numeric_column, support_iterable
 from typing import Union
 
+import pandas as pd
+
 class Offset(PrimitiveOperation):
     """
     Operator that applies an offset to a numerical value.
@@ -32,6 +34,17 @@ class Offset(PrimitiveOperation):
         """
         return value + self.offset
 
+    def transform_column(self, column: pd.Series) -> pd.Series:
+        """
+        Vectorized `transform`: add the offset to a numeric column.
+
+        Integer sums outside int64 are computed per cell, as Python ints.
+        """
+        numeric = numeric_column(column)
+        if numeric is None or not _sum_fits(numeric, self.offset):
+            return super().transform_column(column)
+        return numeric + self.offset
+
     @classmethod
     def from_serialization(cls, serialization):
         """
@@ -39,3 +52,13 @@ class Offset(PrimitiveOperation):
         """
         offset = float(serialization["offset"])
         return Offset(offset)
+
+
+def _sum_fits(numeric: pd.Series, offset: Union[int, float]) -> bool:
+    """Return False if integer `numeric` plus integer `offset` could leave int64."""
+    if isinstance(offset, float) or not pd.api.types.is_integer_dtype(numeric.dtype):
+        return True
+    bounds = integer_bounds(numeric)
+    if bounds is None:
+        return fits_int64(offset)
+    return fits_int64(offset, bounds[0] + offset, bounds[1] + offset)
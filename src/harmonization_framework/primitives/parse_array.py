@@ -1,10 +1,22 @@
 import json
-from typing import Any, List
+from typing import Any, List, Tuple
 
-from .base import PrimitiveOperation
+import numpy as np
+import pandas as pd
+
+from .array_column import ArrayColumn, object_array
+from .base import PrimitiveOperation, factorize_column, string_column
 from .normalize_boolean import NormalizeBoolean
 
 
+# Flat value dtype for each coerced item type; "auto" and "string" stay object.
+_ITEM_DTYPES = {
+    "integer": np.int64,
+    "float": np.float64,
+    "boolean": np.bool_,
+}
+
+
 class ParseArray(PrimitiveOperation):
     """
     Parse array-like values into Python lists.
@@ -12,6 +24,10 @@ class ParseArray(PrimitiveOperation):
     Supported formats:
     - json: parse JSON arrays from strings (default)
     - delimiter: split strings by a configured delimiter
+
+    The column-level transform returns an `ArrayColumn` (flat values plus
+    offsets) instead of one Python list per row; it is materialized into
+    lists only if a later primitive needs them.
     """
 
     SUPPORTED_FORMATS = {"json", "delimiter"}
@@ -67,6 +83,133 @@ class ParseArray(PrimitiveOperation):
                 ) from exc
             return self.default
 
+    def transform_column(self, column: pd.Series) -> ArrayColumn:
+        """
+        Parse a whole column into an `ArrayColumn`.
+
+        Each distinct cell value is parsed once (multi-select answers repeat
+        heavily), the parsed items are coerced in bulk per distinct item, and
+        rows are assembled by gathering from the distinct results with numpy
+        index arithmetic. Null cells are parsed once per kind of null, exactly
+        as `transform` would parse them.
+
+        In strict mode every unparseable value is reported in one ValueError;
+        otherwise those rows are flagged missing and materialize as `default`.
+        """
+        codes, uniques = self._distinct_cells(column)
+
+        parsed = []
+        failed = np.zeros(len(uniques), dtype=bool)
+        first_error = None
+        for position, value in enumerate(uniques):
+            try:
+                parsed.append(self._parse_items(value))
+            except Exception as exc:
+                parsed.append([])
+                failed[position] = True
+                first_error = first_error or exc
+
+        unique_lengths = np.fromiter((len(items) for items in parsed), dtype=np.int64, count=len(parsed))
+        unique_offsets = np.concatenate(([0], np.cumsum(unique_lengths)))
+        flat_items = [item for items in parsed for item in items]
+        values, invalid, item_error = self._coerce_items(flat_items)
+        if invalid.any():
+            unique_of_item = np.repeat(np.arange(len(uniques)), unique_lengths)
+            failed[unique_of_item[invalid]] = True
+            first_error = first_error or item_error
+
+        if failed.any() and self.strict:
+            offending = [value for value, bad in zip(uniques, failed) if bad]
+            raise ValueError(
+                f"Failed to parse array from {len(offending)} value(s) "
+                f"with format={self.format!r}: {offending!r}"
+            ) from first_error
+
+        row_failed = failed[codes]
+        row_lengths = np.where(row_failed, 0, unique_lengths[codes])
+        offsets = np.concatenate(([0], np.cumsum(row_lengths)))
+        gather = np.repeat(unique_offsets[codes] - offsets[:-1], row_lengths) + np.arange(offsets[-1])
+        return ArrayColumn(
+            values[gather],
+            offsets,
+            column.index,
+            name=column.name,
+            missing=row_failed,
+            missing_value=self.default,
+        )
+
+    def _distinct_cells(self, column: pd.Series) -> Tuple[np.ndarray, List[Any]]:
+        """
+        Return (codes, distinct cell values) covering every row.
+
+        Only string columns are factorized: for other values factorize treats
+        1, 1.0 and True as one value, which `allow_singleton` would expose.
+        Those columns (and columns of lists) get one code per row. Nulls get
+        one code per kind (None, NaN, pd.NA) so each kind is parsed once.
+        """
+        factorized = factorize_column(column) if string_column(column) is not None else None
+        if factorized is None:
+            return np.arange(len(column)), column.tolist()
+        codes, uniques = factorized
+        null_positions = (codes == -1).nonzero()[0]
+        if len(null_positions):
+            codes = codes.copy()
+            kinds = {}
+            for position, value in zip(null_positions.tolist(), column.iloc[null_positions].tolist()):
+                code = kinds.get(type(value))
+                if code is None:
+                    code = kinds[type(value)] = len(uniques)
+                    uniques.append(value)
+                codes[position] = code
+        return codes, uniques
+
+    def _coerce_items(self, items: List[Any]) -> Tuple[np.ndarray, np.ndarray, Any]:
+        """
+        Coerce flat items in bulk, returning (values, invalid mask, first error).
+
+        Each distinct non-null item is coerced once with `_coerce_item` and the
+        results broadcast back; the values array is typed by `item_type`.
+        """
+        invalid = np.zeros(len(items), dtype=bool)
+        if self.item_type == "auto":
+            return object_array(items), invalid, None
+
+        codes, distinct = None, None
+        hashable_by_value = self.item_type != "string" or all(isinstance(item, str) for item in items)
+        if hashable_by_value:
+            try:
+                codes, uniques = pd.factorize(object_array(items), use_na_sentinel=True)
+                distinct = uniques.tolist()
+            except TypeError:
+                codes = None
+        if codes is None or (codes == -1).any():
+            # Unhashable or null items: coerce each item on its own.
+            codes, distinct = np.arange(len(items)), list(items)
+
+        converted = []
+        bad = np.zeros(len(distinct), dtype=bool)
+        first_error = None
+        for position, item in enumerate(distinct):
+            try:
+                converted.append(self._coerce_item(item))
+            except Exception as exc:
+                converted.append(None)
+                bad[position] = True
+                first_error = first_error or exc
+
+        dtype = _ITEM_DTYPES.get(self.item_type)
+        try:
+            if dtype is None:
+                raise TypeError
+            placeholder = dtype(0)
+            distinct_values = np.array(
+                [placeholder if is_bad else value for value, is_bad in zip(converted, bad)],
+                dtype=dtype,
+            )
+        except (TypeError, ValueError, OverflowError):
+            distinct_values = object_array(converted)
+        return distinct_values[codes], bad[codes], first_error
+
     @classmethod
     def from_serialization(cls, serialization):
         return ParseArray(
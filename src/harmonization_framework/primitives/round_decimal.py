@@ -1,6 +1,9 @@
-from .base import PrimitiveOperation, handle_null, support_iterable
+from .base import PrimitiveOperation, handle_null, numeric_column, python_round, support_iterable
 from typing import Union
 
+import numpy as np
+import pandas as pd
+
 class Round(PrimitiveOperation):
     """
     Round numeric values to a specified decimal precision.
@@ -37,6 +40,22 @@ class Round(PrimitiveOperation):
         """
         return round(value, self.precision)
 
+    def transform_column(self, column: pd.Series) -> pd.Series:
+        """
+        Vectorized `transform` with Python `round` semantics.
+
+        Integer columns are returned unchanged, as `round(int, precision)` is
+        the identity for non-negative precision.
+        """
+        numeric = numeric_column(column)
+        if numeric is None:
+            return super().transform_column(column)
+        if pd.api.types.is_integer_dtype(numeric.dtype):
+            return numeric.copy()
+        values = numeric.to_numpy(dtype=float, na_value=np.nan)
+        rounded = python_round(values, self.precision)
+        return pd.Series(rounded, index=numeric.index, name=numeric.name).astype(numeric.dtype)
+
     @classmethod
     def from_serialization(cls, serialization):
         """
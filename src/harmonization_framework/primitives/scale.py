@@ -1,6 +1,8 @@
-from .base import PrimitiveOperation, handle_null, support_iterable
+from .base import PrimitiveOperation, fits_int64, handle_null, integer_bounds, numeric_column, support_iterable
 from typing import Union
 
+import pandas as pd
+
 class Scale(PrimitiveOperation):
     """
     Operator that applies a scaling factor to a numerical value.
@@ -32,6 +34,19 @@ class Scale(PrimitiveOperation):
         """
         return value * self.scaling_factor
 
+    def transform_column(self, column: pd.Series) -> pd.Series:
+        """
+        Vectorized `transform`: multiply a numeric column by the scaling factor.
+
+        Nullable integer columns stay `Int64` for an integer factor and become
+        `Float64` (not float with NaN) for a float factor. Integer products
+        outside int64 are computed per cell, as Python ints.
+        """
+        numeric = numeric_column(column)
+        if numeric is None or not _product_fits(numeric, self.scaling_factor):
+            return super().transform_column(column)
+        return numeric * self.scaling_factor
+
     @classmethod
     def from_serialization(cls, serialization):
         """
@@ -39,3 +54,13 @@ class Scale(PrimitiveOperation):
         """
         scaling_factor = float(serialization["scaling_factor"])
         return Scale(scaling_factor)
+
+
+def _product_fits(numeric: pd.Series, factor: Union[int, float]) -> bool:
+    """Return False if integer `numeric` times integer `factor` could leave int64."""
+    if isinstance(factor, float) or not pd.api.types.is_integer_dtype(numeric.dtype):
+        return True
+    bounds = integer_bounds(numeric)
+    if bounds is None:
+        return fits_int64(factor)
+    return fits_int64(factor, bounds[0] * factor, bounds[1] * factor)
@@ -1,6 +1,9 @@
-from .base import PrimitiveOperation, handle_null, support_iterable
+from .base import PrimitiveOperation, fits_int64, handle_null, numeric_column, support_iterable
 from typing import Union
 
+import numpy as np
+import pandas as pd
+
 class Threshold(PrimitiveOperation):
     """
     Operator that thresholds a numerical value.
@@ -42,6 +45,19 @@ class Threshold(PrimitiveOperation):
             value = float(value)
         return max(self.lower, min(self.upper, value))
 
+    def transform_column(self, column: pd.Series) -> pd.Series:
+        """
+        Vectorized `transform` using `np.clip`, with the same type promotion.
+        Integer bounds outside int64 are applied per cell.
+        """
+        numeric = numeric_column(column)
+        floats = isinstance(self.lower, float) or isinstance(self.upper, float)
+        if numeric is None or not (floats or fits_int64(self.lower, self.upper)):
+            return super().transform_column(column)
+        if floats:
+            numeric = numeric.astype("Float64" if _is_masked(numeric) else float)
+        return np.clip(numeric, self.lower, self.upper)
+
     @classmethod
     def from_serialization(cls, serialization):
         """
@@ -50,3 +66,8 @@ class Threshold(PrimitiveOperation):
         lower = float(serialization["lower"])
         upper = float(serialization["upper"])
         return Threshold(lower, upper)
+
+
+def _is_masked(column: pd.Series) -> bool:
+    """Return True for pandas nullable (masked) numeric dtypes such as Int64."""
+    return isinstance(column.dtype, pd.api.extensions.ExtensionDtype)
@@ -1,4 +1,6 @@
-from .base import PrimitiveOperation, handle_null, support_iterable
+from .base import PrimitiveOperation, handle_null, string_column, support_iterable
+
+import pandas as pd
 
 class Truncate(PrimitiveOperation):
     """
@@ -33,6 +35,15 @@ class Truncate(PrimitiveOperation):
         """
         return value[:self.length]
 
+    def transform_column(self, column: pd.Series) -> pd.Series:
+        """
+        Vectorized `transform` for string columns using `.str.slice`.
+        """
+        strings = string_column(column)
+        if strings is None:
+            return super().transform_column(column)
+        return strings.str.slice(stop=self.length)
+
     @classmethod
     def from_serialization(cls, serialization):
         """
@@ -1,6 +1,9 @@
 from enum import Enum
 
 class PrimitiveVocabulary(Enum):
+    ARRAY_CONTAINS = "array_contains"
+    ARRAY_COUNT = "array_count"
+    ARRAY_JOIN = "array_join"
     BIN = "bin"
     CAST = "cast"
     CONVERT_DATE = "convert_date"
@@ -0,0 +1,132 @@
+"""
+On-disk cache of compiled rule sets.
+
+Loading a rules file parses JSON/YAML and rebuilds every primitive (regex
+compilation, Bin interval trees, unit validation). `load_rules` pickles the
+fully built RuleSet the first time a rules file is loaded and restores it on
+later loads of the same file.
+
+A cache entry is keyed by the SHA-256 of the rules file's bytes together with
+the library and Python versions, so editing the file or upgrading the package
+simply misses the cache. Entries live next to the rules file
+(`.<rules file name>.<key>.rulecache`) or, when `cache_dir` is given, in that
+directory (`<key>.rulecache`). An unreadable or stale entry is ignored and
+rebuilt, and a cache directory that cannot be written only costs the rebuild.
+
+Cache entries are pickles: only point `cache_dir` at a directory you trust.
+"""
+
+import glob
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import tempfile
+from importlib import metadata
+from typing import Optional
+
+from .rule_registry import RuleSet, _is_yaml
+
+logger = logging.getLogger(__name__)
+
+CACHE_SUFFIX = ".rulecache"
+# Bump when the layout of cached objects changes without a version bump.
+CACHE_FORMAT = 1
+
+
+def library_version() -> str:
+    try:
+        return metadata.version("harmonization-framework")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def cache_key(content: bytes) -> str:
+    """Key of a rules file's cache entry: its content hash plus the versions."""
+    digest = hashlib.sha256(content)
+    digest.update(
+        f"\0{CACHE_FORMAT}\0{library_version()}\0{sys.version_info[0]}.{sys.version_info[1]}".encode()
+    )
+    return digest.hexdigest()
+
+
+def cache_path(rule_file: str, key: str, cache_dir: Optional[str] = None) -> str:
+    if cache_dir is not None:
+        return os.path.join(cache_dir, key + CACHE_SUFFIX)
+    directory, name = os.path.split(os.path.abspath(rule_file))
+    return os.path.join(directory, f".{name}.{key[:32]}{CACHE_SUFFIX}")
+
+
+def _read_entry(path: str, key: str) -> Optional[RuleSet]:
+    try:
+        with open(path, "rb") as handle:
+            stored_key, rules = pickle.load(handle)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:  # corrupt or written by an incompatible version
+        logger.debug("Ignoring unreadable rules cache %s: %s", path, exc)
+        return None
+    if stored_key != key or not isinstance(rules, RuleSet):
+        return None
+    return rules
+
+
+def _write_entry(path: str, key: str, rules: RuleSet) -> None:
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file and rename it, so concurrent runs never
+        # read a half-written entry.
+        fd, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                pickle.dump((key, rules), handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+    except (OSError, pickle.PicklingError, AttributeError, TypeError) as exc:
+        logger.debug("Could not write rules cache %s: %s", path, exc)
+
+
+def _remove_stale_entries(rule_file: str, keep: str) -> None:
+    directory, name = os.path.split(os.path.abspath(rule_file))
+    pattern = os.path.join(glob.escape(directory), f".{glob.escape(name)}.*{CACHE_SUFFIX}")
+    for path in glob.glob(pattern):
+        if path != keep:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def load_rules(rule_file: str, cache_dir: Optional[str] = None, use_cache: bool = True) -> RuleSet:
+    """
+    Load a rules file into a new RuleSet, through the compiled-rules cache.
+
+    On a miss the file is parsed, every rule's operations are built and the
+    result is stored; on a hit the stored RuleSet is returned ready to run.
+    With `use_cache=False` this is a plain `RuleSet.load`.
+    """
+    with open(rule_file, "rb") as handle:
+        content = handle.read()
+    rules = RuleSet()
+    if not use_cache:
+        rules.loads(content.decode("utf-8"), yaml_format=_is_yaml(rule_file))
+        return rules
+
+    key = cache_key(content)
+    path = cache_path(rule_file, key, cache_dir)
+    cached = _read_entry(path, key)
+    if cached is not None:
+        return cached
+
+    # Parse the bytes that were hashed, so the entry always matches its key.
+    rules.loads(content.decode("utf-8"), yaml_format=_is_yaml(rule_file))
+    for rule in rules:
+        rule.compile()
+    _write_entry(path, key, rules)
+    if cache_dir is None:
+        _remove_stale_entries(rule_file, keep=path)
+    return rules
@@ -1,13 +1,19 @@
 import json
 import logging
-from typing import Iterable, List
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 import yaml
 
 from .harmonization_rule import HarmonizationRule
+from .primitives.array_contains import ArrayContains
+from .primitives.base import PrimitiveOperation
+from .primitives.cast import Cast
 
 logger = logging.getLogger(__name__)
 
+# libyaml's loader when PyYAML was built with it; same results, much faster.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def _is_yaml(path: str) -> bool:
     """Return True if `path` names a YAML file (.yaml / .yml)."""
@@ -34,54 +40,81 @@ class RuleSet:
     """
     Flat, target-keyed collection of harmonization rules.
 
-    Rules are stored as a list, but at most one rule per target is allowed.
-    Adding a rule for an existing target replaces it and emits a warning.
+    Rules are indexed by target in insertion order, so adding and finding a
+    rule are O(1) and at most one rule per target is allowed. Adding a rule
+    for an existing target replaces it in place and emits a warning.
     """
 
     def __init__(self):
-        self._rules: List[HarmonizationRule] = []
+        self._rules: Dict[str, HarmonizationRule] = {}
 
     def add_rule(self, rule: HarmonizationRule) -> None:
         """
         Add a rule, or replace the existing rule for the same target.
         """
-        for i, existing in enumerate(self._rules):
-            if existing.target == rule.target:
-                logger.warning("Rule already exists for target %s; replacing.", rule.target)
-                self._rules[i] = rule
-                return
-        self._rules.append(rule)
+        if rule.target in self._rules:
+            logger.warning("Rule already exists for target %s; replacing.", rule.target)
+        self._rules[rule.target] = rule
+
+    def add_one_hot_rules(
+        self,
+        source: str,
+        options: Sequence[Any],
+        targets: Optional[Sequence[str]] = None,
+        operations: Optional[List[PrimitiveOperation]] = None,
+    ) -> List[HarmonizationRule]:
+        """
+        Add one 0/1 indicator rule per option of a multi-select source column.
+
+        Each rule applies `operations` (typically a ParseArray that turns the
+        raw answer into a list), then `array_contains` for its option and a
+        boolean-to-integer cast. Targets default to "<source>_<option>".
+        `harmonize_dataset` evaluates the shared leading operations once per
+        source column, so N indicators cost one parse plus N membership tests.
+
+        Returns the rules that were added.
+        """
+        options = list(options)
+        if targets is None:
+            targets = [f"{source}_{option}" for option in options]
+        targets = list(targets)
+        if len(targets) != len(options):
+            raise ValueError("add_one_hot_rules needs exactly one target per option")
+        added = []
+        for option, target in zip(options, targets):
+            transformation = list(operations or []) + [ArrayContains(option), Cast("boolean", "integer")]
+            rule = HarmonizationRule([source], target, transformation)
+            self.add_rule(rule)
+            added.append(rule)
+        return added
 
     def find(self, target: str) -> HarmonizationRule:
         """
         Return the rule producing the given target, or raise KeyError.
         """
-        for rule in self._rules:
-            if rule.target == target:
-                return rule
-        raise KeyError(target)
+        return self._rules[target]
 
     def for_targets(self, targets: Iterable[str]) -> List[HarmonizationRule]:
         """
         Return rules whose target appears in `targets`, preserving insertion order.
         """
         wanted = set(targets)
-        return [rule for rule in self._rules if rule.target in wanted]
+        return [rule for target, rule in self._rules.items() if target in wanted]
 
     def all_rules(self) -> List[HarmonizationRule]:
-        return list(self._rules)
+        return list(self._rules.values())
 
     def all_targets(self) -> List[str]:
-        return [rule.target for rule in self._rules]
+        return list(self._rules)
 
     def __len__(self) -> int:
         return len(self._rules)
 
     def __iter__(self):
-        return iter(self._rules)
+        return iter(self._rules.values())
 
     def clean(self) -> None:
-        self._rules = []
+        self._rules = {}
 
     def save(self, output: str = "rules.json") -> None:
         """
@@ -97,7 +130,7 @@ class RuleSet:
         between top-level rules so the file is easy to scan. This keeps the rule
         skeleton readable while compacting the leaf items.
         """
-        payload = [rule.serialize() for rule in self._rules]
+        payload = [rule.serialize() for rule in self._rules.values()]
         with open(output, "w") as out:
             if _is_yaml(output):
                 dumped = yaml.safe_dump(payload, sort_keys=False, default_flow_style=None)
@@ -114,14 +147,21 @@ class RuleSet:
         Accepts both the new flat-array schema and the legacy nested
         {source: {target: rule}} schema for migration convenience.
         """
+        with open(rule_file, "r") as rf:
+            self.loads(rf.read(), yaml_format=_is_yaml(rule_file), clean=clean)
+
+    def loads(self, text: str, yaml_format: bool = False, clean: bool = False) -> None:
+        """
+        Load rules from the text of a JSON (or, with `yaml_format`, YAML)
+        rules file. See `load`.
+        """
         if clean:
             self.clean()
 
-        with open(rule_file, "r") as rf:
-            if _is_yaml(rule_file):
-                data = yaml.safe_load(rf)
-            else:
-                data = json.load(rf)
+        if yaml_format:
+            data = yaml.load(text, Loader=_YAML_LOADER)
+        else:
+            data = json.loads(text)
 
         for rule_payload in _iter_rule_payloads(data):
             self.add_rule(HarmonizationRule.from_serialization(rule_payload))
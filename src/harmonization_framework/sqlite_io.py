@@ -0,0 +1,199 @@
+"""
+SQLite tables as harmonization sources and sinks, using only `sqlite3`.
+
+A SQLite location is written `<database file>::<table>`, where the database
+file ends in `.db`, `.sqlite` or `.sqlite3`. As an input, the part after
+`::` may also be a `SELECT` (or `WITH ...`) query. Examples:
+
+    /data/study.sqlite::participants
+    /data/study.sqlite::SELECT * FROM participants WHERE site = 'A'
+"""
+
+import itertools
+import json
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .primitives.base import isnull
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+LOCATION_SEPARATOR = "::"
+
+# Rows fetched per chunk when reading, and inserted per executemany batch.
+READ_CHUNK_ROWS = 50_000
+WRITE_BATCH_ROWS = 10_000
+
+
+def parse_location(path: str) -> Optional[Tuple[str, str]]:
+    """
+    Split `path` into (database file, table or query), or return None when
+    `path` is not a SQLite location.
+    """
+    if LOCATION_SEPARATOR not in path:
+        return None
+    database, relation = path.split(LOCATION_SEPARATOR, 1)
+    if not database.lower().endswith(SQLITE_EXTENSIONS):
+        return None
+    relation = relation.strip()
+    if not relation:
+        raise ValueError(f"SQLite location {path!r} names no table or query")
+    return database, relation
+
+
+def is_query(relation: str) -> bool:
+    """True if `relation` is a SELECT/WITH query rather than a table name."""
+    words = relation.lstrip("( \n\t").split(None, 1)
+    return bool(words) and words[0].lower() in {"select", "with"}
+
+
+def quote_identifier(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _source_sql(relation: str, columns: Optional[Sequence[str]] = None) -> str:
+    selected = "*" if columns is None else ", ".join(quote_identifier(c) for c in columns)
+    if is_query(relation):
+        return f"SELECT {selected} FROM ({relation})"
+    return f"SELECT {selected} FROM {quote_identifier(relation)}"
+
+
+def _connect(database: str, must_exist: bool = True) -> sqlite3.Connection:
+    if must_exist:
+        # mode=ro keeps a mistyped path from silently creating an empty database.
+        return sqlite3.connect(f"{Path(database).resolve().as_uri()}?mode=ro", uri=True)
+    return sqlite3.connect(database)
+
+
+def read_header(database: str, relation: str) -> List[str]:
+    """Column names of a table or query, without fetching rows."""
+    with closing(_connect(database)) as connection:
+        cursor = connection.execute(_source_sql(relation) + " LIMIT 0")
+        return [description[0] for description in cursor.description]
+
+
+def read_chunks(
+    database: str,
+    relation: str,
+    columns: Optional[Sequence[str]] = None,
+    chunk_rows: int = READ_CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """Yield a table or query's rows as dataframes of at most `chunk_rows` rows."""
+    with closing(_connect(database)) as connection:
+        yield from pd.read_sql_query(_source_sql(relation, columns), connection, chunksize=chunk_rows)
+
+
+def read_table(database: str, relation: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Read a table or query into one dataframe, streaming it in chunks.
+
+    Chunks are renumbered into one RangeIndex, so `original_id` is the row
+    position exactly as for a file input.
+    """
+    chunks = list(read_chunks(database, relation, columns))
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
+
+
+def table_exists(database: str, table: str) -> bool:
+    """
+    True if `database` exists and holds `table`. For a query, only the
+    database has to exist; the query itself is checked when it runs.
+    """
+    if is_query(table):
+        return os.path.exists(database)
+    try:
+        with closing(_connect(database)) as connection:
+            row = connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name = ?", (table,)
+            ).fetchone()
+    except sqlite3.OperationalError:
+        return False
+    return row is not None
+
+
+# infer_dtype kinds of object columns that map onto one SQLite type.
+_OBJECT_KINDS = {
+    "string": "TEXT",
+    "integer": "INTEGER",
+    "boolean": "INTEGER",
+    "floating": "REAL",
+    "mixed-integer-float": "REAL",
+}
+
+
+def column_type(column: pd.Series) -> str:
+    """
+    SQLite column type (affinity) for a column, from its dtype or, for object
+    columns, from the kind of values it holds.
+    """
+    dtype = column.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return column_type(pd.Series(dtype.categories))
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    if dtype == object:
+        # Mixed numbers and text (or lists) get no declared type, which keeps
+        # each value's own storage class.
+        return _OBJECT_KINDS.get(pd.api.types.infer_dtype(column, skipna=True), "")
+    if pd.api.types.is_string_dtype(dtype):
+        return "TEXT"
+    return ""
+
+
+def _sql_value(value: Any) -> Any:
+    if isinstance(value, (list, tuple, dict)):
+        return json.dumps(value, default=str)
+    if isnull(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if hasattr(value, "item"):  # numpy scalar
+        return value.item()
+    return value
+
+
+def _rows(df: pd.DataFrame) -> Iterator[Tuple[Any, ...]]:
+    columns = [df[name].astype(object).tolist() for name in df.columns]
+    for row in zip(*columns):
+        yield tuple(_sql_value(value) for value in row)
+
+
+def write_table(
+    df: pd.DataFrame,
+    database: str,
+    table: str,
+    batch_rows: int = WRITE_BATCH_ROWS,
+) -> None:
+    """
+    Replace `table` in `database` with the rows of `df`.
+
+    The table is created with column types derived from the dtypes, then
+    filled through batched `executemany` calls. Dropping, creating and
+    inserting happen in one transaction, so readers never see a partial table.
+    """
+    if is_query(table):
+        raise ValueError("A SQLite output must name a table, not a query")
+    name = quote_identifier(table)
+    definitions = ", ".join(
+        f"{quote_identifier(column)} {column_type(df[column])}".rstrip() for column in df.columns
+    )
+    insert = f"INSERT INTO {name} VALUES ({', '.join('?' for _ in df.columns)})"
+    with closing(_connect(database, must_exist=False)) as connection, connection:
+        # sqlite3 does not open a transaction for DDL on its own.
+        connection.execute("BEGIN")
+        connection.execute(f"DROP TABLE IF EXISTS {name}")
+        connection.execute(f"CREATE TABLE {name} ({definitions})")
+        rows = _rows(df)
+        while True:
+            batch = list(itertools.islice(rows, batch_rows))
+            if not batch:
+                break
+            connection.executemany(insert, batch)
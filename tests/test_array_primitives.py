@@ -0,0 +1,227 @@
+"""
+Array-valued columns: column-level ParseArray, the compact ArrayColumn
+(flat values + offsets) representation, and the list-aware primitives that
+consume it without materializing Python lists.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from harmonization_framework.harmonization_rule import HarmonizationRule
+from harmonization_framework.harmonize import harmonize_dataset
+from harmonization_framework.primitives import (
+    ArrayColumn,
+    ArrayContains,
+    ArrayCount,
+    ArrayJoin,
+    ParseArray,
+    Reduce,
+)
+from harmonization_framework.primitives.base import isnull
+from harmonization_framework.primitives.reduce import Reduction
+from harmonization_framework.rule_registry import RuleSet
+
+
+def _scalar_results(primitive, column):
+    results = []
+    for value in column.tolist():
+        try:
+            results.append(primitive.transform(value))
+        except ValueError:
+            results.append(ValueError)
+    return results
+
+
+def _assert_same_cells(actual, expected):
+    assert len(actual) == len(expected)
+    for got, want in zip(actual, expected):
+        if isinstance(want, list):
+            # repr compares item types and treats NaN items as equal.
+            assert repr(got) == repr(want)
+        elif isnull(want):
+            assert isnull(got)
+        else:
+            assert got == want
+
+
+PARSE_CASES = [
+    (ParseArray(format="delimiter", item_type="integer"), pd.Series(["1|2", "3", "", " 4 | 5 ", "1|2"])),
+    (ParseArray(format="delimiter", delimiter="\\n", item_type="string"), pd.Series(["a\r\nb", "c"])),
+    (ParseArray(format="delimiter", item_type="float"), pd.Series(["1.5|2", "nan", "1.5|2"], dtype="string")),
+    (ParseArray(format="delimiter", item_type="boolean"), pd.Series(["yes|no", "1|0|on"])),
+    (ParseArray(format="json", item_type="auto"), pd.Series(['[1, "a", [2]]', "[]", "[null, true]"])),
+    (ParseArray(format="json", item_type="string"), pd.Series(["[1, true, 1.0]", '["x"]'])),
+    (ParseArray(format="json", allow_singleton=True), pd.Series(["5", "[5]", '"x"'])),
+    (ParseArray(format="delimiter", allow_singleton=True), pd.Series([1, True, 1.0, None], dtype=object)),
+    (ParseArray(format="json"), pd.Series([[1, 2], (3,)], dtype=object)),
+    (
+        ParseArray(format="delimiter", item_type="integer", strict=False, default=[]),
+        pd.Series(["1|x", None, "2", np.nan, pd.NA], dtype=object),
+    ),
+    (ParseArray(format="json", strict=False, default="invalid"), pd.Series(['{"a": 1}', "[1", "[2]"])),
+]
+
+
+@pytest.mark.parametrize("primitive, column", PARSE_CASES, ids=[str(i) for i in range(len(PARSE_CASES))])
+def test_parse_array_column_matches_scalar_transform(primitive, column):
+    result = primitive.transform_column(column)
+    assert isinstance(result, ArrayColumn)
+    _assert_same_cells(result.to_series().tolist(), _scalar_results(primitive, column))
+
+
+def test_parse_array_column_uses_flat_values_and_offsets():
+    column = pd.Series(["1|2", "3", "", "1|2"], index=[10, 11, 12, 13])
+    result = ParseArray(format="delimiter", item_type="integer").transform_column(column)
+    assert result.values.dtype == np.int64
+    assert result.values.tolist() == [1, 2, 3, 1, 2]
+    assert result.offsets.tolist() == [0, 2, 3, 3, 5]
+    assert result.lengths().tolist() == [2, 1, 0, 2]
+    assert result.row_ids().tolist() == [0, 0, 1, 3, 3]
+    assert result.to_series().index.tolist() == [10, 11, 12, 13]
+
+
+def test_parse_array_column_strict_lists_all_unparseable_values():
+    column = pd.Series(["1|2", "x", "3", "4|y", "x"])
+    primitive = ParseArray(format="delimiter", item_type="integer", strict=True)
+    with pytest.raises(ValueError, match=r"2 value\(s\) with format='delimiter': \['x', '4\|y'\]"):
+        primitive.transform_column(column)
+
+
+def test_parse_array_column_strict_rejects_nulls_like_scalar():
+    with pytest.raises(ValueError, match="Failed to parse array"):
+        ParseArray(format="json").transform_column(pd.Series(["[1]", None]))
+
+
+def test_parse_array_non_strict_flags_missing_cells():
+    primitive = ParseArray(format="json", item_type="integer", strict=False)
+    result = primitive.transform_column(pd.Series(["[1]", "oops", "[2, 3]"]))
+    assert result.missing_mask().tolist() == [False, True, False]
+    assert result.to_series().tolist() == [[1], None, [2, 3]]
+
+
+def test_parse_array_column_feeds_list_primitives_after_materialization():
+    rule = HarmonizationRule(
+        ["week_hours"],
+        "total_hours",
+        [ParseArray(format="delimiter", item_type="integer"), Reduce(Reduction.SUM)],
+    )
+    rules = RuleSet()
+    rules.add_rule(rule)
+    df = pd.DataFrame({"week_hours": ["8|8|8", "4|6", "8|8|8"]})
+
+    out = harmonize_dataset(df, rules, dataset_name="test")
+    assert out["total_hours"].tolist() == [24, 10, 24]
+
+
+def test_parse_array_as_last_step_outputs_python_lists():
+    rules = RuleSet()
+    rules.add_rule(HarmonizationRule(["raw"], "items", [ParseArray(format="json")]))
+    payloads = [[1, 2], ["a"], []]
+    df = pd.DataFrame({"raw": [json.dumps(p) for p in payloads]})
+
+    out = harmonize_dataset(df, rules, dataset_name="test")
+    assert out["items"].tolist() == payloads
+
+
+# --- list-aware primitives ---------------------------------------------------
+
+
+LIST_COLUMNS = [
+    (ParseArray(format="delimiter", item_type="integer"), pd.Series(["1|2|2", "3", "", "2|1"])),
+    (ParseArray(format="delimiter", item_type="string"), pd.Series(["a|b", "", "b|b|c"])),
+    (ParseArray(format="delimiter", item_type="float"), pd.Series(["1.5|2", "nan|0.1"])),
+    (ParseArray(format="json"), pd.Series(['[1, "a", true]', "[]", '["2", 2.0]'])),
+    (
+        ParseArray(format="delimiter", item_type="integer", strict=False, default=[]),
+        pd.Series(["1|x", "2|2", None]),
+    ),
+    (ParseArray(format="json", strict=False), pd.Series(["[1]", "oops", "[2, 1]"])),
+]
+
+LIST_PRIMITIVES = [
+    ArrayContains(2),
+    ArrayContains("b"),
+    ArrayContains(True),
+    ArrayCount(),
+    ArrayCount(2),
+    ArrayCount("b"),
+    ArrayJoin(),
+    ArrayJoin(" / "),
+]
+
+
+@pytest.mark.parametrize("primitive", LIST_PRIMITIVES, ids=str)
+@pytest.mark.parametrize("parse, column", LIST_COLUMNS, ids=[str(i) for i in range(len(LIST_COLUMNS))])
+def test_list_primitives_on_array_column_match_scalar_transform(primitive, parse, column):
+    parsed = parse.transform_column(column)
+    expected = _scalar_results(primitive, parsed.to_series())
+    _assert_same_cells(primitive.transform_column(parsed).tolist(), expected)
+
+
+@pytest.mark.parametrize("primitive", [ArrayContains(1), ArrayCount(), ArrayJoin("-")], ids=str)
+def test_list_primitives_accept_plain_list_columns(primitive):
+    column = pd.Series([[1, 2], (3, 1), None], dtype=object)
+    _assert_same_cells(primitive.transform_column(column).tolist(), _scalar_results(primitive, column))
+
+
+def test_array_join_column_handles_terminator_like_characters():
+    parsed = ParseArray(format="json", item_type="string").transform_column(pd.Series(['["a\\u0000b", "c"]', '[""]']))
+    assert ArrayJoin("|").transform_column(parsed).tolist() == ["a\x00b|c", ""]
+
+
+def test_array_count_column_keeps_nullable_integers_for_missing_cells():
+    parsed = ParseArray(format="json", strict=False).transform_column(pd.Series(["[1, 2]", "oops"]))
+    result = ArrayCount().transform_column(parsed)
+    assert result.dtype == "Int64"
+    assert result.isna().tolist() == [False, True]
+
+
+def test_one_hot_rules_expand_one_source_into_indicator_columns():
+    rules = RuleSet()
+    added = rules.add_one_hot_rules(
+        "race",
+        [1, 2, 3],
+        operations=[ParseArray(format="delimiter", item_type="integer")],
+    )
+    assert [rule.target for rule in added] == ["race_1", "race_2", "race_3"]
+    df = pd.DataFrame({"race": ["1|3", "2", ""]})
+
+    out = harmonize_dataset(df, rules, dataset_name="test")
+    assert out["race_1"].tolist() == [1, 0, 0]
+    assert out["race_2"].tolist() == [0, 1, 0]
+    assert out["race_3"].tolist() == [1, 0, 0]
+
+
+def test_one_hot_rules_serialize_as_plain_rules():
+    rules = RuleSet()
+    rules.add_one_hot_rules("color", ["red", "blue"], targets=["is_red", "is_blue"])
+    payload = rules.find("is_blue").serialize()
+    assert payload["operations"] == [
+        {"operation": "array_contains", "value": "blue"},
+        {"operation": "cast", "source": "boolean", "target": "integer"},
+    ]
+    with pytest.raises(ValueError, match="one target per option"):
+        rules.add_one_hot_rules("color", ["red"], targets=[])
+
+
+def test_rules_sharing_a_parse_prefix_parse_the_column_once(monkeypatch):
+    calls = []
+    original = ParseArray.transform_column
+
+    def counting(self, column):
+        calls.append(column.name)
+        return original(self, column)
+
+    monkeypatch.setattr(ParseArray, "transform_column", counting)
+    rules = RuleSet()
+    rules.add_one_hot_rules("q", ["a", "b", "c"], operations=[ParseArray(format="delimiter")])
+    rules.add_rule(HarmonizationRule(["q"], "q_count", [ParseArray(format="delimiter"), ArrayCount()]))
+    df = pd.DataFrame({"q": ["a|b", "c", "b"]})
+
+    out = harmonize_dataset(df, rules, dataset_name="test")
+    assert calls == ["q"]
+    assert out["q_b"].tolist() == [1, 0, 1]
+    assert out["q_count"].tolist() == [2, 1, 1]
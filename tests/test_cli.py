@@ -232,3 +232,168 @@ def test_cli_accepts_legacy_nested_rules_schema(tmp_path):
         out_rows = list(reader)
     assert set(reader.fieldnames) == {"b"}
     assert out_rows == [{"b": "1"}]
+
+
+def test_cli_reads_only_rule_sources_and_kept_columns(tmp_path, monkeypatch):
+    rules = [
+        {"sources": ["a"], "target": "b", "operations": []},
+        {"sources": ["missing_col"], "target": "m", "operations": []},
+    ]
+    rules_path = tmp_path / "rules.json"
+    _write_rules(rules_path, rules)
+
+    input_path = tmp_path / "input.csv"
+    _write_csv(
+        input_path,
+        [{"id": "p1", "a": "x", "wide_1": "1", "wide_2": "2"}],
+        fieldnames=["id", "a", "wide_1", "wide_2"],
+    )
+    output_path = tmp_path / "output.csv"
+
+    projections = []
+    read_table = cli.read_table
+
+    def recording_read_table(path, columns=None, dtypes=None):
+        projections.append(columns)
+        return read_table(path, columns=columns, dtypes=dtypes)
+
+    monkeypatch.setattr(cli, "read_table", recording_read_table)
+    cli.main([
+        "--rules", str(rules_path),
+        "--input", str(input_path),
+        "--output", str(output_path),
+        "--on-missing", "skip",
+        "--keep-columns", "id",
+    ])
+
+    # The missing source is resolved from the header; rows are read once, projected.
+    assert projections == [["id", "a"]]
+    with output_path.open() as f:
+        reader = csv.DictReader(f)
+        out_rows = list(reader)
+    assert reader.fieldnames == ["id", "b"]
+    assert out_rows == [{"id": "p1", "b": "x"}]
+
+
+def test_cli_keep_columns_must_exist(tmp_path):
+    rules_path = tmp_path / "rules.json"
+    _write_rules(rules_path, [{"sources": ["a"], "target": "b", "operations": []}])
+    input_path = tmp_path / "input.csv"
+    _write_csv(input_path, [{"a": "1"}], fieldnames=["a"])
+
+    with pytest.raises(SystemExit) as exc:
+        cli.main([
+            "--rules", str(rules_path),
+            "--input", str(input_path),
+            "--output", str(tmp_path / "output.csv"),
+            "--keep-columns", "nope",
+        ])
+    assert exc.value.code == 2
+
+
+def test_cli_csv_to_parquet(tmp_path):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    rules_path = tmp_path / "rules.json"
+    _write_rules(rules_path, [
+        {"sources": ["a"], "target": "b", "operations": [
+            {"operation": "cast", "source": "text", "target": "integer"}
+        ]},
+    ])
+    input_path = tmp_path / "input.csv"
+    _write_csv(input_path, [{"a": "1"}, {"a": ""}], fieldnames=["a"])
+    output_path = tmp_path / "output.parquet"
+
+    cli.main([
+        "--rules", str(rules_path),
+        "--input", str(input_path),
+        "--output", str(output_path),
+    ])
+
+    out = pd.read_parquet(output_path)
+    assert out.columns.tolist() == ["b"]
+    assert out["b"].dtype == "Int64"
+    assert out["b"].isna().tolist() == [False, True]
+
+
+def test_cli_compressed_tsv_input_and_output(tmp_path):
+    import gzip
+
+    rules_path = tmp_path / "rules.json"
+    _write_rules(rules_path, [{"sources": ["a"], "target": "b", "operations": []}])
+    input_path = tmp_path / "input.tsv.gz"
+    with gzip.open(input_path, "wt", newline="") as f:
+        f.write("a\tc\n")
+        f.write("x,1\tz\n")
+    output_path = tmp_path / "output.csv.gz"
+
+    cli.main([
+        "--rules", str(rules_path),
+        "--input", str(input_path),
+        "--output", str(output_path),
+    ])
+
+    with gzip.open(output_path, "rt") as f:
+        assert f.read().splitlines() == ["b", '"x,1"']
+
+
+def test_cli_combines_datasets(tmp_path):
+    rules_path = tmp_path / "rules.json"
+    _write_rules(rules_path, [
+        {"sources": ["a"], "target": "b", "operations": [{"operation": "cast", "source": "text", "target": "integer"}]},
+        {"sources": ["c"], "target": "d", "operations": []},
+    ])
+    _write_csv(tmp_path / "one.csv", [{"a": "1", "c": "x"}], fieldnames=["a", "c"])
+    _write_csv(tmp_path / "two.csv", [{"a": "2"}, {"a": "3"}], fieldnames=["a"])
+    output_path = tmp_path / "combined.csv"
+
+    cli.main([
+        "--rules", str(rules_path),
+        "--dataset", f"one={tmp_path / 'one.csv'}",
+        "--dataset", f"two={tmp_path / 'two.csv'}",
+        "--on-missing", "skip",
+        "--workers", "1",
+        "--output", str(output_path),
+    ])
+
+    with output_path.open() as f:
+        rows = list(csv.DictReader(f))
+    assert rows == [
+        {"b": "1", "d": "x", "source dataset": "one", "original_id": "0"},
+        {"b": "2", "d": "", "source dataset": "two", "original_id": "0"},
+        {"b": "3", "d": "", "source dataset": "two", "original_id": "1"},
+    ]
+
+
+def test_cli_dataset_mode_rejects_input(tmp_path):
+    with pytest.raises(SystemExit):
+        cli.main(["--rules", "r.json", "--input", "in.csv", "--dataset", "a=a.csv", "--output", "o.csv"])
+    with pytest.raises(SystemExit):
+        cli.main(["--rules", "r.json", "--output", "o.csv"])
+
+
+def test_cli_combines_datasets_with_cached_multi_step_rules(tmp_path):
+    rules_path = tmp_path / "rules.json"
+    _write_rules(rules_path, [{
+        "sources": ["name"],
+        "target": "key",
+        "operations": [{"operation": "normalize_text", "normalization": ["strip", "lower", "remove_punctuation"]}],
+    }])
+    _write_csv(tmp_path / "one.csv", [{"name": " Ann-Marie "}], fieldnames=["name"])
+    _write_csv(tmp_path / "two.csv", [{"name": "BOB!"}], fieldnames=["name"])
+    cache_dir = tmp_path / "cache"
+
+    # The second run loads the compiled rules from the cache; both pickle them to worker processes.
+    for run in range(2):
+        output_path = tmp_path / f"combined-{run}.csv"
+        cli.main([
+            "--rules", str(rules_path),
+            "--dataset", f"one={tmp_path / 'one.csv'}",
+            "--dataset", f"two={tmp_path / 'two.csv'}",
+            "--rules-cache-dir", str(cache_dir),
+            "--workers", "2",
+            "--output", str(output_path),
+        ])
+        with output_path.open() as f:
+            assert [row["key"] for row in csv.DictReader(f)] == ["annmarie", "bob"]
+    assert any(cache_dir.iterdir())
@@ -0,0 +1,88 @@
+import json
+
+import pandas as pd
+import pytest
+
+from harmonization_framework import harmonize_many
+from harmonization_framework.harmonize import harmonize_dataset
+from harmonization_framework.rule_registry import RuleSet
+from harmonization_framework.utils.transformations import combine_datasets
+
+
+def _rules(source, target="b"):
+    rules = RuleSet()
+    rules.loads(json.dumps([
+        {"sources": [source], "target": target, "operations": [{"operation": "cast", "source": "text", "target": "integer"}]}
+    ]))
+    return rules
+
+
+@pytest.fixture
+def sites(tmp_path):
+    (tmp_path / "one.csv").write_text("a,x\n1,p\n2,q\n")
+    (tmp_path / "two.csv").write_text("c\n5\n")
+    return {
+        "one": (str(tmp_path / "one.csv"), _rules("a")),
+        "two": (str(tmp_path / "two.csv"), _rules("c")),
+    }
+
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_harmonize_many_matches_harmonize_then_combine(sites, tmp_path, use_processes):
+    output = tmp_path / "out" / "combined.csv.gz"
+    rows = harmonize_many(sites, str(output), workers=2, use_processes=use_processes)
+
+    assert rows == {"one": 2, "two": 1}
+    expected = combine_datasets([
+        harmonize_dataset(pd.read_csv(path), rules, name)[["b", "source dataset", "original_id"]]
+        for name, (path, rules) in sites.items()
+    ])
+    pd.testing.assert_frame_equal(pd.read_csv(output), expected.reset_index(drop=True), check_dtype=False)
+    assert sorted(p.name for p in output.parent.iterdir()) == ["combined.csv.gz"]
+
+
+def test_harmonize_many_fills_columns_a_dataset_lacks(sites, tmp_path):
+    output = tmp_path / "combined.tsv"
+    harmonize_many(sites, str(output), output_columns=["x", "b", "original_id"], use_processes=False)
+    assert output.read_text().splitlines() == ["x\tb\toriginal_id", "p\t1\t0", "q\t2\t1", "\t5\t0"]
+
+
+def test_harmonize_many_errors(sites, tmp_path, monkeypatch):
+    with pytest.raises(ValueError, match="two: missing source columns a"):
+        harmonize_many({**sites, "two": (sites["two"][0], _rules("a"))}, str(tmp_path / "out.csv"))
+    with pytest.raises(ValueError, match="CSV or TSV"):
+        harmonize_many(sites, str(tmp_path / "out.parquet"))
+
+    def fail(*args):
+        raise KeyError("boom")
+
+    monkeypatch.setattr("harmonization_framework.combine.harmonize_dataset", fail)
+    with pytest.raises(RuntimeError, match="'one'"):
+        harmonize_many(sites, str(tmp_path / "out.csv"), use_processes=False)
+    assert list(tmp_path.glob("out*")) == []
+    assert list(tmp_path.glob(".harmonize-many-*")) == []
+
+
+def test_harmonize_many_streams_chunks_and_stops_blocked_workers(sites, tmp_path, monkeypatch):
+    import harmonization_framework.combine as combine
+
+    (tmp_path / "three.csv").write_text("a\n" + "".join(f"{i}\n" for i in range(10)))
+    sites = {**sites, "three": (str(tmp_path / "three.csv"), _rules("a"))}
+    monkeypatch.setattr(combine, "CHUNK_ROWS", 1)
+    monkeypatch.setattr(combine, "QUEUED_CHUNKS", 1)
+    output = tmp_path / "combined.csv"
+
+    assert harmonize_many(sites, str(output), workers=2, use_processes=False) == {"one": 2, "two": 1, "three": 10}
+    assert [line.split(",")[0] for line in output.read_text().splitlines()] == ["b", "1", "2", "5", *map(str, range(10))]
+
+    # "three" fills its one-chunk queue and waits while "two" fails; it must not hang the combine.
+    def fail_two(dataset, rules, name):
+        if name == "two":
+            raise KeyError("boom")
+        return harmonize_dataset(dataset, rules, name)
+
+    monkeypatch.setattr(combine, "harmonize_dataset", fail_two)
+    with pytest.raises(RuntimeError, match="'two'"):
+        harmonize_many(sites, str(tmp_path / "failed.csv"), workers=3, use_processes=False)
+    assert list(tmp_path.glob("failed*")) == []
+    assert list(tmp_path.glob(".harmonize-many-*")) == []
@@ -0,0 +1,100 @@
+import datetime
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from harmonization_framework import csv_writer
+from harmonization_framework.csv_writer import write_csv
+from harmonization_framework.dataset_io import write_table
+
+
+def _frame(rows=1_000):
+    rng = np.random.default_rng(0)
+    floats = rng.normal(size=rows) * 1e3
+    floats[::7] = np.nan
+    return pd.DataFrame({
+        "int": np.arange(rows),
+        "float": floats,
+        "tiny": rng.random(rows) * 1e-9,
+        "nullable_int": pd.array([None if i % 5 == 0 else i for i in range(rows)], dtype="Int64"),
+        "nullable_float": pd.array([None if i % 3 == 0 else i / 3 for i in range(rows)], dtype="Float64"),
+        "boolean": pd.array([None if i % 4 == 0 else i % 2 == 0 for i in range(rows)], dtype="boolean"),
+        "string": pd.array([None if i % 6 == 0 else f"v{i}" for i in range(rows)], dtype="string"),
+        "text": [f'needs "quoting", {i}\nline' if i % 11 == 0 else f"plain {i}" for i in range(rows)],
+        "mixed": pd.Series([i if i % 2 else str(i) + "x" for i in range(rows)], dtype=object),
+        "lists": pd.Series([[i, i + 1] for i in range(rows)], dtype=object),
+        "category": pd.Categorical([["a", "b", None][i % 3] for i in range(rows)]),
+        "dates": [datetime.date(2020, 1, 1 + i % 28) for i in range(rows)],
+    })
+
+
+@pytest.mark.parametrize("sep", [",", "\t"])
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_parallel_writer_is_byte_identical_to_to_csv(tmp_path, sep, use_processes):
+    df = _frame()
+    expected = tmp_path / "expected.csv"
+    actual = tmp_path / "actual.csv"
+    df.to_csv(expected, index=False, sep=sep)
+
+    write_csv(df, str(actual), sep=sep, workers=3, chunk_rows=97, use_processes=use_processes)
+    assert actual.read_bytes() == expected.read_bytes()
+
+
+def test_parallel_writer_keeps_whole_column_formats(tmp_path):
+    # Midnight-only datetimes print without a time part; that is decided per column.
+    df = pd.DataFrame({
+        "day": pd.to_datetime(["2020-01-01 00:00", "2020-01-02 00:00", "2020-01-03 10:00"]),
+        "value": [1, 2, 3],
+    })
+    expected = tmp_path / "expected.csv"
+    actual = tmp_path / "actual.csv"
+    df.to_csv(expected, index=False)
+    write_csv(df, str(actual), workers=2, chunk_rows=1)
+    assert actual.read_bytes() == expected.read_bytes()
+
+
+def test_parallel_writer_handles_empty_and_small_frames(tmp_path):
+    for df in [pd.DataFrame({"a": []}), pd.DataFrame({"a": [1]})]:
+        expected = tmp_path / "expected.csv"
+        actual = tmp_path / "actual.csv"
+        df.to_csv(expected, index=False)
+        write_csv(df, str(actual), workers=4, chunk_rows=1)
+        assert actual.read_bytes() == expected.read_bytes()
+
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_parallel_writer_reports_progress_in_order(tmp_path, use_processes):
+    progress = []
+    write_csv(_frame(250), str(tmp_path / "out.csv"), workers=2, chunk_rows=100, use_processes=use_processes,
+              progress_callback=lambda written, total: progress.append((written, total)))
+    assert progress == [(100, 250), (200, 250), (250, 250)]
+
+
+def test_parallel_writer_compresses_while_writing(tmp_path):
+    df = _frame(300)
+    path = tmp_path / "out.csv.gz"
+    write_table(df, str(path))
+    with gzip.open(path, "rb") as f:
+        assert f.read() == df.to_csv(index=False).encode("utf-8")
+
+
+def test_writer_uses_processes_only_for_large_frames(tmp_path, monkeypatch):
+    pools = []
+
+    class _Pool(ThreadPoolExecutor):
+        def __init__(self, max_workers, mp_context):
+            pools.append(max_workers)
+            super().__init__(max_workers)
+
+    monkeypatch.setattr(csv_writer, "ProcessPoolExecutor", _Pool)
+    df = _frame(300)
+    write_csv(df, str(tmp_path / "small.csv"), workers=2, chunk_rows=100)
+    assert pools == []
+
+    monkeypatch.setattr(csv_writer, "PROCESS_MIN_ROWS", 300)
+    write_csv(df, str(tmp_path / "large.csv"), workers=2, chunk_rows=100)
+    assert pools == [2]
+    assert (tmp_path / "large.csv").read_bytes() == (tmp_path / "small.csv").read_bytes()
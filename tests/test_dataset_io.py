@@ -0,0 +1,284 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from harmonization_framework.data_dictionary import DataDictionary, parse_codes
+from harmonization_framework.dataset_io import (
+    read_dtypes,
+    read_for_rules,
+    read_header,
+    read_table,
+    required_columns,
+)
+from harmonization_framework.harmonization_rule import HarmonizationRule
+from harmonization_framework.harmonize import harmonize_dataset, harmonize_file
+from harmonization_framework.primitives import Cast, EnumToEnum, Offset
+from harmonization_framework.rule_registry import RuleSet
+
+
+def _rules():
+    rules = RuleSet()
+    rules.add_rule(HarmonizationRule(["age"], "age_plus_one", [Offset(1)]))
+    rules.add_rule(HarmonizationRule(["height", "weight"], "bmi_inputs", []))
+    return rules
+
+
+def test_read_header_reads_no_rows(tmp_path):
+    path = tmp_path / "input.tsv"
+    path.write_text("a\tb\n1\t2\n")
+    assert read_header(str(path)) == ["a", "b"]
+
+
+def test_required_columns_is_union_of_sources_in_header_order():
+    header = ["id", "weight", "notes", "age", "height"]
+    assert required_columns(_rules(), header) == ["weight", "age", "height"]
+
+
+def test_required_columns_adds_requested_input_columns_but_not_targets():
+    header = ["id", "weight", "notes", "age", "height", "age_plus_one"]
+    columns = required_columns(_rules(), header, ["id", "age_plus_one", "original_id"])
+    assert columns == ["id", "weight", "age", "height"]
+
+
+def test_projected_read_matches_full_read(tmp_path):
+    path = tmp_path / "input.csv"
+    path.write_text("id,age,notes\np1,30,x\np2,,y\n")
+    projected = read_table(str(path), columns=["age"])
+    pd.testing.assert_frame_equal(projected, pd.read_csv(path)[["age"]])
+
+
+def test_harmonize_file_output_columns_projects_input(tmp_path):
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("id,age,height,weight,notes\np1,30,180,80,x\np2,41,170,60,y\n")
+    output_path = tmp_path / "output.csv"
+
+    harmonized = harmonize_file(
+        str(input_path),
+        str(output_path),
+        _rules(),
+        output_columns=["id", "age_plus_one", "original_id"],
+    )
+
+    assert "notes" not in harmonized.columns
+    out = pd.read_csv(output_path)
+    assert out.columns.tolist() == ["id", "age_plus_one", "original_id"]
+    assert out["age_plus_one"].tolist() == [31, 42]
+
+
+def test_harmonize_file_without_output_columns_keeps_every_input_column(tmp_path):
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("id,age,height,weight,notes\np1,30,180,80,x\n")
+    output_path = tmp_path / "output.csv"
+
+    harmonize_file(str(input_path), str(output_path), _rules())
+    out = pd.read_csv(output_path)
+    assert {"id", "notes", "age_plus_one", "source dataset", "original_id"} <= set(out.columns)
+
+
+DEMO_DIR = Path(__file__).resolve().parents[1] / "demo"
+
+
+def _typed_rules():
+    rules = RuleSet()
+    rules.add_rule(HarmonizationRule(["count"], "count_int", [Cast("text", "integer")]))
+    rules.add_rule(HarmonizationRule(["status"], "status_label", [EnumToEnum({1: "yes", 2: "no"}, default="?")]))
+    rules.add_rule(HarmonizationRule(["status"], "status_code", [EnumToEnum({1: 10, 2: 20})]))
+    rules.add_rule(HarmonizationRule(["mixed"], "mixed_int", [Cast("text", "integer")]))
+    rules.add_rule(HarmonizationRule(["mixed"], "mixed_plus", [Offset(1)]))
+    return rules
+
+
+def test_read_dtypes_follow_first_rule_step():
+    dtypes = read_dtypes(_typed_rules(), ["count", "status", "mixed", "other"])
+    assert dtypes == {"count": "Int64", "status": "category"}
+
+
+def test_read_dtypes_skip_multi_source_columns():
+    rules = RuleSet()
+    rules.add_rule(HarmonizationRule(["a"], "a_int", [Cast("text", "integer")]))
+    rules.add_rule(HarmonizationRule(["a", "b"], "ab", []))
+    assert read_dtypes(rules, ["a", "b"]) == {}
+
+
+def test_typed_read_parses_rule_dtypes_and_keeps_results(tmp_path):
+    path = tmp_path / "input.csv"
+    path.write_text("count,status,mixed\n1,1,5\n,2,6\n-999,3,7\n4,,8\n")
+    rules = _typed_rules()
+
+    typed = read_table(str(path), dtypes=read_dtypes(rules, ["count", "status", "mixed"]))
+    assert typed["count"].dtype == "Int64"
+    assert typed["status"].dtype == "category"
+    assert typed["status"].cat.categories.tolist() == [1, 2, 3]
+
+    expected = harmonize_dataset(pd.read_csv(path), rules, dataset_name="test")
+    actual = harmonize_dataset(typed, rules, dataset_name="test")
+    for target in rules.all_targets():
+        assert actual[target].astype(object).where(actual[target].notna(), None).tolist() == (
+            expected[target].astype(object).where(expected[target].notna(), None).tolist()
+        )
+
+
+def test_typed_read_falls_back_when_data_does_not_fit(tmp_path):
+    path = tmp_path / "input.csv"
+    path.write_text("count\n1\n1.5\n")
+    dataset = read_table(str(path), dtypes={"count": "Int64"})
+    assert dataset["count"].tolist() == [1.0, 1.5]
+
+
+def test_category_read_converts_boolean_and_string_categories(tmp_path):
+    path = tmp_path / "input.csv"
+    path.write_text("flag,word\nTrue,a\nFalse,b\nTrue,a\n")
+    dataset = read_table(str(path), dtypes={"flag": "category", "word": "category"})
+    assert dataset["flag"].tolist() == [True, False, True]
+    assert dataset["word"].tolist() == ["a", "b", "a"]
+
+
+def test_parse_codes_reads_dictionary_code_lists():
+    codes = parse_codes('"1"=[Working now] |"-9999"=[Reason Unknown] ')
+    assert codes == {"1": "Working now", "-9999": "Reason Unknown"}
+    assert parse_codes(None) == {}
+
+
+def test_demo_data_dictionary_drives_read_dtypes():
+    dictionary = DataDictionary.load(str(DEMO_DIR / "demo_dictionary1.csv"))
+    entry = dictionary.get("current_employment_status")
+    assert entry.datatype == "int"
+    assert entry.enumeration["96"] == "Other (Specify)"
+    assert "-9999" in entry.missing_codes
+
+    columns = ["current_employment_status", "commute_distance_miles", "zip_code_9"]
+    assert read_dtypes(RuleSet(), columns, dictionary) == {
+        "current_employment_status": "category",
+        "zip_code_9": str,
+    }
+
+
+def test_dictionary_string_columns_keep_leading_zeros(tmp_path):
+    dictionary_path = tmp_path / "dictionary.csv"
+    dictionary_path.write_text("Id,Datatype\nzip,string\n")
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("zip\n05377\n06830\n")
+    rules = RuleSet()
+    rules.add_rule(HarmonizationRule(["zip"], "zip_out", []))
+
+    dataset = read_for_rules(str(input_path), rules, ["zip_out"], DataDictionary.load(str(dictionary_path)))
+    assert dataset["zip"].tolist() == ["05377", "06830"]
+    # Rule sources are typed on the default (unprojected) read too.
+    dataset = read_for_rules(str(input_path), rules, dictionary=DataDictionary.load(str(dictionary_path)))
+    assert dataset["zip"].tolist() == ["05377", "06830"]
+    assert read_for_rules(str(input_path), rules)["zip"].tolist() == [5377, 6830]
+
+
+def test_harmonize_file_types_rule_sources_without_output_columns(tmp_path):
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("id,count,code,other\np1,3,1,7\np2,,2,\n")
+    rules = RuleSet()
+    rules.add_rule(HarmonizationRule(["count"], "count_int", [Cast("text", "integer")]))
+    rules.add_rule(HarmonizationRule(["code"], "label", [EnumToEnum({1: "one", 2: "two"})]))
+
+    harmonized = harmonize_file(str(input_path), str(tmp_path / "output.csv"), rules)
+
+    assert harmonized["count"].dtype == "Int64"
+    assert harmonized["code"].dtype == "category"
+    # Columns no rule reads keep pandas' inference.
+    assert harmonized["other"].dtype == float
+
+
+def test_table_format_follows_extension():
+    from harmonization_framework.dataset_io import table_format
+
+    assert table_format("/x/data.parquet") == "parquet"
+    assert table_format("/x/data.PQ") == "parquet"
+    assert table_format("/x/data.feather") == "feather"
+    assert table_format("/x/data.arrow") == "feather"
+    assert table_format("/x/data.tsv") == "tsv"
+    assert table_format("/x/data.csv") == "csv"
+    assert table_format("/x/data.txt") == "csv"
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".feather"])
+def test_columnar_round_trip_keeps_nullable_dtypes_and_projects(tmp_path, extension):
+    pytest.importorskip("pyarrow")
+    from harmonization_framework.dataset_io import write_table
+
+    df = pd.DataFrame({
+        "count": pd.array([1, None, 3], dtype="Int64"),
+        "score": pd.array([0.5, None, 1.5], dtype="Float64"),
+        "flag": pd.array([True, None, False], dtype="boolean"),
+        "name": pd.array(["a", None, "c"], dtype="string"),
+        "unused": [1, 2, 3],
+    })
+    path = str(tmp_path / f"data{extension}")
+    write_table(df, path)
+
+    assert read_header(path) == ["count", "score", "flag", "name", "unused"]
+    loaded = read_table(path, columns=["count", "score", "flag", "name"])
+    pd.testing.assert_frame_equal(loaded, df.drop(columns="unused"))
+
+
+def test_columnar_write_stores_mixed_object_columns_as_text(tmp_path):
+    pytest.importorskip("pyarrow")
+    from harmonization_framework.dataset_io import write_table
+
+    df = pd.DataFrame({"mapped": pd.Series([1, "unknown", None], dtype=object)})
+    path = str(tmp_path / "data.parquet")
+    write_table(df, path)
+    assert read_table(path)["mapped"].tolist() == ["1", "unknown", pd.NA]
+
+
+def test_harmonize_file_reads_parquet_and_writes_feather(tmp_path):
+    pytest.importorskip("pyarrow")
+    from harmonization_framework.dataset_io import write_table
+
+    input_path = str(tmp_path / "input.parquet")
+    write_table(pd.DataFrame({"age": pd.array([30, None], dtype="Int64"), "notes": ["x", "y"]}), input_path)
+    output_path = str(tmp_path / "output.feather")
+
+    harmonize_file(input_path, output_path, _rules_for_age(), output_columns=["age_plus_one"])
+    out = read_table(output_path)
+    assert out.columns.tolist() == ["age_plus_one"]
+    assert out["age_plus_one"].dtype == "Int64"
+    assert out["age_plus_one"].tolist()[0] == 31
+    assert out["age_plus_one"].isna().tolist() == [False, True]
+
+
+def _rules_for_age():
+    rules = RuleSet()
+    rules.add_rule(HarmonizationRule(["age"], "age_plus_one", [Offset(1)]))
+    return rules
+
+
+COMPRESSIONS = [".gz", ".bz2", ".xz", ".zst"]
+
+
+def test_split_compression_and_format_look_past_suffix():
+    from harmonization_framework.dataset_io import split_compression, table_format
+
+    assert split_compression("/x/data.tsv.gz") == ("/x/data.tsv", "gzip")
+    assert split_compression("/x/data.csv.ZST") == ("/x/data.csv", "zstd")
+    assert split_compression("/x/data.csv") == ("/x/data.csv", None)
+    assert table_format("/x/data.tsv.gz") == "tsv"
+    assert table_format("/x/data.csv.bz2") == "csv"
+
+
+@pytest.mark.parametrize("suffix", COMPRESSIONS)
+def test_compressed_tsv_round_trip(tmp_path, suffix):
+    if suffix == ".zst":
+        pytest.importorskip("zstandard")
+    from harmonization_framework.dataset_io import write_table
+
+    df = pd.DataFrame({"a": [1, 2], "b": ["x,y", "z"]})
+    path = str(tmp_path / f"data.tsv{suffix}")
+    write_table(df, path)
+
+    with open(path, "rb") as raw:
+        assert not raw.read().startswith(b"a\tb")  # compressed on disk
+    assert read_header(path) == ["a", "b"]
+    pd.testing.assert_frame_equal(read_table(path), df)
+    pd.testing.assert_frame_equal(read_table(path, columns=["b"]), df[["b"]])
+
+
+def test_compressed_columnar_files_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Compressed parquet files are not supported"):
+        read_table(str(tmp_path / "data.parquet.gz"))
@@ -0,0 +1,69 @@
+import json
+
+from harmonization_framework.api import rpc_handlers
+from harmonization_framework.api.rpc_handlers import handle_get_jobs, handle_harmonize_batch
+from harmonization_framework.api.rpc_models import RpcRequest
+from harmonization_framework.api.rpc_scheduler import JobScheduler
+from harmonization_framework.api.rule_set_cache import RuleSetCache
+
+RULES = [{"sources": ["a"], "target": "b", "operations": [{"operation": "cast", "source": "text", "target": "integer"}]}]
+
+
+def _batch(tmp_path, sites=3):
+    rules_path = tmp_path / "rules.json"
+    rules_path.write_text(json.dumps(RULES))
+    items = []
+    for site in range(sites):
+        data_path = tmp_path / f"site{site}.csv"
+        data_path.write_text(f"a\n{site}\n{site + 1}\n")
+        items.append({
+            "data_file_path": str(data_path),
+            "output_file_path": str(tmp_path / "out" / f"site{site}.csv"),
+            "replay_log_file_path": str(tmp_path / "out" / f"site{site}.log"),
+        })
+    return {"rules_file_path": str(rules_path), "items": items}
+
+
+def test_batch_runs_every_item_with_rules_compiled_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(rpc_handlers, "SCHEDULER", JobScheduler(max_workers=2))
+    cache = RuleSetCache()
+    monkeypatch.setattr(rpc_handlers, "RULE_SETS", cache)
+    params = _batch(tmp_path)
+
+    accepted = handle_harmonize_batch(RpcRequest(method="harmonize_batch", params=params))
+    assert accepted.status == "accepted"
+    job_ids = accepted.result["job_ids"]
+    assert len(job_ids) == 3
+
+    request = RpcRequest(method="get_jobs", params={"job_ids": job_ids + ["missing"], "wait": 10})
+    for _ in range(20):
+        response = handle_get_jobs(request)
+        if response.result["counts"].get("completed") == 3:
+            break
+    assert response.result["not_found"] == ["missing"]
+    assert [job["job_id"] for job in response.result["jobs"]] == job_ids
+    assert response.result["counts"] == {"completed": 3}
+    assert (tmp_path / "out" / "site2.csv").read_text().splitlines()[1].startswith("2,2,")
+    stats = cache.stats()
+    assert (stats["misses"], stats["entries"]) == (1, 1)
+
+
+def test_batch_rejects_shared_outputs_and_bad_rules(tmp_path):
+    params = _batch(tmp_path, sites=2)
+    params["items"][1]["output_file_path"] = params["items"][0]["output_file_path"]
+    response = handle_harmonize_batch(RpcRequest(method="harmonize_batch", params=params))
+    assert response.error.code == "VALIDATION_ERROR"
+
+    params = _batch(tmp_path, sites=1)
+    (tmp_path / "rules.json").write_text("[{")
+    response = handle_harmonize_batch(RpcRequest(method="harmonize_batch", params=params))
+    assert response.error.code == "INVALID_FORMAT"
+
+    response = handle_harmonize_batch(RpcRequest(method="harmonize_batch", params={**params, "items": []}))
+    assert response.error.code == "VALIDATION_ERROR"
+
+
+def test_get_jobs_requires_job_ids():
+    assert handle_get_jobs(RpcRequest(method="get_jobs", params={})).error.code == "MISSING_FIELD"
+    response = handle_get_jobs(RpcRequest(method="get_jobs", params={"job_ids": ["x"], "wait": "soon"}))
+    assert response.error.code == "VALIDATION_ERROR"
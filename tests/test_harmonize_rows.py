@@ -0,0 +1,126 @@
+import json
+
+import pytest
+
+from harmonization_framework import harmonize
+from harmonization_framework.api.rpc_handlers import handle_harmonize_rows
+from harmonization_framework.api.rpc_models import RpcRequest
+from harmonization_framework.api.rule_set_cache import RuleSetCache
+from harmonization_framework.harmonize import harmonize_records
+from harmonization_framework.rule_registry import RuleSet
+
+RULES = [
+    {"sources": ["age"], "target": "age", "operations": [{"operation": "cast", "source": "text", "target": "integer"}]},
+    {"sources": ["age"], "target": "age_text", "operations": []},
+    {"sources": ["a", "b"], "target": "any", "operations": [{"operation": "reduce", "reduction": "any"}]},
+]
+ROWS = [
+    {"age": "30", "a": 1, "b": 0},
+    {"age": None, "a": 0, "b": 0},
+    {"age": "41", "a": 0, "b": 1, "note": "late"},
+]
+
+
+def _rules():
+    rules = RuleSet()
+    rules.loads(json.dumps(RULES))
+    return rules
+
+
+def test_row_mode_matches_dataframe_mode(monkeypatch):
+    by_row = harmonize_records(ROWS, _rules(), "preview")
+    monkeypatch.setattr(harmonize, "ROW_MODE_MAX_ROWS", 0)
+    by_frame = harmonize_records(ROWS, _rules(), "preview")
+
+    assert by_row == by_frame
+    assert by_row[0] == {
+        "age": 30, "a": 1, "b": 0, "note": None, "age_text": "30", "any": 1,
+        "source dataset": "preview", "original_id": 0,
+    }
+    # Rules read the input values, not an earlier rule's target.
+    assert [row["age_text"] for row in by_row] == ["30", None, "41"]
+    assert [row["note"] for row in by_row] == [None, None, "late"]
+
+
+def test_row_mode_matches_dataframe_mode_for_ints_with_gaps(monkeypatch):
+    rules = RuleSet()
+    rules.loads(json.dumps([
+        {"sources": ["a"], "target": "t", "operations": [{"operation": "cast", "source": "integer", "target": "text"}]},
+        {"sources": ["a"], "target": "s", "operations": [{"operation": "scale", "scaling_factor": 2}]},
+    ]))
+    rows = [{"a": 1}, {"a": None}]
+    by_row = harmonize_records(rows, rules, "preview", output_columns=["a", "t", "s"])
+    monkeypatch.setattr(harmonize, "ROW_MODE_MAX_ROWS", 0)
+    by_frame = harmonize_records(rows, rules, "preview", output_columns=["a", "t", "s"])
+
+    assert by_row == by_frame
+    assert by_frame == [{"a": 1, "t": "1", "s": 2}, {"a": None, "t": None, "s": None}]
+    assert type(by_frame[0]["a"]) is int and type(by_frame[0]["s"]) is type(by_row[0]["s"])
+
+
+@pytest.mark.parametrize("values, expected", [
+    ([2, 3, None], [2, 3, None]),
+    ([2, 2.5, None], [2.0, 2.5, None]),
+    ([2.0, 3, None], [2, 3, None]),
+])
+def test_row_mode_matches_dataframe_mode_for_mixed_ints_and_floats(monkeypatch, values, expected):
+    rules = RuleSet()
+    rules.loads(json.dumps([
+        {"sources": ["a"], "target": "r", "operations": [{"operation": "round", "precision": 1}]},
+        {"sources": ["a"], "target": "same", "operations": []},
+    ]))
+    rows = [{"a": value} for value in values]
+    by_row = harmonize_records(rows, rules, "preview", output_columns=["r", "same"])
+    monkeypatch.setattr(harmonize, "ROW_MODE_MAX_ROWS", 0)
+    by_frame = harmonize_records(rows, rules, "preview", output_columns=["r", "same"])
+
+    types = lambda records: [(type(row["r"]), type(row["same"])) for row in records]
+    assert by_row == by_frame and types(by_row) == types(by_frame)
+    assert [row["r"] for row in by_frame] == expected
+    assert [type(row["r"]) for row in by_frame] == [type(value) for value in expected]
+
+
+def test_output_columns_and_missing_sources():
+    rows = harmonize_records(ROWS, _rules(), "preview", output_columns=["age", "original_id"])
+    assert rows == [{"age": 30, "original_id": 0}, {"age": None, "original_id": 1}, {"age": 41, "original_id": 2}]
+    with pytest.raises(KeyError):
+        harmonize_records([{"age": "1"}], _rules(), "preview")
+
+
+def test_harmonize_rows_with_inline_rules(monkeypatch):
+    cache = RuleSetCache()
+    monkeypatch.setattr("harmonization_framework.api.rpc_handlers.RULE_SETS", cache)
+    request = RpcRequest(method="harmonize_rows", params={"rows": ROWS, "rules": RULES, "output_columns": ["any"]})
+
+    first = handle_harmonize_rows(request)
+    second = handle_harmonize_rows(request)
+
+    assert first.status == "success"
+    assert first.result == {"rows": [{"any": 1}, {"any": 0}, {"any": 1}]}
+    assert second.result == first.result
+    assert (cache.stats()["misses"], cache.stats()["hits"]) == (1, 1)
+
+
+def test_harmonize_rows_with_rules_file(tmp_path):
+    rules_path = tmp_path / "rules.json"
+    rules_path.write_text(json.dumps(RULES))
+    response = handle_harmonize_rows(RpcRequest(
+        method="harmonize_rows",
+        params={"rows": ROWS[:1], "rules_file_path": str(rules_path), "dataset_name": "edit"},
+    ))
+    assert response.result["rows"][0]["source dataset"] == "edit"
+
+
+@pytest.mark.parametrize("params, code", [
+    ({"rows": ROWS}, "MISSING_FIELD"),
+    ({"rows": ROWS, "rules": RULES, "rules_file_path": "/rules.json"}, "MISSING_FIELD"),
+    ({"rows": ROWS, "rules": [{"sources": ["age"], "target": "x", "operations": [{"operation": "nope"}]}]},
+     "INVALID_FORMAT"),
+    ({"rows": ROWS, "rules_file_path": "rules.json"}, "INVALID_PATH"),
+    ({"rows": [{"x": 1}], "rules": RULES}, "HARMONIZATION_FAILED"),
+    ({"rows": "not rows", "rules": RULES}, "VALIDATION_ERROR"),
+])
+def test_harmonize_rows_errors(params, code):
+    response = handle_harmonize_rows(RpcRequest(method="harmonize_rows", params=params))
+    assert response.status == "error"
+    assert response.error.code == code
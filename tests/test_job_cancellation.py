@@ -0,0 +1,130 @@
+import functools
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from harmonization_framework.api import rpc_handlers
+from harmonization_framework.api.rpc_handlers import _run_harmonize, handle_cancel_job
+from harmonization_framework.api.rpc_jobs import get_job
+from harmonization_framework.api.rpc_models import RpcRequest
+from harmonization_framework.api.rpc_scheduler import JobScheduler
+from harmonization_framework.harmonization_rule import HarmonizationRule
+from harmonization_framework.harmonize import HarmonizationCancelled, harmonize_dataset
+from harmonization_framework.primitives import Reduce
+from harmonization_framework.rule_registry import RuleSet
+
+from test_rpc_jobs import _params, _register
+
+
+def _cancel(job_id):
+    return handle_cancel_job(RpcRequest(method="cancel_job", params={"job_id": job_id}))
+
+
+def test_harmonize_dataset_stops_within_a_multi_source_rule():
+    rules = RuleSet()
+    rules.add_rule(HarmonizationRule(["a", "b"], "total", [Reduce("sum")]))
+    dataset = pd.DataFrame({"a": range(10_000), "b": range(10_000)})
+    checks = []
+
+    def cancel_check():
+        checks.append(1)
+        return len(checks) > 2
+
+    with pytest.raises(HarmonizationCancelled):
+        harmonize_dataset(dataset, rules, "demo", cancel_check=cancel_check)
+    # One check before the rule, then one per row batch.
+    assert len(checks) == 3
+
+
+def test_cancelled_before_reading_removes_this_runs_log(tmp_path):
+    params = _params(tmp_path)
+    job_id = _register("cancel-early", params)
+    event = threading.Event()
+    event.set()
+
+    _run_harmonize(job_id, params, event)
+
+    assert get_job(job_id).status == "cancelled"
+    assert not (tmp_path / "out" / "output.csv").exists()
+    assert not (tmp_path / "out" / "replay.log").exists()
+
+
+def test_cancelled_while_writing_removes_partial_output(tmp_path, monkeypatch):
+    params = _params(tmp_path)
+    log = tmp_path / "out" / "replay.log"
+    log.parent.mkdir()
+    log.write_text("earlier run\n")
+    job_id = _register("cancel-writing", params)
+    event = threading.Event()
+    update_phase = rpc_handlers.update_phase
+
+    def cancel_on_write(job, phase, processed=0, total=0):
+        if phase == "writing":
+            event.set()
+        update_phase(job, phase, processed, total)
+
+    monkeypatch.setattr(rpc_handlers, "CANCEL_CHECK_INTERVAL", 0.0)
+    monkeypatch.setattr(rpc_handlers, "update_phase", cancel_on_write)
+    _run_harmonize(job_id, params, event)
+
+    assert get_job(job_id).status == "cancelled"
+    assert not (tmp_path / "out" / "output.csv").exists()
+    assert log.read_text() == "earlier run\n"
+
+
+def test_cancel_job_rpc(tmp_path, monkeypatch):
+    scheduler = JobScheduler(max_workers=1)
+    monkeypatch.setattr(rpc_handlers, "SCHEDULER", scheduler)
+    params = _params(tmp_path)
+    running_id = _register("cancel-running", params)
+    queued_id = _register("cancel-queued", params)
+    started = threading.Event()
+
+    def wait_for_cancel(cancel_event):
+        started.set()
+        assert cancel_event.wait(5)
+        rpc_handlers.update_job_status(running_id, status="cancelled")
+
+    scheduler.submit(running_id, wait_for_cancel)
+    scheduler.submit(queued_id, wait_for_cancel)
+    assert started.wait(5)
+
+    response = _cancel(queued_id)
+    assert response.result == {"job_id": queued_id, "status": "cancelled", "cancel_requested": True}
+    assert scheduler.queue_position(queued_id) is None
+
+    response = _cancel(running_id)
+    assert response.result["cancel_requested"] is True
+    for _ in range(100):
+        if get_job(running_id).status == "cancelled":
+            break
+        time.sleep(0.05)
+    assert get_job(running_id).status == "cancelled"
+
+    # Finished jobs are left alone.
+    response = _cancel(running_id)
+    assert response.result == {"job_id": running_id, "status": "cancelled", "cancel_requested": False}
+    assert _cancel("no-such-job").error.code == "JOB_NOT_FOUND"
+
+
+def _wait_for_cancel_in_worker(job_id, cancel_event):
+    from harmonization_framework.api.rpc_jobs import update_job_status
+
+    update_job_status(job_id, status="running")
+    update_job_status(job_id, status="cancelled" if cancel_event.wait(30) else "failed")
+
+
+def test_cancel_reaches_worker_process(tmp_path):
+    scheduler = JobScheduler(max_workers=1, use_processes=True)
+    job_id = _register("cancel-process", _params(tmp_path))
+    scheduler.submit(job_id, functools.partial(_wait_for_cancel_in_worker, job_id))
+
+    deadline = time.monotonic() + 60
+    while get_job(job_id).status != "running" and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert scheduler.cancel(job_id) == "running"
+    while get_job(job_id).status == "running" and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert get_job(job_id).status == "cancelled"
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import threading
+import time
+
+import anyio
+from fastapi.testclient import TestClient
+
+from harmonization_framework.api import rpc_jobs
+from harmonization_framework.api.app import app
+from harmonization_framework.api.rpc_handlers import handle_get_job
+from harmonization_framework.api.rpc_jobs import (
+    JobId,
+    JobInfo,
+    register_job,
+    update_job_status,
+    update_progress,
+    wait_for_job,
+    wait_for_job_async,
+)
+from harmonization_framework.api.rpc_models import RpcRequest
+
+
+def _running_job(job_id):
+    register_job(JobInfo(
+        job_id=JobId(job_id), status="running", progress=0.0, output_path="out.csv", replay_log_path="replay.log",
+    ))
+    return JobId(job_id)
+
+
+def _later(delay, *updates):
+    def run():
+        for update in updates:
+            time.sleep(delay)
+            update()
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_wait_for_job_wakes_on_update():
+    job_id = _running_job("wait-wakes")
+    thread = _later(0.05, lambda: update_progress(job_id, 1, 2))
+    started = time.monotonic()
+    job = wait_for_job(job_id, lambda current: current.progress > 0, timeout=10)
+    thread.join()
+    assert job.progress == 0.5
+    assert time.monotonic() - started < 5
+
+
+def test_wait_for_job_times_out():
+    job_id = _running_job("wait-timeout")
+    job = wait_for_job(job_id, lambda current: current.status == "completed", timeout=0.05)
+    assert job.status == "running"
+    assert wait_for_job(JobId("no-such-job"), lambda current: True, timeout=0) is None
+
+
+def test_wait_for_job_async_wakes_on_update_from_another_thread():
+    job_id = _running_job("async-wait-wakes")
+    thread = _later(0.05, lambda: update_progress(job_id, 1, 2))
+    started = time.monotonic()
+    job = asyncio.run(wait_for_job_async(job_id, lambda current: current.progress > 0, timeout=10))
+    thread.join()
+    assert job.progress == 0.5
+    assert time.monotonic() - started < 5
+    assert not rpc_jobs._async_waiters
+    assert asyncio.run(wait_for_job_async(JobId("no-such-job"), lambda current: True, timeout=1)) is None
+
+
+def test_waiting_calls_hold_no_server_threads():
+    job_id = _running_job("waits-on-loop")
+    results = []
+    with TestClient(app) as client:
+        # One server thread: a wait holding it would block every other sync route.
+        client.portal.call(lambda: setattr(anyio.to_thread.current_default_thread_limiter(), "total_tokens", 1))
+
+        def get_job_waiting():
+            response = client.post("/api", json={"method": "get_job", "params": {"job_id": job_id, "wait": 10}})
+            results.append(response.json()["result"]["status"])
+
+        waiters = [threading.Thread(target=get_job_waiting) for _ in range(3)]
+        for waiter in waiters:
+            waiter.start()
+        deadline = time.monotonic() + 5
+        while len(rpc_jobs._async_waiters) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(rpc_jobs._async_waiters) == 3
+        assert client.get("/health").status_code == 200
+
+        update_job_status(job_id, status="completed", progress=1.0)
+        for waiter in waiters:
+            waiter.join()
+    assert results == ["completed"] * 3
+
+
+def test_get_job_wait_returns_on_status_change():
+    job_id = _running_job("get-job-wait")
+    thread = _later(
+        0.05,
+        lambda: update_progress(job_id, 1, 2),
+        lambda: update_job_status(job_id, status="completed", progress=1.0),
+    )
+    response = handle_get_job(RpcRequest(method="get_job", params={"job_id": job_id, "wait": 10}))
+    thread.join()
+    # Progress alone does not end the wait; the status change does.
+    assert response.result["status"] == "completed"
+
+    response = handle_get_job(RpcRequest(method="get_job", params={"job_id": job_id, "wait": -1}))
+    assert response.error.code == "VALIDATION_ERROR"
+
+
+def test_job_events_stream_until_finished():
+    job_id = _running_job("events")
+    client = TestClient(app)
+    thread = _later(
+        0.05,
+        lambda: update_progress(job_id, 1, 2),
+        lambda: update_job_status(job_id, status="completed", progress=1.0, result={"output_path": "out.csv"}),
+    )
+    events = []
+    with client.stream("GET", f"/jobs/{job_id}/events") as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        for line in response.iter_lines():
+            if line.startswith("data: "):
+                events.append(json.loads(line[len("data: "):]))
+    thread.join()
+    assert events[0]["status"] == "running"
+    assert events[-1]["status"] == "completed"
+    assert events[-1]["result"] == {"output_path": "out.csv"}
+
+    assert client.get("/jobs/no-such-job/events").status_code == 404
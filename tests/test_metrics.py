@@ -0,0 +1,155 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from harmonization_framework.api import metrics
+from harmonization_framework.api.app import app
+from harmonization_framework.api.rpc_jobs import JobId, JobInfo, register_job, update_job_status
+from harmonization_framework.api.rule_set_cache import RuleSetCache
+
+
+@pytest.fixture
+def scratch_metrics():
+    """Forget the metrics a test registers."""
+    before = set(metrics._METRICS)
+    yield
+    for name in set(metrics._METRICS) - before:
+        del metrics._METRICS[name]
+
+
+def _samples(text):
+    values = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            values[name] = float(value)
+    return values
+
+
+def _value(metric, labels=()):
+    return metric._series(tuple(labels)).read()
+
+
+def test_counter_and_histogram_render(scratch_metrics):
+    counter = metrics.Counter("test_requests", "Requests.", ["result"])
+    counter.labels(result="hit").inc()
+    counter.labels(result="hit").inc(2)
+    counter.labels(result='say "miss"').inc()
+    histogram = metrics.Histogram("test_seconds", "Seconds.", [0.1, 1])
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value)
+
+    text = metrics.render()
+    assert "# TYPE test_requests counter" in text
+    assert "# TYPE test_seconds histogram" in text
+    samples = _samples(text)
+    assert samples['test_requests_total{result="hit"}'] == 3
+    assert samples['test_requests_total{result="say \\"miss\\""}'] == 1
+    assert samples['test_seconds_bucket{le="0.1"}'] == 2
+    assert samples['test_seconds_bucket{le="1"}'] == 3
+    assert samples['test_seconds_bucket{le="+Inf"}'] == 4
+    assert samples["test_seconds_count"] == 4
+    assert samples["test_seconds_sum"] == pytest.approx(3.65)
+
+
+def test_unlabelled_metrics_report_zero_before_use(scratch_metrics):
+    metrics.Counter("test_unused", "Unused.")
+    assert _samples(metrics.render())["test_unused_total"] == 0
+
+
+def test_gauges_are_read_at_render_and_omitted_when_none(scratch_metrics):
+    state = {"value": None}
+    metrics.Gauge("test_gauge", "Gauge.", lambda: state["value"])
+    metrics.Gauge("test_labelled", "Labelled.", lambda: {("a",): 1, ("b",): 2}, ["name"])
+    text = metrics.render()
+    assert "test_gauge" not in text
+    assert _samples(text)['test_labelled{name="b"}'] == 2
+    state["value"] = 7
+    assert _samples(metrics.render())["test_gauge"] == 7
+
+
+def test_recording_folds_pending_values_past_the_limit(scratch_metrics, monkeypatch):
+    monkeypatch.setattr(metrics, "MAX_PENDING", 10)
+    counter = metrics.Counter("test_folded", "Folded.")
+    series = counter._series(())
+    for _ in range(25):
+        counter.inc()
+    assert len(series._pending) <= 10
+    assert series.read() == 25
+    assert not series._pending
+
+
+def test_worker_values_are_forwarded(scratch_metrics):
+    histogram = metrics.Histogram("test_forwarded", "Forwarded.", [1])
+    sent = []
+    metrics.forward_updates(lambda name, args, kwargs: sent.append((name, args, kwargs)))
+    try:
+        histogram.observe(0.5)
+    finally:
+        metrics.forward_updates(None)
+    assert _value(histogram)["sum"] == 0
+    assert sent == [(metrics.UPDATE_NAME, ("test_forwarded", (), 0.5), {})]
+
+    # The queue may turn the label tuple into a list.
+    name, (metric_name, labels, value), kwargs = sent[0]
+    metrics.apply_update(name, (metric_name, list(labels), value), kwargs)
+    assert _value(histogram) == {"counts": [1, 0], "sum": 0.5}
+
+
+def test_finished_job_records_duration_wait_and_throughput():
+    finished = _value(metrics.JOBS_FINISHED, ["completed"])
+    durations = sum(_value(metrics.JOB_DURATION)["counts"])
+    waits = sum(_value(metrics.JOB_QUEUE_WAIT)["counts"])
+    throughputs = sum(_value(metrics.JOB_ROWS_PER_SECOND)["counts"])
+
+    job_id = JobId("metrics-finished")
+    register_job(JobInfo(job_id=job_id, status="queued", progress=0.0, output_path="o.csv", replay_log_path="r.log"))
+    update_job_status(job_id, status="running")
+    update_job_status(job_id, status="completed", result={"cached": False, "rows": 100})
+    update_job_status(job_id, status="completed")
+
+    assert _value(metrics.JOBS_FINISHED, ["completed"]) == finished + 1
+    assert sum(_value(metrics.JOB_DURATION)["counts"]) == durations + 1
+    assert sum(_value(metrics.JOB_QUEUE_WAIT)["counts"]) == waits + 1
+    assert sum(_value(metrics.JOB_ROWS_PER_SECOND)["counts"]) == throughputs + 1
+
+
+def test_job_cancelled_while_queued_has_no_duration():
+    cancelled = _value(metrics.JOBS_FINISHED, ["cancelled"])
+    durations = sum(_value(metrics.JOB_DURATION)["counts"])
+
+    job_id = JobId("metrics-cancelled")
+    register_job(JobInfo(job_id=job_id, status="queued", progress=0.0, output_path="o.csv", replay_log_path="r.log"))
+    update_job_status(job_id, status="cancelled")
+
+    assert _value(metrics.JOBS_FINISHED, ["cancelled"]) == cancelled + 1
+    assert sum(_value(metrics.JOB_DURATION)["counts"]) == durations
+
+
+def test_rule_set_cache_records_lookups_and_load_time():
+    hits = _value(metrics.RULES_CACHE_REQUESTS, ["hit"])
+    misses = _value(metrics.RULES_CACHE_REQUESTS, ["miss"])
+    loads = sum(_value(metrics.RULE_LOAD_SECONDS)["counts"])
+
+    cache = RuleSetCache()
+    cache.get_inline([])
+    cache.get_inline([])
+
+    assert _value(metrics.RULES_CACHE_REQUESTS, ["miss"]) == misses + 1
+    assert _value(metrics.RULES_CACHE_REQUESTS, ["hit"]) == hits + 1
+    assert sum(_value(metrics.RULE_LOAD_SECONDS)["counts"]) == loads + 1
+
+
+def test_metrics_endpoint():
+    register_job(JobInfo(
+        job_id=JobId("metrics-endpoint"), status="queued", progress=0.0, output_path="o.csv", replay_log_path="r.log",
+    ))
+    with TestClient(app) as client:
+        response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = _samples(response.text)
+    assert samples['harmonization_jobs{status="queued"}'] >= 1
+    assert "harmonization_queue_depth" in samples
+    assert samples["process_resident_memory_bytes"] > 0
+    assert "harmonization_job_duration_seconds_count" in samples
+    assert "harmonization_event_loop_lag_last_seconds" in samples
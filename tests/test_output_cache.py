@@ -0,0 +1,125 @@
+import json
+import os
+
+from harmonization_framework import cli
+from harmonization_framework.api import rpc_handlers
+from harmonization_framework.api.rpc_handlers import _run_harmonize
+from harmonization_framework.api.rpc_jobs import JobId, JobInfo, get_job, register_job
+from harmonization_framework.api.rpc_models import HarmonizeParams
+from harmonization_framework.harmonization_rule import HarmonizationRule
+from harmonization_framework.output_cache import OutputCache, fingerprint
+from harmonization_framework.primitives import Offset
+from harmonization_framework.rule_registry import RuleSet
+
+
+def _rules(amount=1):
+    rules = RuleSet()
+    rules.add_rule(HarmonizationRule(["a"], "b", [Offset(amount)]))
+    return rules
+
+
+def _cli_args(tmp_path, output, *extra):
+    return [
+        "--rules", str(tmp_path / "rules.json"),
+        "--input", str(tmp_path / "input.csv"),
+        "--output", str(tmp_path / output),
+        "--output-cache-dir", str(tmp_path / "cache"),
+        *extra,
+    ]
+
+
+def test_fingerprint_tracks_input_rules_and_options(tmp_path):
+    data = tmp_path / "input.csv"
+    data.write_text("a\n1\n")
+    key = fingerprint(str(data), _rules(), "out.csv", dataset_name="x")
+
+    assert fingerprint(str(data), _rules(), "other/out.csv", dataset_name="x") == key
+    assert fingerprint(str(data), _rules(2), "out.csv", dataset_name="x") != key
+    assert fingerprint(str(data), _rules(), "out.csv.gz", dataset_name="x") != key
+    assert fingerprint(str(data), _rules(), "out.csv", dataset_name="y") != key
+    data.write_text("a\n2\n")
+    assert fingerprint(str(data), _rules(), "out.csv", dataset_name="x") != key
+
+
+def test_store_fetch_and_evict(tmp_path):
+    cache = OutputCache(str(tmp_path / "cache"), max_bytes=15)
+    output = tmp_path / "out.csv"
+    log = tmp_path / "replay.log"
+    output.write_text("b\n2\n")
+    log.write_text("old run\nthis run\n")
+    cache.store("k1", str(output), str(log), replay_log_offset=len("old run\n"))
+
+    restored = tmp_path / "restored" / "out.csv"
+    restored_log = tmp_path / "restored" / "replay.log"
+    assert cache.fetch("k1", str(restored), str(restored_log))
+    assert restored.read_text() == "b\n2\n"
+    assert restored_log.read_text() == "this run\n"
+    assert not cache.fetch("missing", str(restored))
+
+    # Storing a second entry exceeds max_bytes; the older one is evicted.
+    os.utime(tmp_path / "cache" / "k1", (1, 1))
+    cache.store("k2", str(output))
+    assert not cache.fetch("k1", str(restored))
+    assert cache.fetch("k2", str(restored))
+    assert cache.size() <= 15
+
+
+def test_cli_reuses_cached_output(tmp_path, monkeypatch):
+    (tmp_path / "input.csv").write_text("a\n1\n2\n")
+    _rules().save(str(tmp_path / "rules.json"))
+    cli.main(_cli_args(tmp_path, "first.csv"))
+
+    calls = []
+    monkeypatch.setattr(cli, "harmonize_dataset", lambda **kwargs: calls.append(kwargs))
+    cli.main(_cli_args(tmp_path, "second.csv"))
+    assert calls == []
+    assert (tmp_path / "second.csv").read_text() == (tmp_path / "first.csv").read_text()
+
+    # A changed option misses the cache.
+    monkeypatch.undo()
+    cli.main(_cli_args(tmp_path, "third.csv", "--include-metadata"))
+    assert "original_id" in (tmp_path / "third.csv").read_text()
+
+
+def test_cli_bypass_output_cache(tmp_path, monkeypatch):
+    (tmp_path / "input.csv").write_text("a\n1\n")
+    _rules().save(str(tmp_path / "rules.json"))
+    cli.main(_cli_args(tmp_path, "first.csv"))
+
+    harmonize_dataset = cli.harmonize_dataset
+    calls = []
+    monkeypatch.setattr(cli, "harmonize_dataset", lambda **kwargs: calls.append(1) or harmonize_dataset(**kwargs))
+    cli.main(_cli_args(tmp_path, "second.csv", "--bypass-output-cache"))
+    assert calls == [1]
+
+
+def test_rpc_job_completes_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv(rpc_handlers.ENV_OUTPUT_CACHE_DIR, str(tmp_path / "cache"))
+    (tmp_path / "input.csv").write_text("a\n1\n2\n")
+    (tmp_path / "rules.json").write_text(json.dumps([{"sources": ["a"], "target": "b", "operations": []}]))
+
+    def run(job_id, output, **overrides):
+        params = HarmonizeParams(
+            data_file_path=str(tmp_path / "input.csv"),
+            rules_file_path=str(tmp_path / "rules.json"),
+            output_file_path=str(tmp_path / output),
+            replay_log_file_path=str(tmp_path / f"{output}.log"),
+            **overrides,
+        )
+        register_job(JobInfo(
+            job_id=JobId(job_id), status="queued", progress=0.0,
+            output_path=params.output_file_path, replay_log_path=params.replay_log_file_path,
+        ))
+        _run_harmonize(JobId(job_id), params)
+        return get_job(JobId(job_id))
+
+    first = run("cache-first", "first.csv")
+    assert first.status == "completed" and first.result["cached"] is False
+
+    second = run("cache-second", "second.csv")
+    assert second.status == "completed" and second.result["cached"] is True
+    assert (tmp_path / "second.csv").read_text() == (tmp_path / "first.csv").read_text()
+    assert (tmp_path / "second.csv.log").read_text() == (tmp_path / "first.csv.log").read_text()
+
+    third = run("cache-bypass", "third.csv", bypass_cache=True)
+    assert third.result["cached"] is False
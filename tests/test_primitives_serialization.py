@@ -1,8 +1,12 @@
 import json
+import re
 
 import pytest
 
 from harmonization_framework.primitives import (
+    ArrayContains,
+    ArrayCount,
+    ArrayJoin,
     Bin,
     Cast,
     ConvertDate,
@@ -24,6 +28,7 @@ from harmonization_framework.primitives import (
     Truncate,
     Unit,
 )
+from harmonization_framework.primitives.factory import deserialize_operation
 from harmonization_framework.primitives.normalize import Normalization
 from harmonization_framework.primitives.reduce import Reduction
 
@@ -351,6 +356,39 @@ def test_normalize_text_remove_accents_roundtrip_via_serialization():
     assert roundtrip.transform("café") == "cafe"
 
 
+def test_normalize_text_list_serialization_and_fused_transform():
+    primitive = NormalizeText(
+        [Normalization.STRIP, Normalization.LOWER, Normalization.ACCENT, Normalization.PUNCTUATION]
+    )
+    payload = primitive.to_dict()
+    assert payload == {
+        "operation": "normalize_text",
+        "normalization": ["strip", "lower", "remove_accents", "remove_punctuation"],
+    }
+
+    roundtrip = NormalizeText.from_serialization(payload)
+    assert roundtrip.to_dict() == payload
+    assert roundtrip.transform("  Crème Brûlée! ") == "creme brulee"
+    assert roundtrip.transform(["  Naïve?", "ÉCOLE."]) == ["naive", "ecole"]
+
+
+def test_normalize_text_list_applies_steps_in_order():
+    # Removing punctuation before stripping leaves the space that sat next to it.
+    assert NormalizeText([Normalization.PUNCTUATION, Normalization.STRIP]).transform(". a") == "a"
+    assert NormalizeText([Normalization.STRIP, Normalization.PUNCTUATION]).transform(". a") == " a"
+
+
+def test_normalize_text_rejects_empty_list():
+    with pytest.raises(ValueError, match="at least one normalization"):
+        NormalizeText([])
+
+
+def test_normalize_text_character_removal_matches_regex_definitions():
+    text = "a_b-c.d\tē!ß²\u00a0¿x—y"
+    assert NormalizeText(Normalization.PUNCTUATION).transform(text) == re.sub(r"[^\w\s]", "", text)
+    assert NormalizeText(Normalization.SPECIAL).transform(text) == re.sub(r"[^\da-zA-Z\s]", "", text)
+
+
 def test_convert_date_serialization_and_transform():
     primitive = ConvertDate("%Y-%m-%d", "%m/%d/%Y")
     payload = primitive.to_dict()
@@ -605,3 +643,51 @@ def test_missing_code_rejects_empty_and_bad_type():
         MissingCode({})
     with pytest.raises(TypeError):
         MissingCode("nope")
+
+
+def test_array_contains_serialization_and_transform():
+    primitive = ArrayContains("b")
+    payload = primitive.to_dict()
+
+    assert payload == {"operation": "array_contains", "value": "b"}
+    roundtrip = deserialize_operation(payload)
+    assert isinstance(roundtrip, ArrayContains)
+    assert roundtrip.to_dict() == payload
+    assert primitive.transform(["a", "b"]) is True
+    assert primitive.transform([]) is False
+    assert primitive.transform(None) is None
+    with pytest.raises(TypeError, match="expects a list or tuple"):
+        primitive.transform("abc")
+
+
+def test_array_count_serialization_and_transform():
+    length = ArrayCount()
+    assert length.to_dict() == {"operation": "array_count"}
+    assert deserialize_operation(length.to_dict()).to_dict() == {"operation": "array_count"}
+    assert length.transform([1, 2, 2]) == 3
+
+    matches = ArrayCount(2)
+    payload = matches.to_dict()
+    assert payload == {"operation": "array_count", "value": 2}
+    assert deserialize_operation(payload).transform([1, 2, 2]) == 2
+
+
+def test_array_join_serialization_and_transform():
+    primitive = ArrayJoin("; ")
+    payload = primitive.to_dict()
+
+    assert payload == {"operation": "array_join", "separator": "; "}
+    roundtrip = deserialize_operation(payload)
+    assert roundtrip.to_dict() == payload
+    assert primitive.transform([1, "a", 2.5]) == "1; a; 2.5"
+    assert primitive.transform([]) == ""
+    assert ArrayJoin.from_serialization({"operation": "array_join"}).separator == ","
+
+
+def test_array_primitives_reject_non_scalar_arguments():
+    with pytest.raises(TypeError):
+        ArrayContains([1])
+    with pytest.raises(TypeError):
+        ArrayCount({"a": 1})
+    with pytest.raises(TypeError):
+        ArrayJoin(1)
@@ -0,0 +1,138 @@
+import json
+import pytest
+
+from harmonization_framework.api.rpc_handlers import _run_harmonize
+from harmonization_framework.api.rpc_jobs import JobId, JobInfo, get_job, register_job
+from harmonization_framework.api.rpc_models import HarmonizeParams
+
+
+def _params(tmp_path, **overrides):
+    data_path = tmp_path / "input.csv"
+    data_path.write_text("a\n1\n2\n3\n")
+    rules_path = tmp_path / "rules.json"
+    rules_path.write_text(json.dumps([{"sources": ["a"], "target": "b", "operations": []}]))
+    values = dict(
+        data_file_path=str(data_path),
+        rules_file_path=str(rules_path),
+        output_file_path=str(tmp_path / "out" / "output.csv"),
+        replay_log_file_path=str(tmp_path / "out" / "replay.log"),
+    )
+    values.update(overrides)
+    return HarmonizeParams(**values)
+
+
+def _register(job_id, params):
+    register_job(JobInfo(
+        job_id=JobId(job_id),
+        status="queued",
+        progress=0.0,
+        output_path=params.output_file_path,
+        replay_log_path=params.replay_log_file_path,
+    ))
+    return JobId(job_id)
+
+
+def test_run_harmonize_reports_writing_phase(tmp_path, monkeypatch):
+    from harmonization_framework.api import rpc_handlers
+
+    params = _params(tmp_path)
+    job_id = _register("phase-job", params)
+    phases = []
+    update_phase = rpc_handlers.update_phase
+
+    def recording_update_phase(job, phase, processed=0, total=0):
+        phases.append((phase, processed, total))
+        update_phase(job, phase, processed, total)
+
+    monkeypatch.setattr(rpc_handlers, "update_phase", recording_update_phase)
+    _run_harmonize(job_id, params)
+
+    job = get_job(job_id)
+    assert job.status == "completed"
+    assert job.progress == 1.0
+    assert job.phase == "writing"
+    assert job.phase_progress == 1.0
+    assert phases == [("harmonizing", 0, 0), ("writing", 0, 0), ("writing", 3, 3)]
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    from collections import OrderedDict
+
+    from harmonization_framework.api import rpc_jobs
+
+    monkeypatch.setattr(rpc_jobs, "_jobs", {})
+    monkeypatch.setattr(rpc_jobs, "_finished", OrderedDict())
+    monkeypatch.setattr(rpc_jobs, "_evicted", 0)
+    monkeypatch.setattr(rpc_jobs, "_archiving", {})
+    monkeypatch.setattr(rpc_jobs, "_archive", None)
+    return rpc_jobs
+
+
+def _finish(registry, job_id, status="completed"):
+    registry.register_job(JobInfo(
+        job_id=JobId(job_id), status="running", progress=0.0, output_path="out.csv", replay_log_path="replay.log",
+    ))
+    registry.update_job_status(JobId(job_id), status=status, result={"output_path": "out.csv"})
+
+
+def test_finished_jobs_are_evicted_beyond_max_count(registry, monkeypatch):
+    monkeypatch.setattr(registry, "_max_jobs", 2)
+    registry.register_job(JobInfo(
+        job_id=JobId("active"), status="running", progress=0.0, output_path="o", replay_log_path="r",
+    ))
+    for job_id in ["one", "two", "three"]:
+        _finish(registry, job_id)
+
+    assert get_job(JobId("one")) is None and get_job(JobId("two")) is None
+    assert get_job(JobId("three")).status == "completed"
+    assert get_job(JobId("active")).status == "running"
+    stats = registry.registry_stats()
+    assert stats["jobs"] == 2 and stats["active"] == 1 and stats["evicted"] == 2
+
+
+def test_expired_jobs_spill_to_archive(registry, monkeypatch, tmp_path):
+    registry.configure_registry(archive_path=str(tmp_path / "jobs.sqlite"))
+    monkeypatch.setattr(registry, "_job_ttl", 60.0)
+    _finish(registry, "old", status="failed")
+    monkeypatch.setattr(registry.time, "time", lambda: 10**10)
+
+    stats = registry.registry_stats()
+    assert stats["jobs"] == 0 and stats["archived"] == 1
+    archived = get_job(JobId("old"))
+    assert archived.status == "failed"
+    assert archived.result == {"output_path": "out.csv"}
+    assert archived.finished_at is not None
+
+
+def test_archive_writes_happen_outside_the_registry_lock(registry, monkeypatch):
+    seen = []
+
+    class _Archive:
+        def store(self, jobs):
+            # The registry stays usable, and the evicted job findable, while this writes.
+            assert not registry._jobs_lock.locked()
+            seen.extend((job["job_id"], get_job(JobId(job["job_id"])).status) for job in jobs)
+
+        def load(self, job_id):
+            return None
+
+        def __len__(self):
+            return len(seen)
+
+    monkeypatch.setattr(registry, "_archive", _Archive())
+    monkeypatch.setattr(registry, "_max_jobs", 0)
+    _finish(registry, "spilled")
+
+    assert seen == [("spilled", "completed")]
+    assert registry._archiving == {}
+
+
+def test_archive_keeps_newest_jobs(tmp_path):
+    from harmonization_framework.api.rpc_job_archive import JobArchive
+
+    archive = JobArchive(str(tmp_path / "jobs.sqlite"), max_jobs=2)
+    archive.store({"job_id": f"job-{i}", "finished_at": float(i)} for i in range(4))
+    assert len(archive) == 2
+    assert archive.load("job-0") is None
+    assert archive.load("job-3") == {"job_id": "job-3", "finished_at": 3.0}
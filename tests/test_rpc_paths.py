@@ -78,3 +78,36 @@ def test_validate_paths_accepts_valid_paths(tmp_path):
     )
     response = _validate_paths(params)
     assert response is None
+
+
+def test_validate_paths_accepts_sqlite_locations(tmp_path):
+    import sqlite3
+
+    database = tmp_path / "study.sqlite"
+    with sqlite3.connect(database) as connection:
+        connection.execute("CREATE TABLE participants (a TEXT)")
+        connection.execute("CREATE TABLE harmonized (a TEXT)")
+    rules_path = tmp_path / "rules.json"
+    rules_path.write_text("[]")
+
+    def params(data, output, overwrite=False):
+        return HarmonizeParams(
+            data_file_path=data,
+            rules_file_path=str(rules_path),
+            output_file_path=output,
+            replay_log_file_path=str(tmp_path / "replay.log"),
+            overwrite=overwrite,
+        )
+
+    assert _validate_paths(params(f"{database}::participants", f"{database}::new_table")) is None
+    assert _validate_paths(params(f"{database}::SELECT a FROM participants", f"{database}::new_table")) is None
+
+    response = _validate_paths(params(f"{database}::missing", f"{database}::new_table"))
+    assert response.error.code == "FILE_NOT_FOUND"
+
+    response = _validate_paths(params(f"{database}::participants", f"{database}::harmonized"))
+    assert response.error.code == "ALREADY_EXISTS"
+    assert _validate_paths(params(f"{database}::participants", f"{database}::harmonized", overwrite=True)) is None
+
+    response = _validate_paths(params("study.sqlite::participants", f"{database}::new_table"))
+    assert response.error.code == "INVALID_PATH"
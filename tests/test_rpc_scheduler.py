@@ -0,0 +1,199 @@
+import functools
+import json
+import threading
+import time
+
+from harmonization_framework.api import rpc_handlers
+from harmonization_framework.api.rpc_handlers import _run_harmonize, handle_get_job, handle_harmonize
+from harmonization_framework.api.rpc_jobs import get_job
+from harmonization_framework.api.rpc_models import RpcRequest
+from harmonization_framework.api.rpc_scheduler import JobScheduler, _UpdateChannel, estimate_job_memory
+from harmonization_framework.api.rule_set_cache import RuleSetCache
+
+from test_rpc_jobs import _params, _register
+
+
+class _Blocking:
+    """A job body that records its start and waits until released."""
+
+    def __init__(self, name, started):
+        self.name = name
+        self.started = started
+        self.release = threading.Event()
+        self.running = threading.Event()
+
+    def __call__(self, cancel_event=None):
+        self.started.append(self.name)
+        self.running.set()
+        self.release.wait(5)
+
+
+def test_jobs_wait_for_a_worker_in_fifo_order():
+    scheduler = JobScheduler(max_workers=1, memory_budget=100)
+    started = []
+    jobs = [_Blocking(name, started) for name in ["a", "b", "c"]]
+    for job in jobs:
+        scheduler.submit(job.name, job)
+
+    assert jobs[0].running.wait(5)
+    assert scheduler.queue_position("a") is None
+    assert scheduler.queue_position("b") == 1
+    assert scheduler.queue_position("c") == 2
+
+    jobs[0].release.set()
+    assert jobs[1].running.wait(5)
+    assert scheduler.queue_position("c") == 1
+    jobs[1].release.set()
+    assert jobs[2].running.wait(5)
+    jobs[2].release.set()
+    assert started == ["a", "b", "c"]
+
+
+def test_memory_budget_holds_back_the_queue_head():
+    scheduler = JobScheduler(max_workers=3, memory_budget=100)
+    started = []
+    big = _Blocking("big", started)
+    large = _Blocking("large", started)
+    small = _Blocking("small", started)
+    scheduler.submit("big", big, memory=70)
+    scheduler.submit("large", large, memory=50)
+    scheduler.submit("small", small, memory=10)
+
+    assert big.running.wait(5)
+    # "small" would fit, but must not overtake "large".
+    assert scheduler.stats()["running"] == 1
+    assert scheduler.queue_position("small") == 2
+
+    big.release.set()
+    assert large.running.wait(5) and small.running.wait(5)
+    large.release.set()
+    small.release.set()
+    # "large" and "small" are admitted together; their threads may start in either order.
+    assert started[0] == "big" and sorted(started[1:]) == ["large", "small"]
+
+
+def test_oversized_job_runs_alone():
+    scheduler = JobScheduler(max_workers=2, memory_budget=10)
+    job = _Blocking("huge", [])
+    scheduler.submit("huge", job, memory=1000)
+    assert job.running.wait(5)
+    job.release.set()
+
+
+def test_estimate_scales_with_input_size(tmp_path):
+    plain = tmp_path / "input.csv"
+    plain.write_bytes(b"a\n" * 100)
+    compressed = tmp_path / "input.csv.gz"
+    compressed.write_bytes(b"a\n" * 100)
+    assert estimate_job_memory(str(plain)) > 200
+    assert estimate_job_memory(str(compressed)) > estimate_job_memory(str(plain))
+    assert estimate_job_memory(str(tmp_path / "missing.csv")) == 0
+
+
+def test_get_job_reports_queue_position(tmp_path, monkeypatch):
+    scheduler = JobScheduler(max_workers=1)
+    monkeypatch.setattr(rpc_handlers, "SCHEDULER", scheduler)
+    blocker = _Blocking("blocker", [])
+    scheduler.submit("blocker", blocker)
+    assert blocker.running.wait(5)
+
+    params = {
+        "data_file_path": str(tmp_path / "input.csv"),
+        "rules_file_path": str(tmp_path / "rules.json"),
+        "output_file_path": str(tmp_path / "output.csv"),
+        "replay_log_file_path": str(tmp_path / "replay.log"),
+    }
+    response = handle_harmonize(RpcRequest(method="harmonize", params=params))
+    job = handle_get_job(RpcRequest(method="get_job", params={"job_id": response.job_id}))
+    assert job.result["status"] == "queued"
+    assert job.result["queue_position"] == 1
+    blocker.release.set()
+
+
+def _wait_for_status(job_id, statuses, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = get_job(job_id)
+        if job.status in statuses:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} stayed {get_job(job_id).status}")
+
+
+def test_process_worker_reports_back_to_registry(tmp_path):
+    scheduler = JobScheduler(max_workers=1, use_processes=True)
+    params = _params(tmp_path)
+    job_id = _register("process-job", params)
+
+    scheduler.submit(job_id, functools.partial(_run_harmonize, job_id, params))
+    job = _wait_for_status(job_id, {"completed", "failed"})
+
+    assert job.status == "completed", job.error
+    assert job.progress == 1.0
+    assert job.phase == "writing" and job.phase_progress == 1.0
+    assert (tmp_path / "out" / "output.csv").read_text().splitlines()[0] == "a,b,source dataset,original_id"
+
+
+def test_process_jobs_use_the_api_process_rules_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(rpc_handlers, "SCHEDULER", JobScheduler(max_workers=1, use_processes=True))
+    cache = RuleSetCache()
+    monkeypatch.setattr(rpc_handlers, "RULE_SETS", cache)
+    params = _params(tmp_path).model_dump()
+    (tmp_path / "input.csv").write_text("a\n x \ny\n")
+    operations = [{"operation": "normalize_text", "normalization": ["strip", "upper"]}]
+    with open(params["rules_file_path"], "w") as handle:
+        json.dump([{"sources": ["a"], "target": "b", "operations": operations}], handle)
+
+    for run in range(2):
+        params["output_file_path"] = str(tmp_path / "out" / f"output{run}.csv")
+        response = handle_harmonize(RpcRequest(method="harmonize", params=params))
+        job = _wait_for_status(response.job_id, {"completed", "failed"})
+        assert job.status == "completed", job.error
+        assert (tmp_path / "out" / f"output{run}.csv").read_text().splitlines()[1].startswith(" x ,X,")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_failing_job_body_marks_job_failed(tmp_path):
+    scheduler = JobScheduler(max_workers=1)
+    params = _params(tmp_path)
+    job_id = _register("raising-job", params)
+
+    def explode(cancel_event):
+        raise RuntimeError("boom")
+
+    scheduler.submit(job_id, explode)
+    job = _wait_for_status(job_id, {"failed"}, timeout=5)
+    assert job.error == {"code": "HARMONIZATION_FAILED", "message": "boom"}
+
+
+def test_update_channel_throttles_progress():
+    sent = []
+
+    class _Queue:
+        def put(self, item):
+            sent.append(item)
+
+    channel = _UpdateChannel(_Queue())
+    for processed in range(1, 101):
+        channel("update_progress", ("job", processed, 100), {})
+    channel("update_job_status", ("job", "completed"), {"progress": 1.0, "error": None, "result": None})
+
+    progress = [args[1] for name, args, _ in sent if name == "update_progress"]
+    assert progress[0] == 1 and progress[-1] == 100
+    assert len(progress) < 10
+    assert sent[-1][0] == "update_job_status"
+    assert channel._last_sent == {}
+
+
+def test_update_channel_forgets_finished_jobs():
+    channel = _UpdateChannel(type("_Queue", (), {"put": lambda self, item: None})())
+    for job_id in ["one", "two"]:
+        channel("update_phase", (job_id, "writing", 1, 10), {})
+        channel("update_progress", (job_id, 1, 10), {})
+    channel("update_job_status", ("one", "running"), {"progress": None, "error": None, "result": None})
+    assert len(channel._last_sent) == 4
+
+    channel("update_job_status", ("one", "failed"), {"progress": None, "error": "boom", "result": None})
+    assert set(channel._last_sent) == {("update_phase", "two"), ("update_progress", "two")}
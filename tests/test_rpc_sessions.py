@@ -0,0 +1,140 @@
+import pandas as pd
+import pytest
+
+from harmonization_framework.api import rpc_handlers, rpc_sessions
+from harmonization_framework.api.rpc_handlers import (
+    handle_close_session,
+    handle_open_session,
+    handle_update_session,
+)
+from harmonization_framework.api.rpc_models import RpcRequest
+from harmonization_framework.api.rpc_sessions import SessionRegistry, SessionTooLarge, sample_dataset
+from harmonization_framework.harmonize import harmonize_dataset
+
+AGE = {"sources": ["age"], "target": "age_n", "operations": [{"operation": "cast", "source": "text", "target": "integer"}]}
+ANY = {"sources": ["a", "b"], "target": "any", "operations": [{"operation": "reduce", "reduction": "any"}]}
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    registry = SessionRegistry()
+    monkeypatch.setattr(rpc_handlers, "SESSIONS", registry)
+    return registry
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    path = tmp_path / "input.csv"
+    path.write_text("age,a,b,group\n" + "".join(f"{20 + i},{i % 2},0,{'rare' if i == 7 else 'common'}\n" for i in range(40)))
+    return str(path)
+
+
+def _call(handler, **params):
+    return handler(RpcRequest(method="", params=params))
+
+
+def test_session_recomputes_only_changed_rules(sessions, data_path, monkeypatch):
+    opened = _call(handle_open_session, data_file_path=data_path)
+    session_id = opened.result["session_id"]
+    assert opened.result["rows"] == 40
+    assert opened.result["columns"] == ["age", "a", "b", "group"]
+
+    first = _call(handle_update_session, session_id=session_id, rules=[AGE, ANY])
+    assert sorted(first.result["columns"]) == ["age_n", "any"]
+    assert first.result["columns"]["age_n"][:2] == [20, 21]
+
+    calls = []
+    monkeypatch.setattr(
+        rpc_sessions,
+        "harmonize_dataset",
+        lambda dataset, rules, name: calls.append(rules.all_targets()) or harmonize_dataset(dataset, rules, name),
+    )
+    edited = dict(ANY, operations=[{"operation": "reduce", "reduction": "all"}])
+    second = _call(handle_update_session, session_id=session_id, rules=[AGE, edited])
+    assert calls == [["any"]]
+    assert list(second.result["columns"]) == ["any"]
+    assert second.result["unchanged"] == ["age_n"]
+
+    third = _call(handle_update_session, session_id=session_id, rules=[edited])
+    assert third.result == {"session_id": session_id, "columns": {}, "unchanged": ["any"], "removed": ["age_n"]}
+
+    assert _call(handle_close_session, session_id=session_id).result["closed"] is True
+    assert _call(handle_update_session, session_id=session_id, rules=[AGE]).error.code == "SESSION_NOT_FOUND"
+
+
+def test_session_errors(sessions, data_path):
+    assert _call(handle_open_session, data_file_path="input.csv").error.code == "INVALID_PATH"
+    assert _call(handle_open_session, data_file_path=data_path, stratify_by="nope").error.code == "VALIDATION_ERROR"
+    session_id = _call(handle_open_session, data_file_path=data_path).result["session_id"]
+    missing = {"sources": ["nope"], "target": "x", "operations": []}
+    assert _call(handle_update_session, session_id=session_id, rules=[missing]).error.code == "HARMONIZATION_FAILED"
+
+
+def test_stratified_sample_keeps_rare_values():
+    dataset = pd.DataFrame({"group": ["common"] * 99 + ["rare"], "value": range(100)})
+    sample = sample_dataset(dataset, 10, stratify_by="group")
+    assert len(sample) == 11
+    assert "rare" in set(sample["group"])
+    assert list(sample.index) == sorted(sample.index)
+    assert len(sample_dataset(dataset, 10)) == 10
+    assert sample_dataset(dataset, 500) is dataset
+
+
+def test_sessions_are_bounded_by_idle_timeout_and_memory(data_path, monkeypatch):
+    registry = SessionRegistry(idle_timeout=60)
+    first = registry.open(data_path)
+    registry.memory_budget = first.memory * 2 - 1
+    second = registry.open(data_path)
+    # Opening the second session closed the least recently used one.
+    with pytest.raises(KeyError):
+        registry.get(first.session_id)
+    assert registry.stats()["evicted"] == 1
+
+    with pytest.raises(SessionTooLarge):
+        SessionRegistry(memory_budget=10).open(data_path)
+
+    now = registry.get(second.session_id).last_used
+    monkeypatch.setattr("harmonization_framework.api.rpc_sessions.time.monotonic", lambda: now + 61)
+    assert registry.stats()["sessions"] == 0
+    assert registry.stats()["expired"] == 1
+
+
+@pytest.mark.parametrize("stratify_by", [None, "group"])
+def test_sampled_open_reads_only_the_sampled_rows(data_path, monkeypatch, stratify_by):
+    full = pd.read_csv(data_path)
+    reads = []
+    read_table = rpc_sessions.read_table
+    monkeypatch.setattr(
+        rpc_sessions, "read_table", lambda path, columns=None: reads.append(columns) or read_table(path, columns)
+    )
+
+    session = SessionRegistry().open(data_path, sample_rows=10, stratify_by=stratify_by, seed=3)
+
+    assert reads == [[stratify_by or "age"]]
+    pd.testing.assert_frame_equal(session.dataset, sample_dataset(full, 10, stratify_by, seed=3))
+
+
+def test_update_over_budget_is_rejected_and_keeps_results(sessions, data_path):
+    session_id = _call(handle_open_session, data_file_path=data_path).result["session_id"]
+    _call(handle_update_session, session_id=session_id, rules=[AGE])
+    session = sessions.get(session_id)
+    sessions.memory_budget = session.memory
+
+    response = _call(handle_update_session, session_id=session_id, rules=[AGE, ANY])
+    assert response.error.code == "VALIDATION_ERROR"
+    assert list(session.results) == ["age_n"]
+    assert sessions.get(session_id).memory <= sessions.memory_budget
+
+
+def test_sweep_closes_idle_sessions(data_path, monkeypatch):
+    registry = SessionRegistry(idle_timeout=60)
+    session = registry.open(data_path)
+    monkeypatch.setattr("harmonization_framework.api.rpc_sessions.time.monotonic", lambda: session.last_used + 61)
+    registry.sweep()
+    assert registry.expired == 1 and not registry._sessions
+
+
+def test_oversized_open_is_rejected_before_reading(data_path, monkeypatch):
+    monkeypatch.setattr(rpc_sessions, "read_table", lambda *args, **kwargs: pytest.fail("read the whole file"))
+    with pytest.raises(SessionTooLarge, match="open it on a sample"):
+        SessionRegistry(memory_budget=100).open(data_path)
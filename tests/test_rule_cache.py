@@ -0,0 +1,121 @@
+"""
+Compiled rule sets cached on disk, keyed by the rules file's content.
+"""
+
+import os
+
+import pandas as pd
+
+from harmonization_framework import cli, rule_cache
+from harmonization_framework.harmonization_rule import HarmonizationRule
+from harmonization_framework.harmonize import harmonize_dataset
+from harmonization_framework.primitives import Bin, ConvertUnits, EnumToEnum, ExtractRegex
+from harmonization_framework.rule_registry import RuleSet
+
+
+def _write_rules(path) -> None:
+    rules = RuleSet()
+    rules.add_rule(HarmonizationRule(["code"], "label", [EnumToEnum({1: "one", 2: "two"}, default="other")]))
+    rules.add_rule(HarmonizationRule(["text"], "digits", [ExtractRegex(r"(\d+)", strict=False)]))
+    rules.add_rule(HarmonizationRule(["age"], "age_bin", [Bin([("child", (0, 17)), ("adult", (18, 120))])]))
+    rules.add_rule(HarmonizationRule(["height"], "height_cm", [ConvertUnits("inch", "cm")]))
+    rules.save(str(path))
+
+
+def _dataset() -> pd.DataFrame:
+    return pd.DataFrame(
+        {"code": [1, 2, 3], "text": ["a1", "b22", "c"], "age": [5, 30, 18], "height": [10.0, 20.0, None]}
+    )
+
+
+def test_cache_hit_restores_equivalent_rules(tmp_path, monkeypatch):
+    rules_path = tmp_path / "rules.yaml"
+    _write_rules(rules_path)
+    fresh = rule_cache.load_rules(str(rules_path), use_cache=False)
+
+    first = rule_cache.load_rules(str(rules_path))
+    entries = [name for name in os.listdir(tmp_path) if name.endswith(rule_cache.CACHE_SUFFIX)]
+    assert len(entries) == 1 and entries[0].startswith(".rules.yaml.")
+
+    # A hit must not parse the rules file again.
+    monkeypatch.setattr(RuleSet, "loads", lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError))
+    cached = rule_cache.load_rules(str(rules_path))
+    assert cached.all_targets() == fresh.all_targets()
+    assert [rule.serialize() for rule in cached] == [rule.serialize() for rule in first]
+    pd.testing.assert_frame_equal(
+        harmonize_dataset(_dataset(), cached, "demo"), harmonize_dataset(_dataset(), fresh, "demo")
+    )
+
+
+def test_changed_rules_file_misses_and_replaces_entry(tmp_path):
+    rules_path = tmp_path / "rules.json"
+    _write_rules(rules_path)
+    rule_cache.load_rules(str(rules_path))
+
+    rules = RuleSet()
+    rules.load(str(rules_path))
+    rules.add_rule(HarmonizationRule(["code"], "code_copy", []))
+    rules.save(str(rules_path))
+
+    reloaded = rule_cache.load_rules(str(rules_path))
+    assert "code_copy" in reloaded.all_targets()
+    entries = [name for name in os.listdir(tmp_path) if name.endswith(rule_cache.CACHE_SUFFIX)]
+    assert len(entries) == 1
+
+
+def test_cache_dir_and_corrupt_entry(tmp_path):
+    rules_path = tmp_path / "rules.json"
+    _write_rules(rules_path)
+    cache_dir = tmp_path / "cache"
+
+    rule_cache.load_rules(str(rules_path), cache_dir=str(cache_dir))
+    (entry,) = list(cache_dir.iterdir())
+    assert not any(name.endswith(rule_cache.CACHE_SUFFIX) for name in os.listdir(tmp_path))
+
+    entry.write_bytes(b"not a pickle")
+    rules = rule_cache.load_rules(str(rules_path), cache_dir=str(cache_dir))
+    assert len(rules) == 4
+    assert entry.read_bytes() != b"not a pickle"
+
+
+def test_cache_key_includes_library_version(monkeypatch):
+    key = rule_cache.cache_key(b"[]")
+    monkeypatch.setattr(rule_cache, "library_version", lambda: "999.0")
+    assert rule_cache.cache_key(b"[]") != key
+
+
+def test_cli_rules_cache_dir(tmp_path):
+    rules_path = tmp_path / "rules.json"
+    _write_rules(rules_path)
+    input_path = tmp_path / "input.csv"
+    _dataset().to_csv(input_path, index=False)
+    cache_dir = tmp_path / "cache"
+
+    for name in ["first.csv", "second.csv"]:
+        cli.main([
+            "--rules", str(rules_path),
+            "--input", str(input_path),
+            "--output", str(tmp_path / name),
+            "--rules-cache-dir", str(cache_dir),
+        ])
+
+    assert len(list(cache_dir.iterdir())) == 1
+    assert (tmp_path / "first.csv").read_text() == (tmp_path / "second.csv").read_text()
+
+
+def test_compiled_multi_step_normalize_text_pickles(tmp_path):
+    import pickle
+
+    from harmonization_framework.primitives import NormalizeText
+
+    rule = HarmonizationRule(["name"], "name_key", [NormalizeText(["strip", "lower", "remove_punctuation"])])
+    rule.compile()
+    restored = pickle.loads(pickle.dumps(rule))
+    assert restored.transform(" Dr. Who ") == "dr who"
+
+    rules = RuleSet()
+    rules.add_rule(rule)
+    rules_path = tmp_path / "rules.json"
+    rules.save(str(rules_path))
+    rule_cache.load_rules(str(rules_path))
+    assert any(name.endswith(rule_cache.CACHE_SUFFIX) for name in os.listdir(tmp_path))
@@ -94,3 +94,45 @@ def test_multi_source_rule_passes_list_to_operations():
     )
     assert rule.sources == ["a", "b", "c"]
     assert rule.transform([1, 2, 3]) == 6
+
+
+def test_rule_from_serialization_defers_operation_deserialization(monkeypatch):
+    payload = {
+        "sources": ["a"],
+        "target": "b",
+        "operations": [{"operation": "cast", "source": "text", "target": "integer"}],
+    }
+    built = []
+    from harmonization_framework import harmonization_rule
+
+    original = harmonization_rule.deserialize_operation
+    monkeypatch.setattr(
+        harmonization_rule, "deserialize_operation", lambda op: built.append(op) or original(op)
+    )
+
+    rule = HarmonizationRule.from_serialization(payload)
+    assert rule.serialize() == payload
+    assert json.loads(rule.serialization) == payload
+    assert built == []
+
+    assert rule.transform("7") == 7
+    assert len(built) == 1
+    rule.transform("8")
+    assert len(built) == 1
+    assert rule.serialize() == payload
+
+
+def test_rule_set_replaces_rules_in_place():
+    from harmonization_framework.rule_registry import RuleSet
+
+    rules = RuleSet()
+    for target in ["x", "y", "z"]:
+        rules.add_rule(HarmonizationRule(["a"], target, [DoNothing()]))
+    replacement = HarmonizationRule(["b"], "y", [DoNothing()])
+    rules.add_rule(replacement)
+
+    assert rules.all_targets() == ["x", "y", "z"]
+    assert rules.find("y") is replacement
+    assert [rule.target for rule in rules.for_targets(["z", "x"])] == ["x", "z"]
+    with pytest.raises(KeyError):
+        rules.find("missing")
@@ -0,0 +1,82 @@
+import json
+import os
+
+from harmonization_framework.api.routes.diagnostics import diagnostics
+from harmonization_framework.api import rule_set_cache
+from harmonization_framework.api.rule_set_cache import RuleSetCache
+
+
+def _write_rules(path, targets, mtime=1_000_000):
+    path.write_text(json.dumps([{"sources": ["a"], "target": target, "operations": []} for target in targets]))
+    # An old mtime keeps the file outside the always-verify window.
+    os.utime(path, (mtime, mtime))
+
+
+def test_hit_until_file_changes(tmp_path):
+    cache = RuleSetCache()
+    path = tmp_path / "rules.json"
+    _write_rules(path, ["b"])
+
+    first = cache.get(str(path))
+    assert cache.get(str(path)) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Same size, new mtime: the hash decides.
+    _write_rules(path, ["c"], mtime=2_000_000)
+    changed = cache.get(str(path))
+    assert changed is not first
+    assert changed.all_targets() == ["c"]
+
+    # Touched without a content change: still a hit.
+    os.utime(path, (3_000_000, 3_000_000))
+    assert cache.get(str(path)) is changed
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_recently_modified_file_is_verified_by_hash(tmp_path, monkeypatch):
+    cache = RuleSetCache()
+    path = tmp_path / "rules.json"
+    _write_rules(path, ["b"])
+    monkeypatch.setattr(rule_set_cache.time, "time", lambda: 1_000_000.5)
+    cache.get(str(path))
+
+    # Rewritten within the same timestamp: mtime and size both match.
+    path.write_text(path.read_text().replace('"b"', '"c"'))
+    os.utime(path, (1_000_000, 1_000_000))
+    assert cache.get(str(path)).all_targets() == ["c"]
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = RuleSetCache(max_entries=2)
+    paths = []
+    for name in ["a", "b", "c"]:
+        path = tmp_path / f"{name}.json"
+        _write_rules(path, [name])
+        paths.append(str(path))
+
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])
+    cache.get(paths[2])
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    cache.get(paths[0])
+    assert cache.stats()["hits"] == 2
+
+    small = RuleSetCache(max_bytes=os.path.getsize(paths[0]))
+    small.get(paths[0])
+    assert small.stats()["entries"] == 0
+
+
+def test_diagnostics_reports_rules_cache(tmp_path, monkeypatch):
+    cache = RuleSetCache()
+    monkeypatch.setattr("harmonization_framework.api.routes.diagnostics.RULE_SETS", cache)
+    path = tmp_path / "rules.json"
+    _write_rules(path, ["b"])
+    cache.get(str(path))
+    cache.get(str(path))
+
+    response = diagnostics()
+    assert response.rules_cache["hits"] == 1
+    assert response.rules_cache["misses"] == 1
+    assert response.rules_cache["entries"] == 1
@@ -0,0 +1,133 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from harmonization_framework import sqlite_io
+from harmonization_framework.dataset_io import dataset_exists, read_header, read_table, table_format, write_table
+from harmonization_framework.harmonization_rule import HarmonizationRule
+from harmonization_framework.harmonize import harmonize_file
+from harmonization_framework.primitives import Cast
+from harmonization_framework.rule_registry import RuleSet
+
+
+def _make_database(path, rows):
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE participants (id TEXT, age TEXT, site TEXT)")
+        connection.executemany("INSERT INTO participants VALUES (?, ?, ?)", rows)
+
+
+ROWS = [("p1", "30", "A"), ("p2", None, "B"), ("p3", "41", "A")]
+
+
+def test_parse_location():
+    assert sqlite_io.parse_location("/d/study.sqlite::participants") == ("/d/study.sqlite", "participants")
+    assert sqlite_io.parse_location("/d/study.db:: SELECT a::b ") == ("/d/study.db", "SELECT a::b")
+    assert sqlite_io.parse_location("/d/data.csv") is None
+    assert sqlite_io.parse_location("/d/notes.txt::x") is None
+    assert table_format("/d/study.sqlite3::SELECT x.y FROM t") == "sqlite"
+    with pytest.raises(ValueError, match="names no table"):
+        sqlite_io.parse_location("/d/study.db::")
+
+
+def test_read_table_and_query_with_projection(tmp_path):
+    database = str(tmp_path / "study.sqlite")
+    _make_database(database, ROWS)
+
+    assert read_header(f"{database}::participants") == ["id", "age", "site"]
+    table = read_table(f"{database}::participants", columns=["age"])
+    assert table.columns.tolist() == ["age"]
+    assert table["age"].tolist() == ["30", None, "41"]
+
+    query = f"{database}::SELECT id, site FROM participants WHERE site = 'A'"
+    assert read_header(query) == ["id", "site"]
+    assert read_table(query, columns=["id"])["id"].tolist() == ["p1", "p3"]
+
+
+def test_read_streams_in_chunks_with_one_row_index(tmp_path, monkeypatch):
+    database = str(tmp_path / "study.sqlite")
+    _make_database(database, ROWS)
+    monkeypatch.setattr(sqlite_io, "READ_CHUNK_ROWS", 2)
+
+    chunks = list(sqlite_io.read_chunks(database, "participants", chunk_rows=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    table = sqlite_io.read_table(database, "participants")
+    assert table.index.tolist() == [0, 1, 2]
+
+
+def test_missing_database_is_not_created(tmp_path):
+    database = tmp_path / "missing.sqlite"
+    with pytest.raises(Exception):
+        read_table(f"{database}::participants")
+    assert not database.exists()
+    assert not dataset_exists(f"{database}::participants")
+
+
+def test_write_table_derives_schema_and_replaces_table(tmp_path):
+    database = str(tmp_path / "out.sqlite")
+    df = pd.DataFrame({
+        "count": pd.array([1, None], dtype="Int64"),
+        "score": [0.5, float("nan")],
+        "flag": pd.array([True, None], dtype="boolean"),
+        "label": pd.array(["a", None], dtype="string"),
+        "mixed": pd.Series([1, "x"], dtype=object),
+        "items": pd.Series([[1, 2], []], dtype=object),
+    })
+    location = f"{database}::harmonized"
+    write_table(df, location)
+    write_table(df, location)  # replaces rather than appends
+
+    with sqlite3.connect(database) as connection:
+        schema = {row[1]: row[2] for row in connection.execute("PRAGMA table_info(harmonized)")}
+        rows = connection.execute("SELECT * FROM harmonized").fetchall()
+    assert schema == {
+        "count": "INTEGER", "score": "REAL", "flag": "INTEGER", "label": "TEXT", "mixed": "", "items": "",
+    }
+    assert rows == [(1, 0.5, 1, "a", 1, "[1, 2]"), (None, None, None, None, "x", "[]")]
+    assert dataset_exists(location)
+
+
+def test_write_table_inserts_in_batches_within_one_transaction(tmp_path, monkeypatch):
+    database = str(tmp_path / "out.sqlite")
+    write_table(pd.DataFrame({"a": [1]}), f"{database}::t")
+    df = pd.DataFrame({"a": [1, 2, "bad"]})
+
+    original_rows = sqlite_io._rows
+
+    def failing_rows(frame):
+        for row in original_rows(frame):
+            if row == ("bad",):
+                raise RuntimeError("boom")
+            yield row
+
+    monkeypatch.setattr(sqlite_io, "_rows", failing_rows)
+    with pytest.raises(RuntimeError):
+        sqlite_io.write_table(df, database, "t", batch_rows=1)
+
+    # The failed write rolled back the drop and the partial inserts.
+    with sqlite3.connect(database) as connection:
+        assert connection.execute("SELECT a FROM t").fetchall() == [(1,)]
+
+
+def test_write_table_rejects_query_output(tmp_path):
+    with pytest.raises(ValueError, match="must name a table"):
+        write_table(pd.DataFrame({"a": [1]}), f"{tmp_path / 'out.db'}::SELECT 1")
+
+
+def test_harmonize_file_sqlite_to_sqlite(tmp_path):
+    database = str(tmp_path / "study.sqlite")
+    _make_database(database, ROWS)
+    rules = RuleSet()
+    rules.add_rule(HarmonizationRule(["age"], "age_years", [Cast("text", "integer")]))
+
+    harmonize_file(
+        f"{database}::participants",
+        f"{database}::harmonized",
+        rules,
+        output_columns=["id", "age_years"],
+    )
+    with sqlite3.connect(database) as connection:
+        rows = connection.execute("SELECT id, age_years FROM harmonized").fetchall()
+        types = [row[2] for row in connection.execute("PRAGMA table_info(harmonized)")]
+    assert rows == [("p1", 30), ("p2", None), ("p3", 41)]
+    assert types == ["TEXT", "INTEGER"]
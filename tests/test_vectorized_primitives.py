@@ -0,0 +1,331 @@
+"""
+Column-level (vectorized) primitive implementations.
+
+Every `transform_column` override must agree with the scalar `transform`
+cell for cell, including on None, NaN and pd.NA, and must keep nullable
+dtypes so integer columns with gaps do not degrade to float or object.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from harmonization_framework.harmonization_rule import HarmonizationRule
+from harmonization_framework.harmonize import harmonize_dataset
+from harmonization_framework.primitives import (
+    Cast,
+    EnumToEnum,
+    FormatNumber,
+    NormalizeBoolean,
+    NormalizeText,
+    Offset,
+    Round,
+    Scale,
+    Threshold,
+    Truncate,
+)
+from harmonization_framework.primitives.base import isnull, python_round
+from harmonization_framework.primitives.normalize import Normalization
+from harmonization_framework.rule_registry import RuleSet
+
+
+def _assert_equivalent(primitive, column):
+    """Compare transform_column against per-cell transform on the same data."""
+    vector = primitive.transform_column(column).tolist()
+    scalar = [primitive.transform(value) for value in column.tolist()]
+    assert len(vector) == len(scalar)
+    for actual, expected in zip(vector, scalar):
+        if isnull(expected):
+            assert isnull(actual)
+        else:
+            # Numeric values compare by value: a clamped float becomes the
+            # (int) bound in scalar Threshold, but a float in a float column.
+            assert actual == expected
+            assert isinstance(actual, str) == isinstance(expected, str)
+
+
+NUMERIC_COLUMNS = [
+    pd.Series([1, 2, 3, -4]),
+    pd.Series([1.5, np.nan, -2.25, 1e12]),
+    pd.Series([1, None, 3], dtype="Int64"),
+    pd.Series([1.5, None, 2.675], dtype="Float64"),
+    pd.Series([1, None, 3, pd.NA], dtype=object),
+    pd.Series([0.125, float("nan"), None, pd.NA], dtype=object),
+]
+
+NUMERIC_PRIMITIVES = [
+    Scale(2),
+    Scale(0.453592),
+    Offset(3),
+    Offset(-0.5),
+    Threshold(0, 2),
+    Threshold(0.0, 2.5),
+    Round(0),
+    Round(2),
+    FormatNumber(0),
+    FormatNumber(2),
+]
+
+
+@pytest.mark.parametrize("primitive", NUMERIC_PRIMITIVES, ids=str)
+@pytest.mark.parametrize("column", NUMERIC_COLUMNS, ids=lambda c: str(c.dtype))
+def test_numeric_primitives_match_scalar_transform(primitive, column):
+    _assert_equivalent(primitive, column)
+
+
+@pytest.mark.parametrize("primitive", [Scale(3), Offset(1), Threshold(0, 2), Round(1)], ids=str)
+def test_integer_column_with_gaps_stays_nullable_integer(primitive):
+    column = pd.Series([1, None, 5], dtype="Int64")
+    result = primitive.transform_column(column)
+    assert result.dtype == "Int64"
+    assert result.isna().tolist() == [False, True, False]
+
+
+@pytest.mark.parametrize("primitive", [Scale(3), Offset(2**62), Threshold(0, 2**62)], ids=str)
+@pytest.mark.parametrize("column", [
+    pd.Series([2**62, None, -5], dtype=object),
+    pd.Series([2**62, -5]),
+    pd.Series([2**62, None, -5], dtype="Int64"),
+], ids=lambda c: str(c.dtype))
+def test_integer_results_beyond_int64_match_scalar_transform(primitive, column):
+    _assert_equivalent(primitive, column)
+
+
+@pytest.mark.parametrize("primitive", [Scale(2), Offset(1), Threshold(0, 10), Round(0), FormatNumber(1)], ids=str)
+def test_python_ints_beyond_int64_use_the_scalar_transform(primitive):
+    _assert_equivalent(primitive, pd.Series([10**20, None, 7], dtype=object))
+
+
+def test_float_factor_on_nullable_integer_gives_nullable_float():
+    result = Scale(0.5).transform_column(pd.Series([2, None], dtype="Int64"))
+    assert result.dtype == "Float64"
+    assert result.tolist()[0] == 1.0
+
+
+def test_object_integer_column_is_promoted_to_nullable_integer():
+    result = Offset(1).transform_column(pd.Series([1, None, 3], dtype=object))
+    assert result.dtype == "Int64"
+
+
+def test_threshold_float_bounds_promote_integer_column():
+    result = Threshold(0.0, 10.0).transform_column(pd.Series([-1, 5, 20]))
+    assert result.dtype == float
+    assert result.tolist() == [0.0, 5.0, 10.0]
+
+
+@pytest.mark.parametrize(
+    "value, precision",
+    [(2.675, 2), (0.285, 2), (1.005, 2), (0.5, 0), (1.5, 0), (2.5, 0), (0.125, 2), (-2.5, 0),
+     (1e300, 2), (123456789.123456789, 5), (5e-324, 3), (0.1 + 0.2, 20)],
+)
+def test_python_round_matches_builtin(value, precision):
+    assert python_round(np.array([value]), precision)[0] == round(value, precision)
+
+
+def test_python_round_matches_builtin_on_random_halves():
+    rng = np.random.default_rng(0)
+    values = np.round(rng.uniform(-1000, 1000, 5000), 3) + 0.0005
+    for precision in (0, 1, 2, 3):
+        expected = [round(value, precision) for value in values.tolist()]
+        assert python_round(values, precision).tolist() == expected
+
+
+def test_format_number_column_keeps_original_nulls():
+    column = pd.Series([1.0, np.nan, 2.5])
+    result = FormatNumber(1).transform_column(column)
+    assert result.dtype == object
+    assert result[0] == "1.0"
+    assert np.isnan(result[1])
+    assert result[2] == "2.5"
+
+
+def test_format_number_column_rejects_non_numeric_like_scalar():
+    with pytest.raises(TypeError):
+        FormatNumber(2).transform_column(pd.Series(["1.5"]))
+
+
+@pytest.mark.parametrize(
+    "column",
+    [
+        pd.Series(["abcdef", None, "ab", np.nan]),
+        pd.Series(["abcdef", pd.NA, "xy"], dtype=object),
+        pd.Series(["abcdef", None, "xy"], dtype="string"),
+    ],
+    ids=lambda c: str(c.dtype),
+)
+def test_truncate_column_matches_scalar_transform(column):
+    _assert_equivalent(Truncate(3), column)
+
+
+def test_truncate_column_falls_back_for_non_strings():
+    with pytest.raises(TypeError):
+        Truncate(2).transform_column(pd.Series([12345, "abc"], dtype=object))
+
+
+def test_default_transform_column_applies_scalar_transform_per_cell():
+    primitive = EnumToEnum({1: "a", 2: "b"})
+    result = primitive.transform_column(pd.Series([1, 2, 2]))
+    assert result.tolist() == ["a", "b", "b"]
+
+
+def test_enum_to_enum_category_column_maps_each_category_once():
+    primitive = EnumToEnum({1: "a", 2: "b"}, default="other")
+    column = pd.Series(pd.Categorical([1, 2, None, 3, 1], categories=[1, 2, 3, 4]))
+    _assert_equivalent(primitive, column)
+    assert primitive.transform_column(column).tolist() == ["a", "b", "other", "other", "a"]
+
+
+def test_harmonize_dataset_column_path_keeps_nullable_integers():
+    rules = RuleSet()
+    rules.add_rule(HarmonizationRule(["age"], "age_next_year", [Offset(1), Threshold(0, 120)]))
+    df = pd.DataFrame({"age": pd.array([30, None, 130], dtype="Int64")})
+
+    out = harmonize_dataset(df, rules, dataset_name="test")
+    assert out["age_next_year"].dtype == "Int64"
+    assert out["age_next_year"].tolist()[0] == 31
+    assert out["age_next_year"].isna().tolist() == [False, True, False]
+    assert out["age_next_year"].tolist()[2] == 120
+
+
+def test_harmonize_dataset_column_path_matches_row_transform():
+    rule = HarmonizationRule(["weight_lbs"], "weight_kg", [Scale(0.453592), Round(2), FormatNumber(2)])
+    rules = RuleSet()
+    rules.add_rule(rule)
+    df = pd.DataFrame({"weight_lbs": [100.0, None, 200.5, 150.25]})
+
+    out = harmonize_dataset(df, rules, dataset_name="test")
+    expected = [rule.transform([value]) for value in df["weight_lbs"].tolist()]
+    actual = out["weight_kg"].tolist()
+    assert actual[0] == expected[0]
+    assert isnull(actual[1]) and isnull(expected[1])
+    assert actual[2:] == expected[2:]
+
+
+# --- Cast / NormalizeBoolean ---------------------------------------------------
+
+
+CAST_COLUMNS = [
+    pd.Series(["1", "0", None, "42", "1"]),
+    pd.Series([" 7 ", pd.NA, "-3"], dtype="string"),
+    pd.Series([1, 0, 3]),
+    pd.Series([1.5, np.nan, 0.0, -2.7]),
+    pd.Series([1, None, 0], dtype="Int64"),
+    pd.Series([True, False]),
+    pd.Series([1, "2", 3.0, None], dtype=object),
+]
+
+
+@pytest.mark.parametrize("target", ["text", "integer", "boolean", "decimal", "float"])
+@pytest.mark.parametrize("column", CAST_COLUMNS, ids=lambda c: str(c.tolist()))
+def test_cast_column_matches_scalar_transform(target, column):
+    primitive = Cast("text", target)
+    try:
+        scalar = [primitive.transform(value) for value in column.tolist()]
+    except ValueError:
+        with pytest.raises(ValueError):
+            primitive.transform_column(column)
+        return
+    vector = primitive.transform_column(column).tolist()
+    for actual, expected in zip(vector, scalar):
+        if isnull(expected):
+            assert isnull(actual)
+        else:
+            assert actual == expected
+            assert type(actual) is type(expected) or isinstance(expected, (int, float))
+
+
+@pytest.mark.parametrize(
+    "target, dtype",
+    [("text", "string"), ("integer", "Int64"), ("boolean", "boolean"),
+     ("decimal", "Float64"), ("float", "Float64")],
+)
+def test_cast_column_produces_nullable_dtypes(target, dtype):
+    result = Cast("text", target).transform_column(pd.Series(["1", None, "0"]))
+    assert result.dtype == dtype
+    assert result.isna().tolist() == [False, True, False]
+
+
+def test_cast_column_float_to_integer_truncates_like_int():
+    result = Cast("float", "integer").transform_column(pd.Series([2.9, -2.9, np.nan]))
+    assert result.dtype == "Int64"
+    assert result.tolist()[:2] == [2, -2]
+
+
+def test_cast_column_reports_every_invalid_value_at_once():
+    column = pd.Series(["1", "abc", "2", "x1", "abc"])
+    with pytest.raises(ValueError, match=r"Cannot cast 2 value\(s\) to integer: \['abc', 'x1'\]"):
+        Cast("text", "integer").transform_column(column)
+
+
+def test_cast_column_reports_non_finite_floats():
+    with pytest.raises(ValueError, match="Cannot cast 1 value"):
+        Cast("float", "integer").transform_column(pd.Series([1.0, float("inf")]))
+
+
+NORMALIZE_BOOLEAN_COLUMNS = [
+    pd.Series(["Yes", " no ", "Y", "n", "TRUE", "yes"]),
+    pd.Series([1, 0, 1]),
+    pd.Series([1.0, 0.0]),
+    pd.Series(["on", "off", "", None], dtype="string"),
+]
+
+
+@pytest.mark.parametrize("column", NORMALIZE_BOOLEAN_COLUMNS, ids=lambda c: str(c.tolist()))
+def test_normalize_boolean_column_matches_scalar_transform(column):
+    primitive = NormalizeBoolean(strict=False)
+    vector = primitive.transform_column(column).tolist()
+    scalar = [primitive.transform(value) for value in column.tolist()]
+    for actual, expected in zip(vector, scalar):
+        if expected is None:
+            assert isnull(actual)
+        else:
+            assert actual is expected
+
+
+def test_normalize_boolean_column_produces_nullable_boolean():
+    result = NormalizeBoolean(strict=False).transform_column(pd.Series(["yes", "maybe", None]))
+    assert result.dtype == "boolean"
+    assert result.tolist()[0] is True
+    assert result.isna().tolist() == [False, True, True]
+
+
+def test_normalize_boolean_column_treats_nulls_like_scalar_transform():
+    primitive = NormalizeBoolean(falsy=["no", None], strict=True)
+    result = primitive.transform_column(pd.Series(["no", None, None], dtype=object))
+    assert result.tolist() == [False, False, False]
+
+
+def test_normalize_boolean_column_strict_lists_all_unknown_values():
+    column = pd.Series(["yes", "maybe", "no", "perhaps", "maybe", None])
+    with pytest.raises(ValueError, match=r"Unknown boolean-like values: \['maybe', 'perhaps', None\]"):
+        NormalizeBoolean(strict=True).transform_column(column)
+
+
+def test_normalize_boolean_column_non_boolean_default_uses_object_column():
+    result = NormalizeBoolean(strict=False, default="unknown").transform_column(pd.Series(["y", "?"]))
+    assert result.tolist() == [True, "unknown"]
+
+
+# --- NormalizeText ----------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "column",
+    [
+        pd.Series(["  Café ", None, "HELLO, World!", "  Café ", np.nan]),
+        pd.Series(["Ångström", pd.NA, "ok"], dtype="string"),
+    ],
+    ids=lambda c: str(c.dtype),
+)
+def test_normalize_text_column_matches_scalar_transform(column):
+    primitive = NormalizeText(
+        [Normalization.STRIP, Normalization.LOWER, Normalization.ACCENT, Normalization.PUNCTUATION]
+    )
+    result = primitive.transform_column(column)
+    assert result.dtype == column.dtype
+    _assert_equivalent(primitive, column)
+
+
+def test_normalize_text_column_falls_back_for_non_strings():
+    with pytest.raises((AttributeError, TypeError)):
+        NormalizeText(Normalization.LOWER).transform_column(pd.Series(["a", 1], dtype=object))